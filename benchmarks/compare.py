@@ -0,0 +1,72 @@
+"""
+Compare two run_benchmark.py reports and flag regressions.
+
+Exits with status 1 when any run present in both reports got slower (p50,
+p95 or p99) or lost throughput by more than --threshold.
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, Tuple
+
+METRICS = [
+    # (name, value getter, True if higher is better)
+    ("throughput_rps", lambda result: result["throughput_rps"], True),
+    ("p50_ms", lambda result: result["latency_ms"]["p50"], False),
+    ("p95_ms", lambda result: result["latency_ms"]["p95"], False),
+    ("p99_ms", lambda result: result["latency_ms"]["p99"], False),
+]
+
+
+def load_runs(path: str) -> Tuple[dict, Dict[Tuple[str, int], dict]]:
+    with open(path) as f:
+        report = json.load(f)
+    runs = {
+        (result["scenario"], result["concurrency"]): result
+        for result in report["results"]
+    }
+    return report["meta"], runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark reports")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Relative change counted as a regression (default: 0.10)",
+    )
+    args = parser.parse_args()
+
+    baseline_meta, baseline = load_runs(args.baseline)
+    candidate_meta, candidate = load_runs(args.candidate)
+    if baseline_meta.get("config") != candidate_meta.get("config"):
+        print("Warning: the reports were run with different settings\n")
+
+    regressions = 0
+    print(
+        f"{'run':<24} {'metric':<15} {'baseline':>10} {'candidate':>10} {'change':>8}"
+    )
+    for key in sorted(baseline.keys() & candidate.keys()):
+        for name, value, higher_is_better in METRICS:
+            old, new = value(baseline[key]), value(candidate[key])
+            change = (new - old) / old if old else 0.0
+            worse = -change if higher_is_better else change
+            flag = ""
+            if worse > args.threshold:
+                flag = "  REGRESSION"
+                regressions += 1
+            run = f"{key[0]} c={key[1]}"
+            print(
+                f"{run:<24} {name:<15} {old:>10.2f} {new:>10.2f} {change:>+8.1%}{flag}"
+            )
+
+    print(f"\n{regressions} regression(s) beyond {args.threshold:.0%}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Local stand-in for the OpenAI chat completions API, for benchmarks.
+
+Answers judge prompts with a VERDICT/EXPLANATION reply and agent prompts with
+an ANSWER/REASONING reply after a configurable delay, and fails a
+configurable share of requests. Point the API at it with
+OPENAI_BASE_URL=http://127.0.0.1:<port>/v1.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+app = FastAPI(title="Fake OpenAI")
+
+# Set from the command line in main()
+config = {
+    "latency_ms": 200.0,
+    "jitter_ms": 50.0,
+    "error_rate": 0.0,
+    "error_status": 500,
+    "chunks": 8,
+}
+rng = random.Random(0)
+requests_served = {"ok": 0, "error": 0}
+
+
+def _delay() -> float:
+    """Response time in seconds for one completion"""
+    jitter = rng.uniform(-config["jitter_ms"], config["jitter_ms"])
+    return max(config["latency_ms"] + jitter, 0.0) / 1000
+
+
+def _reply(messages: list) -> str:
+    system = messages[0]["content"] if messages else ""
+    if "judge" in system:
+        verdict = "CORRECT" if rng.random() < 0.5 else "INCORRECT"
+        return f"VERDICT: {verdict}\nEXPLANATION: Benchmark verdict."
+    return "ANSWER: Copernicus\nREASONING: Benchmark answer."
+
+
+def _usage(messages: list, content: str) -> dict:
+    # About four characters per token, close enough for accounting tests
+    prompt_tokens = sum(len(m.get("content", "")) for m in messages) // 4
+    completion_tokens = len(content) // 4
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def _error() -> JSONResponse:
+    requests_served["error"] += 1
+    return JSONResponse(
+        {"error": {"message": "Injected benchmark error", "type": "server_error"}},
+        status_code=config["error_status"],
+    )
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    messages = body.get("messages", [])
+    model = body.get("model", "fake")
+    content = _reply(messages)
+    delay = _delay()
+
+    if rng.random() < config["error_rate"]:
+        await asyncio.sleep(delay)
+        return _error()
+    requests_served["ok"] += 1
+
+    completion_id = f"chatcmpl-{rng.getrandbits(64):016x}"
+    created = int(time.time())
+
+    if not body.get("stream"):
+        await asyncio.sleep(delay)
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": _usage(messages, content),
+        }
+
+    include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+
+    async def events():
+        size = max(len(content) // config["chunks"], 1)
+        pieces = [content[i : i + size] for i in range(0, len(content), size)]
+        for piece in pieces:
+            await asyncio.sleep(delay / len(pieces))
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [
+                    {"index": 0, "delta": {"content": piece}, "finish_reason": None}
+                ],
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+        if include_usage:
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [],
+                "usage": _usage(messages, content),
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.get("/stats")
+async def stats():
+    return {"config": config, "requests": requests_served}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake OpenAI chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency-ms", type=float, default=config["latency_ms"])
+    parser.add_argument("--jitter-ms", type=float, default=config["jitter_ms"])
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=config["error_rate"],
+        help="Share of requests answered with --error-status (0-1)",
+    )
+    parser.add_argument("--error-status", type=int, default=config["error_status"])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config.update(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+    )
+    rng.seed(args.seed)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+"""
+Load-test the API against a local fake LLM and report latency as JSON.
+
+Starts benchmarks/fake_openai.py and the API (src/main.py under uvicorn,
+with OPENAI_BASE_URL pointing at the fake), optionally seeds DATABASE_URL
+first, then drives each scenario at each concurrency level with a fixed
+number of requests and writes throughput and p50/p95/p99 latency per run.
+The cold_start scenario runs first, against the freshly started API.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARKS_DIR)
+SRC_DIR = os.path.join(REPO_DIR, "src")
+
+SCENARIOS = ["cold_start", "question", "question_by_id", "verify_answer", "agent_play"]
+
+# Endpoints that build in-process indexes on their first request
+COLD_START_PATHS = ["/api/v1/question/", "/api/v1/game/board/"]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until_ready(url: str, process: subprocess.Popen, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} exited with code {process.returncode}")
+        try:
+            httpx.get(url, timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not start within {timeout:.0f}s")
+
+
+def start_fake_llm(port: int, args) -> subprocess.Popen:
+    command = [
+        sys.executable,
+        os.path.join(BENCHMARKS_DIR, "fake_openai.py"),
+        "--port",
+        str(port),
+        "--latency-ms",
+        str(args.llm_latency_ms),
+        "--jitter-ms",
+        str(args.llm_jitter_ms),
+        "--error-rate",
+        str(args.llm_error_rate),
+        "--seed",
+        str(args.seed),
+    ]
+    process = subprocess.Popen(command)
+    wait_until_ready(f"http://127.0.0.1:{port}/stats", process)
+    return process
+
+
+def start_api(port: int, llm_port: int, args) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update(
+        OPENAI_BASE_URL=f"http://127.0.0.1:{llm_port}/v1",
+        OPENAI_API_KEY="benchmark",
+        PYTHONPATH=SRC_DIR,
+    )
+    command = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "main:app",
+        "--app-dir",
+        SRC_DIR,
+        "--port",
+        str(port),
+        "--workers",
+        str(args.workers),
+        "--log-level",
+        "warning",
+        "--no-access-log",
+    ]
+    process = subprocess.Popen(command, env=env)
+    wait_until_ready(f"http://127.0.0.1:{port}/", process)
+    return process
+
+
+def stop(process: Optional[subprocess.Popen]) -> None:
+    if process is None or process.poll() is not None:
+        return
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(p / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+def git_revision() -> Dict[str, object]:
+    def git(*command):
+        return subprocess.run(
+            ["git", *command], cwd=REPO_DIR, capture_output=True, text=True
+        ).stdout.strip()
+
+    return {
+        "commit": git("rev-parse", "HEAD") or None,
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+    }
+
+
+async def load_questions(client: httpx.AsyncClient, count: int) -> List[dict]:
+    """Distinct questions with answers to build requests from"""
+    questions = {}
+    for _ in range(count * 3):
+        if len(questions) >= count:
+            break
+        response = await client.get("/api/v1/question/")
+        response.raise_for_status()
+        question_id = response.json()["question_id"]
+        if question_id not in questions:
+            detail = await client.get(f"/api/v1/question/{question_id}")
+            detail.raise_for_status()
+            questions[question_id] = detail.json()
+    if not questions:
+        raise RuntimeError("The database has no questions; seed it first")
+    return list(questions.values())
+
+
+def user_answer(rng: random.Random, answer: str) -> str:
+    """
+    A mix of answers: exact ones the local judge settles, wrong and padded
+    ones that go to the (fake) LLM judge, and misspelled ones that do either.
+    """
+    kind = rng.random()
+    if kind < 0.25:
+        return answer
+    if kind < 0.5:
+        return "Definitely not the answer"
+    if kind < 0.75 and len(answer) > 3:
+        i = rng.randrange(1, len(answer) - 1)
+        return answer[:i] + answer[i + 1 :]
+    return f"I think it might be {answer} {rng.randrange(1000)}"
+
+
+def make_request(
+    scenario: str, questions: List[dict], rng: random.Random
+) -> Callable[[httpx.AsyncClient], object]:
+    if scenario == "cold_start":
+        path = rng.choice(COLD_START_PATHS)
+        return lambda client: client.get(path)
+    if scenario == "question":
+        return lambda client: client.get("/api/v1/question/")
+    if scenario == "question_by_id":
+        question_id = rng.choice(questions)["question_id"]
+        return lambda client: client.get(f"/api/v1/question/{question_id}")
+    if scenario == "verify_answer":
+        question = rng.choice(questions)
+        body = {
+            "question_id": question["question_id"],
+            "user_answer": user_answer(rng, question["answer"]),
+        }
+        return lambda client: client.post("/api/v1/verify-answer/", json=body)
+    if scenario == "agent_play":
+        return lambda client: client.post("/api/v1/agent-play/")
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: str,
+    concurrency: int,
+    requests: int,
+    questions: List[dict],
+    seed: int,
+) -> dict:
+    """Send `requests` requests with `concurrency` in flight and time each one"""
+    rng = random.Random(f"{seed}-{scenario}-{concurrency}")
+    # Requests are drawn up front so every run sends the same sequence
+    pending = [make_request(scenario, questions, rng) for _ in range(requests)]
+    pending.reverse()
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+
+    async def worker():
+        while pending:
+            send = pending.pop()
+            started = time.perf_counter()
+            try:
+                response = await send(client)
+                if response.status_code >= 400:
+                    errors[str(response.status_code)] = (
+                        errors.get(str(response.status_code), 0) + 1
+                    )
+            except httpx.HTTPError as e:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "error_count": sum(errors.values()),
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies) * 1000, 3),
+            "p50": round(percentile(latencies, 50) * 1000, 3),
+            "p95": round(percentile(latencies, 95) * 1000, 3),
+            "p99": round(percentile(latencies, 99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3),
+        },
+    }
+
+
+def print_result(result: dict) -> None:
+    latency = result["latency_ms"]
+    print(
+        f"{result['scenario']:>15} c={result['concurrency']:<4} "
+        f"{result['throughput_rps']:>9.1f} req/s  "
+        f"p50 {latency['p50']:>8.2f} ms  p95 {latency['p95']:>8.2f} ms  "
+        f"p99 {latency['p99']:>8.2f} ms  errors {result['error_count']}",
+        file=sys.stderr,
+    )
+
+
+async def run_benchmark(base_url: str, args) -> List[dict]:
+    results = []
+    limits = httpx.Limits(max_connections=max(args.concurrency))
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        if "cold_start" in args.scenarios:
+            # One burst of concurrent first requests, before anything warms the
+            # indexes; requests that never complete show up as timeouts
+            concurrency = max(args.concurrency)
+            result = await run_scenario(
+                client, "cold_start", concurrency, concurrency, [], args.seed
+            )
+            print_result(result)
+            results.append(result)
+
+        questions = await load_questions(client, args.question_pool)
+
+        for scenario in args.scenarios:
+            if scenario == "cold_start":
+                continue
+            for concurrency in args.concurrency:
+                # Warm caches and connections so runs measure the steady state
+                await run_scenario(
+                    client, scenario, concurrency, args.warmup, questions, args.seed
+                )
+                result = await run_scenario(
+                    client, scenario, concurrency, args.requests, questions, args.seed
+                )
+                print_result(result)
+                results.append(result)
+    return results
+
+
+def comma_list(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the trivia API against a fake LLM server"
+    )
+    parser.add_argument(
+        "--scenarios",
+        type=comma_list,
+        default=SCENARIOS,
+        help=f"Comma-separated scenarios (default: {','.join(SCENARIOS)})",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=lambda value: [int(level) for level in comma_list(value)],
+        default=[1, 8, 32],
+        help="Comma-separated concurrency levels (default: 1,8,32)",
+    )
+    parser.add_argument("--requests", type=int, default=500, help="Per run")
+    parser.add_argument("--warmup", type=int, default=50, help="Per run, not timed")
+    parser.add_argument("--question-pool", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--workers", type=int, default=1, help="API worker processes")
+    parser.add_argument("--llm-latency-ms", type=float, default=200.0)
+    parser.add_argument("--llm-jitter-ms", type=float, default=50.0)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--seed-questions",
+        type=int,
+        default=0,
+        help="Seed DATABASE_URL with this many synthetic questions first",
+    )
+    parser.add_argument(
+        "--url",
+        help="Benchmark an API that is already running (its LLM settings are its own)",
+    )
+    parser.add_argument("--output", help="Write the JSON report here (default: stdout)")
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+    if not args.url and not os.getenv("DATABASE_URL"):
+        parser.error("Set DATABASE_URL to the database the API should use")
+
+    if args.seed_questions:
+        sys.path.insert(0, BENCHMARKS_DIR)
+        from seed import seed_database
+
+        seed_database(args.seed_questions, args.seed)
+
+    llm = api = None
+    try:
+        base_url = args.url
+        if base_url is None:
+            llm_port, api_port = free_port(), free_port()
+            llm = start_fake_llm(llm_port, args)
+            api = start_api(api_port, llm_port, args)
+            base_url = f"http://127.0.0.1:{api_port}"
+
+        results = asyncio.run(run_benchmark(base_url, args))
+    finally:
+        stop(api)
+        stop(llm)
+
+    report = {
+        "meta": {
+            **git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "config": {
+                "requests": args.requests,
+                "warmup": args.warmup,
+                "seed": args.seed,
+                "workers": args.workers,
+                "llm_latency_ms": args.llm_latency_ms,
+                "llm_jitter_ms": args.llm_jitter_ms,
+                "llm_error_rate": args.llm_error_rate,
+                "url": args.url,
+            },
+        },
+        "results": results,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Seed a database with a benchmark corpus.
+
+The corpus is either synthetic (deterministic for a given --seed) or a
+random sample of a Jeopardy CSV, and is loaded through the ingestion
+script, so the schema, content keys, game board index and ingestion
+generation match a real load.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+from datetime import date, timedelta
+
+import pandas as pd
+
+INGESTION_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "data_ingestion"
+)
+
+CSV_COLUMNS = [
+    "Show Number",
+    "Air Date",
+    "Round",
+    "Category",
+    "Value",
+    "Question",
+    "Answer",
+]
+
+# Topics cover every agent specialty and keyword group, plus a few that
+# fall through to the random fallback agents
+TOPICS = [
+    "HISTORY",
+    "ANCIENT ROME",
+    "WORLD CAPITALS",
+    "SCIENCE",
+    "CHEMISTRY",
+    "LITERATURE",
+    "AUTHORS",
+    "SPORTS",
+    "OLYMPIC GAMES",
+    "POP CULTURE",
+    "MOVIES",
+    "MUSIC",
+    "THE BEATLES",
+    "POTPOURRI",
+    "WORDPLAY",
+    "FOOD & DRINK",
+]
+ANSWERS = [
+    "Copernicus",
+    "Mark Twain",
+    "Paris",
+    "Oxygen",
+    "The Beatles",
+    "Abraham Lincoln",
+    "Mount Everest",
+    "Jupiter",
+    "William Shakespeare",
+    "Babe Ruth",
+    "Casablanca",
+    "Mozart",
+    "The Nile",
+    "Marie Curie",
+    "Tokyo",
+    "Julius Caesar",
+]
+ROUNDS = [
+    ("Jeopardy!", [200, 400, 600, 800, 1000]),
+    ("Double Jeopardy!", [400, 600, 800, 1000, 1200]),
+]
+QUESTIONS_PER_SHOW = sum(6 * len(values) for _, values in ROUNDS)
+
+
+def synthetic_corpus(questions: int, seed: int) -> pd.DataFrame:
+    """
+    Shows of two full 6x5 boards each, one show per weekday from 1984 on,
+    until the requested number of questions is reached.
+    """
+    rng = random.Random(seed)
+    rows = []
+    air_date = date(1984, 9, 10)
+    show_number = 1
+
+    while len(rows) < questions:
+        for round_, values in ROUNDS:
+            for topic in rng.sample(TOPICS, 6):
+                category = f"{topic} {show_number % 97}"
+                for value in values:
+                    answer = rng.choice(ANSWERS)
+                    clue = rng.randrange(10**6)
+                    rows.append(
+                        [
+                            show_number,
+                            air_date.isoformat(),
+                            round_,
+                            category,
+                            f"${value:,}",
+                            f"Benchmark clue {clue} about {topic.lower()} for ${value}",
+                            answer,
+                        ]
+                    )
+        show_number += 1
+        air_date += timedelta(days=3 if air_date.weekday() == 4 else 1)
+
+    return pd.DataFrame(rows[:questions], columns=CSV_COLUMNS)
+
+
+def sampled_corpus(csv_path: str, questions: int, seed: int) -> pd.DataFrame:
+    """A reproducible random sample of a Jeopardy CSV"""
+    df = pd.read_csv(csv_path, dtype=str, compression="infer")
+    df.columns = df.columns.str.strip()
+    return df.sample(n=min(questions, len(df)), random_state=seed)
+
+
+def seed_database(questions: int = 20000, seed: int = 42, sample: str = None) -> int:
+    """
+    Load a benchmark corpus into DATABASE_URL, replacing its questions.
+
+    Returns:
+        Number of questions in the corpus
+    """
+    if sample:
+        corpus = sampled_corpus(sample, questions, seed)
+    else:
+        corpus = synthetic_corpus(questions, seed)
+
+    # Imported late: the ingestion script connects to DATABASE_URL on import
+    sys.path.insert(0, INGESTION_DIR)
+    import ingestion_script
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "benchmark.csv")
+        corpus.to_csv(csv_path, index=False)
+
+        ingestion_script.create_tables()
+        chunks = ingestion_script.load_and_filter_data(csv_path, workers=1)
+        # Refuse nothing: a small benchmark corpus may replace a full one
+        ingestion_script.MIN_ROW_RATIO = 0
+        ingestion_script.load_data(chunks)
+
+    return len(corpus)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed DATABASE_URL for benchmarks")
+    parser.add_argument("--questions", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--sample", help="Sample the corpus from this Jeopardy CSV")
+    args = parser.parse_args()
+
+    if not os.getenv("DATABASE_URL"):
+        parser.error("Set DATABASE_URL to the database to seed")
+
+    count = seed_database(args.questions, args.seed, args.sample)
+    print(f"Seeded {count} questions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,28 @@
 import pandas as pd
-from sqlalchemy import create_engine, Column, Integer, String, Date, Text
+from sqlalchemy import (
+    create_engine,
+    Column,
+    Integer,
+    String,
+    Date,
+    DateTime,
+    Text,
+    func,
+    text,
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+import argparse
+import hashlib
+import io
 import os
-import re
+import struct
+import sys
+import time
 
 # Database configuration
 DATABASE_URL = os.getenv(
@@ -15,6 +34,89 @@ Base = declarative_base()
 engine = create_engine(DATABASE_URL)
 Session = sessionmaker(bind=engine)
 
+# Streaming CSV pipeline: rows per chunk, worker processes preparing chunks
+# and how many chunks per worker may be read ahead of the loader
+CSV_CHUNK_ROWS = int(os.getenv("INGESTION_CHUNK_ROWS", "50000"))
+INGESTION_WORKERS = int(os.getenv("INGESTION_WORKERS", str(os.cpu_count() or 1)))
+PIPELINE_DEPTH = 2
+
+# Rows per COPY FROM STDIN buffer
+COPY_CHUNK_ROWS = 50000
+COPY_COLUMNS = [
+    "show_number",
+    "air_date",
+    "round",
+    "category",
+    "value",
+    "question",
+    "answer",
+    "content_key",
+]
+
+# Stable per-row identity used to upsert incremental loads. Must match
+# content_keys() below, which computes the same hash in pandas.
+CONTENT_KEY_SQL = (
+    "md5(show_number::text || '|' || coalesce(round, '') || '|' "
+    "|| coalesce(category, '') || '|' || coalesce(question, ''))"
+)
+# Columns an incremental load may change on an existing content_key
+UPSERT_COLUMNS = ["air_date", "value", "answer"]
+INCOMING_TABLE = "trivia_questions_incoming"
+
+# Zero-downtime reloads: load into STAGING_TABLE, then swap it in by renaming
+STAGING_TABLE = "trivia_questions_staging"
+PREVIOUS_TABLE = "trivia_questions_previous"
+SWAP_TABLE = "trivia_questions_swap"
+SWAP_ATTEMPTS = 5
+SWAP_LOCK_TIMEOUT = "2s"
+# Smallest staged/live row ratio accepted without manual override
+MIN_ROW_RATIO = float(os.getenv("INGESTION_MIN_ROW_RATIO", "0.5"))
+
+# Columnar snapshot the API can serve questions from without the database.
+# The layout must match services/corpus_snapshot.py in the API.
+CORPUS_SNAPSHOT_PATH = os.getenv("CORPUS_SNAPSHOT_PATH", "")
+SNAPSHOT_MAGIC = b"TRIVSNAP"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct("<8sIIq")  # magic, version, row count, generation
+SNAPSHOT_SECTION = struct.Struct("<QQ")  # offset, length in bytes
+SNAPSHOT_SECTIONS = [
+    "ids",
+    "show_number",
+    "air_date",
+    "round",
+    "category",
+    "value",
+    "text_offsets",
+    "text",
+    "round_offsets",
+    "round_text",
+    "category_offsets",
+    "category_text",
+]
+SNAPSHOT_NULL_INT = -(2**31)
+SNAPSHOT_NULL_INDEX = -1
+SNAPSHOT_EPOCH = date(1970, 1, 1)
+
+# Secondary indexes built on the staging table before it goes live
+LIVE_INDEXES = [
+    ("round_value", "INDEX", "(round, value)"),
+    ("content_key", "UNIQUE INDEX", "(content_key)"),
+    ("search", "INDEX", "USING gin (search_vector)"),
+    ("show_round", "INDEX", "(show_number, round)"),
+]
+
+# Categories of every show round, for the API to draw game boards from.
+# Rebuilt with each load and swapped in together with trivia_questions.
+BOARD_INDEX_TABLE = "game_board_index"
+
+# Full-text search document, weighted question > answer > category.
+# Kept up to date by PostgreSQL as a stored generated column.
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(question, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(answer, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(category, '')), 'C')"
+)
+
 
 class TriviaQuestion(Base):
     """SQLAlchemy ORM model for trivia questions"""
@@ -29,57 +131,76 @@ class TriviaQuestion(Base):
     value = Column(Integer, nullable=True)
     question = Column(Text, nullable=True)
     answer = Column(Text, nullable=True)
+    content_key = Column(String(32), nullable=True, unique=True)
+    deleted_at = Column(DateTime, nullable=True)
 
     def __repr__(self):
         return f"<TriviaQuestion(show_number={self.show_number}, category='{self.category}', value='{self.value}')>"
 
 
-def parse_value(value_str):
+class IngestionRun(Base):
     """
-    Extract numeric value from strings like '$200', '$1,000', etc.
-    Returns None if value cannot be parsed.
+    One row per completed ingestion. The latest id is the ingestion generation
+    the API uses to invalidate its in-process question index.
     """
-    if pd.isna(value_str) or value_str == "None" or value_str == "":
-        return None
 
-    # Remove $ and commas, then convert to integer
-    try:
-        value_str = str(value_str).strip()
-        numeric_value = re.sub(r"[^\d]", "", value_str)
-        if numeric_value:
-            return int(numeric_value)
-    except (ValueError, AttributeError):
-        pass
+    __tablename__ = "ingestion_runs"
 
-    return None
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    completed_at = Column(DateTime, nullable=False, server_default=func.now())
+    row_count = Column(Integer, nullable=False, default=0)
 
 
-def load_and_filter_data(csv_path, max_value=1200):
-    """
-    Load CSV data and filter for questions with values up to max_value.
+class GameBoardCategory(Base):
+    """One category of one show round, indexed for building game boards"""
 
-    Args:
-        csv_path: Path to the CSV file
-        max_value: Maximum question value to include (default: 1200)
+    __tablename__ = "game_board_index"
 
-    Returns:
-        Filtered pandas DataFrame
+    show_number = Column(Integer, primary_key=True)
+    round = Column(String(50), primary_key=True)
+    category = Column(String(255), primary_key=True)
+    air_date = Column(Date, nullable=True)
+    first_question_id = Column(Integer, nullable=False)
+    clue_count = Column(Integer, nullable=False)
+
+
+def parse_values(values):
+    """
+    Extract numeric values from strings like '$200', '$1,000', etc.
+    Values that cannot be parsed become <NA>.
     """
-    print(f"Loading data from {csv_path}...")
+    digits = values.astype("string").str.replace(r"[^\d]", "", regex=True)
+    return pd.to_numeric(digits, errors="coerce").astype("Int64")
 
-    df = pd.read_csv(csv_path)
 
-    # Strip whitespace from column names
-    df.columns = df.columns.str.strip()
-    print(f"Total records loaded: {len(df)}")
+def read_chunks(csv_path, chunk_rows=CSV_CHUNK_ROWS):
+    """
+    Read the CSV chunk_rows rows at a time. Compressed input (.gz, .zst, ...)
+    is decompressed on the fly based on the file extension.
+    """
+    chunks = pd.read_csv(csv_path, dtype=str, chunksize=chunk_rows, compression="infer")
+    for chunk in chunks:
+        # Strip whitespace from column names
+        chunk.columns = chunk.columns.str.strip()
+        yield chunk
 
-    # Parse the Value column and filter
-    df["numeric_value"] = df["Value"].apply(parse_value)
 
-    filtered_df = df[df["numeric_value"].notna() & (df["numeric_value"] <= max_value)]
-    print(f"Records with values up to ${max_value}: {len(filtered_df)}")
+def filter_data(df, max_value=1200):
+    """
+    Keep questions with values up to max_value.
+
+    Args:
+        df: pandas DataFrame read from the CSV
+        max_value: Maximum question value to include (default: 1200)
 
-    return filtered_df
+    Returns:
+        Filtered pandas DataFrame with Value parsed to integers
+    """
+    values = parse_values(df["Value"])
+    keep = (values <= max_value).fillna(False).to_numpy(dtype=bool)
+    df = df[keep].copy()
+    df["Value"] = values[keep]
+    return df
 
 
 def clean_data(df):
@@ -92,39 +213,193 @@ def clean_data(df):
     Returns:
         Cleaned DataFrame
     """
-    df = df.copy()
     df["Air Date"] = pd.to_datetime(df["Air Date"], errors="coerce")
 
     # Strip whitespace
     string_columns = ["Round", "Category", "Question", "Answer"]
     for col in string_columns:
         if col in df.columns:
-            df[col] = df[col].apply(lambda x: x.strip() if isinstance(x, str) else x)
+            df[col] = df[col].str.strip()
 
     df["Show Number"] = (
         pd.to_numeric(df["Show Number"], errors="coerce").fillna(0).astype(int)
     )
-    df["Value"] = df["Value"].apply(parse_value)
+    df["Content Key"] = content_keys(df)
 
     return df
 
 
+def content_keys(df):
+    """
+    md5 of show number, round, category and question text for every row,
+    the same value CONTENT_KEY_SQL computes in the database.
+    """
+    joined = (
+        df["Show Number"]
+        .astype(str)
+        .str.cat(
+            [
+                df[col].fillna("").astype(str)
+                for col in ["Round", "Category", "Question"]
+            ],
+            sep="|",
+        )
+    )
+    return [hashlib.md5(text.encode("utf-8")).hexdigest() for text in joined]
+
+
+def prepare_chunk(df, max_value=1200):
+    """
+    Filter and clean one raw CSV chunk. Runs in the worker processes.
+
+    Returns:
+        (number of rows read, cleaned DataFrame)
+    """
+    return len(df), clean_data(filter_data(df, max_value))
+
+
+def prepare_chunks(csv_path, max_value=1200, workers=INGESTION_WORKERS):
+    """
+    Prepare CSV chunks on a process pool, yielding them in file order.
+
+    At most PIPELINE_DEPTH chunks per worker are read ahead of the consumer,
+    so memory stays flat however large the input is: a slow loader simply
+    stops the reader.
+    """
+    chunks = read_chunks(csv_path)
+    if workers <= 1:
+        for chunk in chunks:
+            yield prepare_chunk(chunk, max_value)
+        return
+
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        try:
+            for chunk in chunks:
+                pending.append(pool.submit(prepare_chunk, chunk, max_value))
+                if len(pending) >= workers * PIPELINE_DEPTH:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def load_and_filter_data(csv_path, max_value=1200, workers=INGESTION_WORKERS):
+    """
+    Stream cleaned chunks of questions with values up to max_value.
+
+    Args:
+        csv_path: Path to the CSV file, optionally compressed
+        max_value: Maximum question value to include (default: 1200)
+        workers: Number of processes preparing chunks
+
+    Yields:
+        Cleaned pandas DataFrames
+    """
+    print(f"Loading data from {csv_path} with {workers} worker(s)...")
+    total_loaded = total_kept = 0
+
+    for loaded, df in prepare_chunks(csv_path, max_value, workers):
+        total_loaded += loaded
+        total_kept += len(df)
+        if len(df):
+            yield df
+
+    print(f"Total records loaded: {total_loaded}")
+    print(f"Records with values up to ${max_value}: {total_kept}")
+
+
 def create_tables():
     """Create database tables if they don't exist"""
     print("Creating database tables...")
     Base.metadata.create_all(engine)
+    if engine.dialect.name == "postgresql":
+        ensure_schema()
     print("Tables created successfully!")
 
 
-def insert_data(df):
+def ensure_schema(table="trivia_questions"):
+    """
+    Add the content_key, deleted_at and search_vector columns to a
+    trivia_questions table created before they existed, backfill the keys
+    and make sure the unique content_key index (needed for ON CONFLICT), the
+    full-text search index and the (show_number, round) index used to fetch
+    game boards are there.
     """
-    Insert data into PostgreSQL database using SQLAlchemy ORM.
+    connection = engine.raw_connection()
+
+    try:
+        cursor = connection.cursor()
+        cursor.execute(
+            f"ALTER TABLE {table} "
+            "ADD COLUMN IF NOT EXISTS content_key VARCHAR(32), "
+            "ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMP, "
+            "ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED"
+        )
+        cursor.execute(
+            f"UPDATE {table} SET content_key = {CONTENT_KEY_SQL} "
+            "WHERE content_key IS NULL"
+        )
+        if cursor.rowcount:
+            print(f"Backfilled content keys for {cursor.rowcount} records.")
+
+        cursor.execute(
+            "SELECT 1 FROM pg_indexes WHERE tablename = %s "
+            "AND indexdef LIKE 'CREATE UNIQUE INDEX %% (content_key)'",
+            (table,),
+        )
+        if cursor.fetchone() is None:
+            # Older loads may hold duplicate rows; keep the newest of each
+            cursor.execute(
+                f"DELETE FROM {table} a USING {table} b "
+                "WHERE a.content_key = b.content_key AND a.id < b.id"
+            )
+            cursor.execute(
+                f"CREATE UNIQUE INDEX {table}_content_key ON {table} (content_key)"
+            )
+
+        cursor.execute(
+            "SELECT 1 FROM pg_indexes WHERE tablename = %s "
+            "AND indexdef LIKE '%% USING gin (search_vector)'",
+            (table,),
+        )
+        if cursor.fetchone() is None:
+            print("Building the full-text search index...")
+            cursor.execute(
+                f"CREATE INDEX {table}_search ON {table} USING gin (search_vector)"
+            )
+
+        cursor.execute(
+            "SELECT 1 FROM pg_indexes WHERE tablename = %s "
+            "AND indexdef LIKE '%% (show_number, round)'",
+            (table,),
+        )
+        if cursor.fetchone() is None:
+            cursor.execute(
+                f"CREATE INDEX {table}_show_round ON {table} (show_number, round)"
+            )
+        connection.commit()
+
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+
+def insert_data(chunks):
+    """
+    Insert data using SQLAlchemy ORM (fallback for non-PostgreSQL databases).
     NOTE: Existing data will be deleted before insertion.
 
     Args:
-        df: pandas DataFrame with trivia questions
+        chunks: Iterable of pandas DataFrames with trivia questions
     """
     session = Session()
+    started = time.monotonic()
 
     try:
         print("Inserting data into database...")
@@ -137,37 +412,53 @@ def insert_data(df):
         # Batch insert for better performance
         batch_size = 1000
         total_records = 0
+        # The CSV repeats a few rows; keep the first copy of each
+        seen_keys = set()
 
-        for i in range(0, len(df), batch_size):
-            batch = df.iloc[i : i + batch_size]
-            questions = []
-
-            for _, row in batch.iterrows():
-                question = TriviaQuestion(
-                    show_number=(
-                        int(row["Show Number"]) if pd.notna(row["Show Number"]) else 0
-                    ),
-                    air_date=row["Air Date"] if pd.notna(row["Air Date"]) else None,
-                    round=str(row["Round"]) if pd.notna(row["Round"]) else None,
-                    category=(
-                        str(row["Category"]) if pd.notna(row["Category"]) else None
-                    ),
-                    value=int(row["Value"]) if pd.notna(row["Value"]) else None,
-                    question=(
-                        str(row["Question"]) if pd.notna(row["Question"]) else None
-                    ),
-                    answer=str(row["Answer"]) if pd.notna(row["Answer"]) else None,
-                )
-                questions.append(question)
+        for df in chunks:
+            for i in range(0, len(df), batch_size):
+                batch = df.iloc[i : i + batch_size]
+                questions = []
 
-            session.bulk_save_objects(questions)
-            session.commit()
-            total_records += len(questions)
+                for _, row in batch.iterrows():
+                    if row["Content Key"] in seen_keys:
+                        continue
+                    seen_keys.add(row["Content Key"])
 
-            if (i + batch_size) % 10000 == 0:
-                print(f"Inserted {total_records} records...")
+                    question = TriviaQuestion(
+                        show_number=(
+                            int(row["Show Number"])
+                            if pd.notna(row["Show Number"])
+                            else 0
+                        ),
+                        air_date=row["Air Date"] if pd.notna(row["Air Date"]) else None,
+                        round=str(row["Round"]) if pd.notna(row["Round"]) else None,
+                        category=(
+                            str(row["Category"]) if pd.notna(row["Category"]) else None
+                        ),
+                        value=int(row["Value"]) if pd.notna(row["Value"]) else None,
+                        question=(
+                            str(row["Question"]) if pd.notna(row["Question"]) else None
+                        ),
+                        answer=str(row["Answer"]) if pd.notna(row["Answer"]) else None,
+                        content_key=row["Content Key"],
+                    )
+                    questions.append(question)
 
-        print(f"Successfully inserted {total_records} records into the database!")
+                session.bulk_save_objects(questions)
+                session.commit()
+                total_records += len(questions)
+
+            print(f"Inserted {total_records} records...")
+
+        session.query(GameBoardCategory).delete()
+        session.execute(text(board_index_sql("trivia_questions", BOARD_INDEX_TABLE)))
+
+        # Bump the generation so running API workers rebuild their indexes
+        session.add(IngestionRun(row_count=total_records))
+        session.commit()
+
+        report_throughput(total_records, started)
 
     except Exception as e:
         session.rollback()
@@ -177,6 +468,526 @@ def insert_data(df):
         session.close()
 
 
+def board_table(table):
+    """game_board_index counterpart of a trivia_questions table"""
+    return table.replace("trivia_questions", BOARD_INDEX_TABLE)
+
+
+def board_index_sql(source, target):
+    """
+    INSERT ... SELECT filling a game board index from a trivia_questions
+    table: one row per show, round and category with its number of valued
+    clues, and the category's first question id to keep the show's order.
+    """
+    return (
+        f"INSERT INTO {target} "
+        "(show_number, round, category, air_date, first_question_id, clue_count) "
+        "SELECT show_number, round, category, min(air_date), min(id), count(value) "
+        f"FROM {source} "
+        "WHERE deleted_at IS NULL AND round IS NOT NULL AND category IS NOT NULL "
+        "GROUP BY show_number, round, category"
+    )
+
+
+def build_board_index(cursor, source="trivia_questions"):
+    """
+    Rebuild the game board index of a trivia_questions table. The live index
+    is rewritten in the caller's transaction; any other is created afresh,
+    ready to be swapped in with its table.
+    """
+    target = board_table(source)
+    if target == BOARD_INDEX_TABLE:
+        cursor.execute(f"DELETE FROM {target}")
+    else:
+        cursor.execute(f"DROP TABLE IF EXISTS {target}")
+        cursor.execute(
+            f"CREATE TABLE {target} (LIKE {BOARD_INDEX_TABLE} INCLUDING ALL)"
+        )
+    cursor.execute(board_index_sql(source, target))
+    cursor.execute(f"ANALYZE {target}")
+
+
+def to_copy_frame(df):
+    """
+    Map cleaned CSV columns onto trivia_questions columns in COPY_COLUMNS order.
+    All conversions are vectorized; no per-row Python objects are built.
+    """
+    return pd.DataFrame(
+        {
+            "show_number": df["Show Number"],
+            "air_date": df["Air Date"].dt.strftime("%Y-%m-%d"),
+            "round": df["Round"],
+            "category": df["Category"],
+            "value": df["Value"].astype("Int64"),
+            "question": df["Question"],
+            "answer": df["Answer"],
+            "content_key": df["Content Key"],
+        }
+    )
+
+
+def copy_rows(cursor, table, chunks):
+    """
+    Stream cleaned DataFrames into a table with COPY FROM STDIN, one
+    COPY_CHUNK_ROWS in-memory CSV buffer at a time.
+
+    Returns:
+        Number of rows copied
+    """
+    columns = ", ".join(COPY_COLUMNS)
+    sql = f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+    total_records = 0
+
+    for df in chunks:
+        for i in range(0, len(df), COPY_CHUNK_ROWS):
+            buffer = io.StringIO()
+            to_copy_frame(df.iloc[i : i + COPY_CHUNK_ROWS]).to_csv(
+                buffer, header=False, index=False, na_rep="\\N"
+            )
+            buffer.seek(0)
+            if hasattr(cursor, "copy_expert"):  # psycopg2
+                cursor.copy_expert(sql, buffer)
+            else:  # psycopg 3
+                with cursor.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+        total_records += len(df)
+
+    return total_records
+
+
+def next_generation(cursor):
+    """Reserve the id of the ingestion run being prepared"""
+    cursor.execute("SELECT nextval(pg_get_serial_sequence('ingestion_runs', 'id'))")
+    return cursor.fetchone()[0]
+
+
+def table_exists(cursor, table):
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL", (table,))
+    return cursor.fetchone()[0]
+
+
+def count_rows(cursor, table):
+    cursor.execute(f"SELECT count(*) FROM {table}")
+    return cursor.fetchone()[0]
+
+
+def build_staging_table(cursor, chunks, generation):
+    """
+    Load the data into a fresh staging table shaped like trivia_questions and
+    build its primary key and indexes. Ids keep coming from the live table's
+    sequence, so they never collide with ids served before.
+
+    Returns:
+        Number of rows loaded
+    """
+    cursor.execute(f"DROP TABLE IF EXISTS {STAGING_TABLE}")
+    cursor.execute(
+        f"CREATE TABLE {STAGING_TABLE} "
+        "(LIKE trivia_questions "
+        "INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING GENERATED)"
+    )
+
+    total_records = copy_rows(cursor, STAGING_TABLE, chunks)
+
+    # The CSV repeats a few rows; keep the first copy of each
+    cursor.execute(
+        f"DELETE FROM {STAGING_TABLE} a USING {STAGING_TABLE} b "
+        "WHERE a.content_key = b.content_key AND a.id > b.id"
+    )
+    if cursor.rowcount:
+        print(f"Dropped {cursor.rowcount} duplicate records.")
+        total_records -= cursor.rowcount
+
+    # Rows that were already live keep their id, so cached question ids stay valid
+    cursor.execute(
+        f"UPDATE {STAGING_TABLE} s SET id = t.id FROM trivia_questions t "
+        "WHERE s.content_key = t.content_key AND s.id <> t.id"
+    )
+
+    # Index names carry the generation so they stay unique across swaps
+    cursor.execute(
+        f"ALTER TABLE {STAGING_TABLE} "
+        f"ADD CONSTRAINT trivia_questions_g{generation}_pkey PRIMARY KEY (id)"
+    )
+    for name, kind, columns in LIVE_INDEXES:
+        cursor.execute(
+            f"CREATE {kind} trivia_questions_g{generation}_{name} "
+            f"ON {STAGING_TABLE} {columns}"
+        )
+    cursor.execute(f"ANALYZE {STAGING_TABLE}")
+
+    return total_records
+
+
+def validate_staging_table(cursor, expected_rows):
+    """Refuse to go live with a short or suspiciously small load"""
+    staged_rows = count_rows(cursor, STAGING_TABLE)
+    if staged_rows != expected_rows:
+        raise ValueError(
+            f"Staging table has {staged_rows} rows, expected {expected_rows}"
+        )
+
+    live_rows = count_rows(cursor, "trivia_questions")
+    if staged_rows < live_rows * MIN_ROW_RATIO:
+        raise ValueError(
+            f"Staging table has {staged_rows} rows, less than {MIN_ROW_RATIO:.0%} "
+            f"of the {live_rows} live rows (set INGESTION_MIN_ROW_RATIO to override)"
+        )
+
+
+def swap_tables(connection, generation, row_count, incoming, outgoing):
+    """
+    Atomically make the incoming table live and keep the live one as outgoing.
+
+    Runs in one short transaction. lock_timeout bounds how long readers can
+    queue behind the rename; the swap is retried if it cannot get the lock.
+    """
+    for attempt in range(1, SWAP_ATTEMPTS + 1):
+        cursor = connection.cursor()
+        try:
+            cursor.execute(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'")
+            cursor.execute("SELECT pg_get_serial_sequence('trivia_questions', 'id')")
+            sequence = cursor.fetchone()[0]
+
+            # The game board index moves together with the questions
+            for name in [str, board_table]:
+                live = name("trivia_questions")
+                cursor.execute(f"ALTER TABLE {live} RENAME TO {name(SWAP_TABLE)}")
+                cursor.execute(f"ALTER TABLE {name(incoming)} RENAME TO {live}")
+                cursor.execute(
+                    f"ALTER TABLE {name(SWAP_TABLE)} RENAME TO {name(outgoing)}"
+                )
+            # Keep the id sequence alive when the outgoing table is dropped later
+            cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY trivia_questions.id")
+
+            # Bump the generation so running API workers rebuild their indexes
+            cursor.execute(
+                "INSERT INTO ingestion_runs (id, row_count) VALUES (%s, %s)",
+                (generation, row_count),
+            )
+            connection.commit()
+            return
+        except Exception as e:
+            connection.rollback()
+            if attempt == SWAP_ATTEMPTS:
+                raise
+            print(f"Swap attempt {attempt} failed ({e}), retrying...")
+            time.sleep(attempt)
+
+
+def stage_and_swap_data(chunks):
+    """
+    Bulk load data into PostgreSQL without disturbing readers.
+
+    Rows are streamed with COPY FROM STDIN into a staging table, indexed and
+    validated there, then swapped in with an atomic rename. The replaced data
+    is kept as trivia_questions_previous until the next ingestion, so
+    --rollback can restore it instantly.
+
+    Args:
+        chunks: Iterable of pandas DataFrames with trivia questions
+    """
+    connection = engine.raw_connection()
+    started = time.monotonic()
+
+    try:
+        print("Copying data into staging table...")
+        cursor = connection.cursor()
+
+        generation = next_generation(cursor)
+        total_records = build_staging_table(cursor, chunks, generation)
+        validate_staging_table(cursor, total_records)
+        build_board_index(cursor, STAGING_TABLE)
+        connection.commit()
+        report_throughput(total_records, started)
+
+        # The previous generation is only dropped once the new one is ready
+        cursor.execute(f"DROP TABLE IF EXISTS {PREVIOUS_TABLE}")
+        cursor.execute(f"DROP TABLE IF EXISTS {board_table(PREVIOUS_TABLE)}")
+        connection.commit()
+
+        swap_tables(
+            connection, generation, total_records, STAGING_TABLE, PREVIOUS_TABLE
+        )
+        print(f"Swapped in generation {generation}.")
+
+    except Exception as e:
+        connection.rollback()
+        print(f"Error loading data: {e}")
+        raise
+    finally:
+        connection.close()
+
+
+def changed_condition(old, new):
+    """SQL condition that is true when an upsert would change the old row"""
+    differences = [
+        f"{old}.{col} IS DISTINCT FROM {new}.{col}" for col in UPSERT_COLUMNS
+    ]
+    return " OR ".join(differences + [f"{old}.deleted_at IS NOT NULL"])
+
+
+def upsert_data(chunks, soft_delete=False):
+    """
+    Apply only the delta between the CSV and trivia_questions.
+
+    Rows are matched on content_key: new keys are inserted, rows whose air
+    date, value or answer changed are updated in place (keeping their id),
+    and identical rows are not written at all. With soft_delete, live rows
+    missing from the CSV get a deleted_at timestamp and are hidden from the
+    API; they come back if a later CSV contains them again.
+
+    Args:
+        chunks: Iterable of pandas DataFrames with trivia questions
+        soft_delete: Mark rows that are no longer in the CSV as deleted
+    """
+    connection = engine.raw_connection()
+    started = time.monotonic()
+
+    try:
+        print("Copying data into incoming table...")
+        cursor = connection.cursor()
+
+        columns = ", ".join(COPY_COLUMNS)
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {INCOMING_TABLE} ON COMMIT DROP AS "
+            f"SELECT {columns} FROM trivia_questions WITH NO DATA"
+        )
+        copy_rows(cursor, INCOMING_TABLE, chunks)
+        cursor.execute(f"ANALYZE {INCOMING_TABLE}")
+        # The CSV repeats a few rows; only the first copy of each is applied
+        cursor.execute(f"SELECT count(DISTINCT content_key) FROM {INCOMING_TABLE}")
+        total_records = cursor.fetchone()[0]
+
+        # Only new and changed rows reach the INSERT, so unchanged rows are
+        # neither written nor given an id. xmax is 0 only for inserted tuples.
+        incoming_columns = ", ".join(f"i.{col}" for col in COPY_COLUMNS)
+        updates = ", ".join(f"{col} = EXCLUDED.{col}" for col in UPSERT_COLUMNS)
+        cursor.execute(
+            f"WITH upserted AS ("
+            f"INSERT INTO trivia_questions ({columns}) "
+            f"SELECT DISTINCT ON (i.content_key) {incoming_columns} "
+            f"FROM {INCOMING_TABLE} i "
+            f"LEFT JOIN trivia_questions t ON t.content_key = i.content_key "
+            f"WHERE t.id IS NULL OR {changed_condition('t', 'i')} "
+            f"ORDER BY i.content_key, i.ctid "
+            f"ON CONFLICT (content_key) DO UPDATE SET {updates}, deleted_at = NULL "
+            f"WHERE {changed_condition('trivia_questions', 'EXCLUDED')} "
+            f"RETURNING xmax = 0 AS inserted) "
+            f"SELECT count(*) FILTER (WHERE inserted), "
+            f"count(*) FILTER (WHERE NOT inserted) FROM upserted"
+        )
+        inserted, updated = cursor.fetchone()
+
+        deleted = 0
+        if soft_delete:
+            cursor.execute(
+                "UPDATE trivia_questions t SET deleted_at = now() "
+                "WHERE t.deleted_at IS NULL AND NOT EXISTS ("
+                f"SELECT 1 FROM {INCOMING_TABLE} i "
+                "WHERE i.content_key = t.content_key)"
+            )
+            deleted = cursor.rowcount
+
+        elapsed = time.monotonic() - started
+        print(
+            f"Inserted {inserted}, updated {updated}, soft-deleted {deleted} and "
+            f"skipped {total_records - inserted - updated} unchanged records "
+            f"in {elapsed:.1f}s."
+        )
+
+        if inserted or updated or deleted:
+            build_board_index(cursor)
+            # Bump the generation so running API workers rebuild their indexes
+            cursor.execute(
+                "SELECT count(*) FROM trivia_questions WHERE deleted_at IS NULL"
+            )
+            cursor.execute(
+                "INSERT INTO ingestion_runs (row_count) VALUES (%s)",
+                (cursor.fetchone()[0],),
+            )
+        connection.commit()
+
+    except Exception as e:
+        connection.rollback()
+        print(f"Error loading data: {e}")
+        raise
+    finally:
+        connection.close()
+
+
+def rollback_data():
+    """Swap the previous generation back in (running it again rolls forward)"""
+    connection = engine.raw_connection()
+
+    try:
+        cursor = connection.cursor()
+        if not table_exists(cursor, PREVIOUS_TABLE):
+            raise ValueError(f"No {PREVIOUS_TABLE} table to roll back to")
+        ensure_schema(PREVIOUS_TABLE)
+        # Generations staged before the board index existed have none
+        if not table_exists(cursor, board_table(PREVIOUS_TABLE)):
+            build_board_index(cursor, PREVIOUS_TABLE)
+
+        generation = next_generation(cursor)
+        row_count = count_rows(cursor, PREVIOUS_TABLE)
+        connection.commit()
+
+        swap_tables(connection, generation, row_count, PREVIOUS_TABLE, PREVIOUS_TABLE)
+        print(f"Rolled back to the previous data ({row_count} records).")
+
+    except Exception as e:
+        connection.rollback()
+        print(f"Error rolling back: {e}")
+        raise
+    finally:
+        connection.close()
+
+
+def report_throughput(total_records, started):
+    elapsed = time.monotonic() - started
+    rate = total_records / elapsed if elapsed > 0 else 0
+    print(
+        f"Successfully inserted {total_records} records into the database "
+        f"in {elapsed:.1f}s ({rate:,.0f} rows/s)!"
+    )
+
+
+def load_data(chunks, mode="full", soft_delete=False):
+    """Load data with COPY on PostgreSQL, falling back to the ORM elsewhere"""
+    if engine.dialect.name != "postgresql":
+        if mode == "incremental":
+            print("Incremental loads need PostgreSQL, reloading all data instead.")
+        insert_data(chunks)
+    elif mode == "incremental":
+        upsert_data(chunks, soft_delete=soft_delete)
+    else:
+        stage_and_swap_data(chunks)
+
+
+class StringTable:
+    """Interned strings (rounds, categories) written as offsets plus a blob"""
+
+    def __init__(self):
+        self.indexes = {}
+        self.offsets = array("q", [0])
+        self.text = bytearray()
+
+    def index(self, value):
+        if value is None:
+            return SNAPSHOT_NULL_INDEX
+        index = self.indexes.get(value)
+        if index is None:
+            index = self.indexes[value] = len(self.indexes)
+            self.text += value.encode("utf-8")
+            self.offsets.append(len(self.text))
+        return index
+
+
+def export_snapshot(path):
+    """
+    Export the live questions to a memory-mappable columnar snapshot.
+
+    Rows are streamed from a server-side cursor in id order into int arrays,
+    interned round/category tables and one UTF-8 text blob (question and
+    answer of each row back to back). The file is written next to path and
+    renamed over it, so API workers only ever map a complete snapshot.
+
+    Args:
+        path: Snapshot file the API reads (CORPUS_SNAPSHOT_PATH)
+    """
+    connection = engine.raw_connection()
+    started = time.monotonic()
+
+    try:
+        print(f"Exporting corpus snapshot to {path}...")
+        cursor = connection.cursor()
+        cursor.execute("SELECT max(id) FROM ingestion_runs")
+        generation = cursor.fetchone()[0] or 0
+
+        if engine.dialect.name == "postgresql":
+            cursor = connection.cursor("snapshot_export")
+        cursor.execute(
+            "SELECT id, show_number, air_date, round, category, value, question, "
+            "answer FROM trivia_questions WHERE deleted_at IS NULL ORDER BY id"
+        )
+
+        columns = {name: array("i") for name in SNAPSHOT_SECTIONS[:6]}
+        text_offsets = array("q", [0])
+        text = bytearray()
+        rounds = StringTable()
+        categories = StringTable()
+
+        for row in cursor:
+            question_id, show_number, air_date, round_, category, value = row[:6]
+            if isinstance(air_date, str):  # SQLite
+                air_date = date.fromisoformat(air_date)
+
+            columns["ids"].append(question_id)
+            columns["show_number"].append(show_number)
+            columns["air_date"].append(
+                SNAPSHOT_NULL_INT
+                if air_date is None
+                else (air_date - SNAPSHOT_EPOCH).days
+            )
+            columns["round"].append(rounds.index(round_))
+            columns["category"].append(categories.index(category))
+            columns["value"].append(SNAPSHOT_NULL_INT if value is None else value)
+            for value_text in row[6:]:
+                text += (value_text or "").encode("utf-8")
+                text_offsets.append(len(text))
+
+        columns.update(
+            text_offsets=text_offsets,
+            text=text,
+            round_offsets=rounds.offsets,
+            round_text=rounds.text,
+            category_offsets=categories.offsets,
+            category_text=categories.text,
+        )
+        write_snapshot(path, columns, generation)
+
+        elapsed = time.monotonic() - started
+        print(
+            f"Exported {len(columns['ids'])} records (generation {generation}, "
+            f"{os.path.getsize(path):,} bytes) in {elapsed:.1f}s."
+        )
+
+    except Exception as e:
+        print(f"Error exporting snapshot: {e}")
+        raise
+    finally:
+        connection.close()
+
+
+def write_snapshot(path, columns, generation):
+    """Write the header, section table and 8-byte aligned sections atomically"""
+    sections = []
+    offset = SNAPSHOT_HEADER.size + SNAPSHOT_SECTION.size * len(SNAPSHOT_SECTIONS)
+    for name in SNAPSHOT_SECTIONS:
+        data = columns[name]
+        if isinstance(data, array) and sys.byteorder != "little":
+            data = array(data.typecode, data)
+            data.byteswap()
+        offset += -offset % 8
+        sections.append((offset, data))
+        offset += memoryview(data).nbytes
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(
+            SNAPSHOT_HEADER.pack(
+                SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(columns["ids"]), generation
+            )
+        )
+        for offset, data in sections:
+            f.write(SNAPSHOT_SECTION.pack(offset, memoryview(data).nbytes))
+        for offset, data in sections:
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(data)
+    os.replace(temp_path, path)
+
+
 def verify_data():
     """
     Verify the inserted data by querying the database and printing summary statistics.
@@ -184,7 +995,11 @@ def verify_data():
     session = Session()
 
     try:
-        total_count = session.query(TriviaQuestion).count()
+        total_count = (
+            session.query(TriviaQuestion)
+            .filter(TriviaQuestion.deleted_at.is_(None))
+            .count()
+        )
         print(f"\nVerification: Total records in database: {total_count}")
 
         # Show a few sample records
@@ -209,8 +1024,73 @@ def verify_data():
         session.close()
 
 
+def find_csv(data_dir):
+    """Path of the Jeopardy CSV in data_dir, preferring uncompressed input"""
+    for extension in ["", ".gz", ".zst"]:
+        csv_path = os.path.join(data_dir, "JEOPARDY_CSV.csv" + extension)
+        if os.path.exists(csv_path):
+            return csv_path
+    return os.path.join(data_dir, "JEOPARDY_CSV.csv")
+
+
 def main():
-    csv_path = os.path.join(os.path.dirname(__file__), "data", "JEOPARDY_CSV.csv")
+    parser = argparse.ArgumentParser(
+        description="Load the Jeopardy CSV into PostgreSQL"
+    )
+    parser.add_argument(
+        "--rollback",
+        action="store_true",
+        help="Swap the previous generation of trivia_questions back in and exit",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["full", "incremental"],
+        default="full",
+        help="full: reload every row through a staging table (default); "
+        "incremental: insert new and update changed rows only",
+    )
+    parser.add_argument(
+        "--soft-delete",
+        action="store_true",
+        help="With --mode incremental, mark rows missing from the CSV as deleted",
+    )
+    parser.add_argument(
+        "--csv",
+        help="CSV file to load, optionally .gz or .zst compressed "
+        "(default: data/JEOPARDY_CSV.csv[.gz|.zst])",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=INGESTION_WORKERS,
+        help="Processes preparing CSV chunks (default: INGESTION_WORKERS or CPU count)",
+    )
+    parser.add_argument(
+        "--snapshot",
+        default=CORPUS_SNAPSHOT_PATH,
+        help="Also export a columnar corpus snapshot for the API to this file "
+        "(default: CORPUS_SNAPSHOT_PATH)",
+    )
+    parser.add_argument(
+        "--snapshot-only",
+        action="store_true",
+        help="Export the snapshot of the current data and exit",
+    )
+    args = parser.parse_args()
+
+    if args.snapshot_only:
+        if not args.snapshot:
+            parser.error("--snapshot-only needs --snapshot or CORPUS_SNAPSHOT_PATH")
+        export_snapshot(args.snapshot)
+        return
+
+    if args.rollback:
+        rollback_data()
+        if args.snapshot:
+            export_snapshot(args.snapshot)
+        return
+
+    csv_path = args.csv or find_csv(os.path.join(os.path.dirname(__file__), "data"))
 
     if not os.path.exists(csv_path):
         print(f"Error: CSV file not found at {csv_path}")
@@ -220,18 +1100,19 @@ def main():
         # Step 1: Create tables
         create_tables()
 
-        # Step 2: Load and filter data
-        df = load_and_filter_data(csv_path, max_value=1200)
-
-        # Step 3: Clean data
-        df = clean_data(df)
+        # Step 2: Stream filtered and cleaned chunks of the CSV
+        chunks = load_and_filter_data(csv_path, max_value=1200, workers=args.workers)
 
-        # Step 4: Insert data into database
-        insert_data(df)
+        # Step 3: Insert data into database as the chunks arrive
+        load_data(chunks, mode=args.mode, soft_delete=args.soft_delete)
 
-        # Step 5: Verify insertion
+        # Step 4: Verify insertion
         verify_data()
 
+        # Step 5: Export the snapshot the API serves questions from
+        if args.snapshot:
+            export_snapshot(args.snapshot)
+
         print("\nData ingestion completed successfully!")
 
     except Exception as e:
@@ -1,12 +1,39 @@
 import os
 import sys
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from database import async_engine, engine
+from models.trivia_question import Base
+from models.answer_verdict import AnswerVerdict
+from services.metrics import (
+    METRICS_ENABLED,
+    MetricsMiddleware,
+    instrument_engine,
+    registry,
+)
+from services.verdict_cache import verdict_cache
 from trivia_service.router import router as trivia_router
 
-app = FastAPI(title="Trivia API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create the tables the API writes (the ingestion script and the agent_pregen
+    job own the rest)
+    """
+    if verdict_cache.persist:
+        async with async_engine.begin() as conn:
+            await conn.run_sync(
+                Base.metadata.create_all, tables=[AnswerVerdict.__table__]
+            )
+    yield
+
+
+app = FastAPI(title="Trivia API", lifespan=lifespan)
 
 # Enable CORS
 app.add_middleware(
@@ -15,8 +42,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Question-Cursor"],
 )
 
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    instrument_engine(engine, "sync")
+    instrument_engine(async_engine.sync_engine, "async")
+
 # Include routes
 app.include_router(trivia_router)
 
@@ -27,6 +60,12 @@ async def root():
     return {"message": "Trivia API", "status": "running", "docs": "/docs"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics of this worker"""
+    return Response(registry.render(), media_type=registry.content_type)
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -1,3 +1,13 @@
 from models.trivia_question import TriviaQuestion
+from models.ingestion_run import IngestionRun
+from models.answer_verdict import AnswerVerdict
+from models.game_board_category import GameBoardCategory
+from models.agent_answer import AgentAnswer
 
-__all__ = ["TriviaQuestion"]
+__all__ = [
+    "TriviaQuestion",
+    "IngestionRun",
+    "AnswerVerdict",
+    "GameBoardCategory",
+    "AgentAnswer",
+]
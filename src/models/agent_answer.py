@@ -0,0 +1,21 @@
+from sqlalchemy import Boolean, Column, DateTime, Integer, String, Text, func
+
+from models.trivia_question import Base
+
+
+class AgentAnswer(Base):
+    """SQLAlchemy ORM model for agent answers pre-generated by the agent_pregen job"""
+
+    __tablename__ = "agent_answers"
+
+    question_id = Column(Integer, primary_key=True)
+    agent_name = Column(String(64), primary_key=True)
+    # The question as it was answered; a reload that gives the ID to a
+    # different question makes the stored answer stale
+    question = Column(Text, nullable=True)
+    correct_answer = Column(Text, nullable=True)
+    agent_answer = Column(Text, nullable=False)
+    reasoning = Column(Text, nullable=False)
+    is_correct = Column(Boolean, nullable=False)
+    model = Column(String(64), nullable=False)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
@@ -0,0 +1,16 @@
+from sqlalchemy import Boolean, Column, DateTime, Integer, String, Text, func
+
+from models.trivia_question import Base
+
+
+class AnswerVerdict(Base):
+    """SQLAlchemy ORM model for cached LLM verdicts, shared between API workers"""
+
+    __tablename__ = "answer_verdicts"
+
+    question_id = Column(Integer, primary_key=True)
+    normalized_answer = Column(String(255), primary_key=True)
+    correct_answer = Column(Text, nullable=True)
+    is_correct = Column(Boolean, nullable=False)
+    ai_response = Column(Text, nullable=False)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
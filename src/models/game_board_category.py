@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Date, Integer, String
+
+from models.trivia_question import Base
+
+
+class GameBoardCategory(Base):
+    """SQLAlchemy ORM model for the game board index built at ingestion (one row per show round category)"""
+
+    __tablename__ = "game_board_index"
+
+    show_number = Column(Integer, primary_key=True)
+    round = Column(String(50), primary_key=True)
+    category = Column(String(255), primary_key=True)
+    air_date = Column(Date, nullable=True)
+    # Lowest question id of the category, giving the order it was played in
+    first_question_id = Column(Integer, nullable=False)
+    # Questions of the category that have a value
+    clue_count = Column(Integer, nullable=False)
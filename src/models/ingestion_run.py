@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, DateTime, func
+
+from models.trivia_question import Base
+
+
+class IngestionRun(Base):
+    """SQLAlchemy ORM model for completed ingestion runs (one row per generation)"""
+
+    __tablename__ = "ingestion_runs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    completed_at = Column(DateTime, nullable=False, server_default=func.now())
+    row_count = Column(Integer, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Text
+from sqlalchemy import Column, Integer, String, Date, DateTime, Text
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -17,3 +17,7 @@ class TriviaQuestion(Base):
     value = Column(Integer, nullable=True)
     question = Column(Text, nullable=True)
     answer = Column(Text, nullable=True)
+    # md5 of show number, round, category and question; see ingestion_script.py
+    content_key = Column(String(32), nullable=True, unique=True)
+    # Set when an incremental ingestion no longer finds the row in the CSV
+    deleted_at = Column(DateTime, nullable=True)
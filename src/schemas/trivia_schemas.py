@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import date
 
 
@@ -88,6 +88,75 @@ class VerifyAnswerResponse(BaseModel):
         }
 
 
+# Upper bound on answers in one batch verification request
+MAX_BATCH_ANSWERS = 500
+
+
+class VerifyAnswersRequest(BaseModel):
+    """Request model for batch answer verification"""
+
+    answers: List[VerifyAnswerRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_ANSWERS,
+        description="Answers to verify, one per player",
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "answers": [
+                    {"question_id": 7, "user_answer": "Copernicus"},
+                    {"question_id": 7, "user_answer": "Galileo"},
+                ]
+            }
+        }
+
+
+class VerifyAnswerItemResponse(BaseModel):
+    """Verdict for one answer in a batch; error is set instead if it could not be judged"""
+
+    question_id: int = Field(..., description="The question ID")
+    user_answer: str = Field(..., description="The user's answer as submitted")
+    is_correct: Optional[bool] = Field(
+        None, description="Whether the answer is correct"
+    )
+    ai_response: Optional[str] = Field(
+        None, description="AI explanation of the verification"
+    )
+    error: Optional[str] = Field(None, description="Why this answer was not judged")
+
+
+class VerifyAnswersResponse(BaseModel):
+    """Response model for batch answer verification, in request order"""
+
+    results: List[VerifyAnswerItemResponse] = Field(
+        ..., description="Per-answer verdicts"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "results": [
+                    {
+                        "question_id": 7,
+                        "user_answer": "Copernicus",
+                        "is_correct": True,
+                        "ai_response": "Correct, the answer is Copernicus.",
+                        "error": None,
+                    },
+                    {
+                        "question_id": 7,
+                        "user_answer": "Galileo",
+                        "is_correct": False,
+                        "ai_response": "Incorrect, the correct answer is Copernicus.",
+                        "error": None,
+                    },
+                ]
+            }
+        }
+
+
 class AgentPlayResponse(BaseModel):
     """Response model for AI agent playing trivia"""
 
@@ -119,3 +188,132 @@ class AgentPlayResponse(BaseModel):
                 "reasoning": "The Appian Way (Via Appia) was one of the earliest and most important Roman roads.",
             }
         }
+
+
+# Upper bound on questions in one tournament request
+MAX_TOURNAMENT_QUESTIONS = 500
+
+
+class TournamentRequest(BaseModel):
+    """Request model for an agent tournament"""
+
+    agents: Optional[List[str]] = Field(
+        None, description="Agent names to include (default: all agents)"
+    )
+    questions: int = Field(
+        10,
+        ge=1,
+        le=MAX_TOURNAMENT_QUESTIONS,
+        description="Number of random questions every agent answers",
+    )
+    round: Optional[str] = Field(None, description="Filter questions by game round")
+    value: Optional[str] = Field(None, description="Filter questions by value")
+    concurrency: Optional[int] = Field(
+        None, ge=1, le=64, description="Matchups played at the same time"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "agents": ["HistoryBot", "NoviceNed"],
+                "questions": 20,
+                "round": "Jeopardy!",
+                "value": "$200",
+                "concurrency": 8,
+            }
+        }
+
+
+MAX_SEARCH_RESULTS = 100
+
+
+class SearchResultItem(QuestionResponse):
+    """One full-text search hit"""
+
+    rank: float = Field(..., description="Relevance (ts_rank_cd), higher is better")
+
+    class Config:
+        from_attributes = True
+        json_schema_extra = {
+            "example": {
+                "question_id": 3,
+                "round": "Jeopardy!",
+                "category": "HISTORY",
+                "value": "$200",
+                "question": "For the last 8 years of his life, Galileo was under house arrest for espousing this man's theory",
+                "rank": 0.1,
+            }
+        }
+
+
+class SearchResponse(BaseModel):
+    """Response model for question search, best matches first"""
+
+    results: List[SearchResultItem] = Field(..., description="Matching questions")
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as cursor to get the next page (null on the last page)"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "results": [
+                    {
+                        "question_id": 3,
+                        "round": "Jeopardy!",
+                        "category": "HISTORY",
+                        "value": "$200",
+                        "question": "For the last 8 years of his life, Galileo was under house arrest for espousing this man's theory",
+                        "rank": 0.1,
+                    }
+                ],
+                "next_cursor": "WzAuMSwgM10",
+            }
+        }
+
+
+class BoardClue(BaseModel):
+    """One question on a game board (verify answers with /verify-answer/)"""
+
+    question_id: int = Field(..., description="Unique identifier for the question")
+    value: str = Field(..., description="Monetary value (e.g., $200)")
+    question: str = Field(..., description="The trivia question text")
+
+
+class BoardCategory(BaseModel):
+    """One column of a game board, lowest value first"""
+
+    category: str = Field(..., description="Question category")
+    clues: List[BoardClue] = Field(..., description="The category's five questions")
+
+
+class GameBoardResponse(BaseModel):
+    """Response model for a full game board from one show round"""
+
+    show_number: int = Field(..., description="Show number")
+    round: str = Field(..., description="Game round (Jeopardy!, Double Jeopardy!)")
+    air_date: Optional[date] = Field(None, description="Air date of the episode")
+    categories: List[BoardCategory] = Field(
+        ..., description="The board's six categories, in show order"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "show_number": 4680,
+                "round": "Jeopardy!",
+                "air_date": "2004-12-31",
+                "categories": [
+                    {
+                        "category": "HISTORY",
+                        "clues": [
+                            {
+                                "question_id": 3,
+                                "value": "$200",
+                                "question": "For the last 8 years of his life, Galileo was under house arrest for espousing this man's theory",
+                            }
+                        ],
+                    }
+                ],
+            }
+        }
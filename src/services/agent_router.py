@@ -0,0 +1,141 @@
+import json
+import os
+import random
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Generic, Iterable, List, Set, Tuple, TypeVar, Union
+
+# Agents and category routing rules; see agent_routing.json for the format
+AGENT_ROUTING_PATH = os.getenv(
+    "AGENT_ROUTING_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "agent_routing.json"),
+)
+# Distinct categories whose routing result is remembered
+AGENT_ROUTE_CACHE_SIZE = int(os.getenv("AGENT_ROUTE_CACHE_SIZE", "65536"))
+
+T = TypeVar("T")
+
+
+class AhoCorasick(Generic[T]):
+    """
+    Multi-pattern substring matcher.
+
+    Finds every pattern occurring in a text in one pass over the text,
+    however many patterns there are.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, T]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[T]] = [[]]
+
+        for pattern, tag in patterns:
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = next_state
+            self._out[state].append(tag)
+
+        # Breadth-first, so every failure link points at a finished state
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._out[next_state] = self._out[next_state] + self._out[target]
+
+    def search(self, text: str) -> Set[T]:
+        """Tags of all patterns that occur in text"""
+        found: Set[T] = set()
+        state = 0
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            found.update(self._out[state])
+        return found
+
+
+class AgentRouter:
+    """
+    Picks the agent best suited to a question category.
+
+    Rules, in priority order:
+    1. the first agent whose specialty occurs in the category, or whose
+       specialty contains the whole category
+    2. the first keyword group with a word occurring in the category
+    3. a random fallback agent
+
+    Rule 1 and 2 patterns are compiled into one Aho-Corasick automaton and
+    results are memoized per category, so routing a category seen before is
+    a dict lookup. Only the random fallback is drawn on every call.
+    """
+
+    def __init__(self, config: dict):
+        self.agents: List[dict] = config["agents"]
+        agents_by_name = {agent["name"]: agent for agent in self.agents}
+
+        self._specialties = [agent["specialty"].lower() for agent in self.agents]
+        # Tags sort by priority: (rule, position within the rule)
+        patterns = [
+            (specialty, (1, i)) for i, specialty in enumerate(self._specialties)
+        ]
+        self._keyword_agents = []
+        for i, group in enumerate(config["keywords"]):
+            self._keyword_agents.append(agents_by_name[group["agent"]])
+            patterns += [(word.lower(), (2, i)) for word in group["words"]]
+        self._matcher = AhoCorasick(patterns)
+
+        self._fallback = tuple(agents_by_name[name] for name in config["fallback"])
+        self._route = lru_cache(maxsize=AGENT_ROUTE_CACHE_SIZE)(self._match)
+
+    @classmethod
+    def from_file(cls, path: str = AGENT_ROUTING_PATH) -> "AgentRouter":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def _match(self, category: str) -> Union[dict, Tuple[dict, ...]]:
+        """Matching agent for a lowercased category, or the fallback agents"""
+        tags = self._matcher.search(category)
+        for i, specialty in enumerate(self._specialties):
+            if category in specialty:
+                tags.add((1, i))
+        if not tags:
+            return self._fallback
+
+        rule, i = min(tags)
+        return self.agents[i] if rule == 1 else self._keyword_agents[i]
+
+    def route(self, category: str) -> dict:
+        """Select the agent for a question category"""
+        agent = self._route(category.lower())
+        if isinstance(agent, tuple):
+            return random.choice(agent)
+        return agent
+
+    def candidates(self, category: str) -> List[dict]:
+        """Every agent route() may select for a category"""
+        agent = self._route(category.lower())
+        return list(agent) if isinstance(agent, tuple) else [agent]
+
+    def stats(self) -> dict:
+        info = self._route.cache_info()
+        return {
+            "categories": info.currsize,
+            "hits": info.hits,
+            "misses": info.misses,
+        }
+
+
+agent_router = AgentRouter.from_file()
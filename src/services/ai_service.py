@@ -1,25 +1,21 @@
 import os
-from openai import OpenAI
-from typing import Tuple
+from typing import AsyncIterator, List, Optional, Tuple
 import random
+from services.answer_judge import judge_answer
+from services.llm_transport import transport
+from services.metrics import llm_fallbacks, record_llm_usage, track_llm_call
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+VERIFY_MODEL = "gpt-4.5"
+AGENT_MODEL = "gpt-4o-mini"
 
+# How agent answers are judged: "local" (no second LLM call) or "llm"
+AGENT_VERIFY_MODE = os.getenv("AGENT_VERIFY_MODE", "local")
 
-def verify_answer_with_ai(
-    question: str, correct_answer: str, user_answer: str
-) -> Tuple[bool, str]:
-    """
-    Verify if user's answer matches the correct answer using OpenAI.
-
-    Args:
-        question: The trivia question
-        correct_answer: The correct answer from the database
-        user_answer: The user's submitted answer
 
-    Returns:
-        Tuple of (is_correct, ai_explanation)
-    """
+def _build_verify_messages(
+    question: str, correct_answer: str, user_answer: str
+) -> List[dict]:
+    """Build the chat messages asking the judge model for a verdict"""
 
     prompt = f"""You are a Jeopardy! game judge. Your task is to determine if a user's answer is correct, even if it has spelling errors or is phrased differently.
 
@@ -39,72 +35,106 @@ def verify_answer_with_ai(
 
     Be generous with spelling errors but strict about factual accuracy."""
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4.5",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a helpful and fair Jeopardy! game judge.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=150,
-        )
+    return [
+        {
+            "role": "system",
+            "content": "You are a helpful and fair Jeopardy! game judge.",
+        },
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _parse_verdict(ai_response: str) -> Tuple[bool, str]:
+    """Parse a VERDICT:/EXPLANATION: judge response into (is_correct, explanation)"""
+    lines = ai_response.split("\n")
+    verdict_line = ""
+    explanation_line = ""
+
+    for line in lines:
+        if line.startswith("VERDICT:"):
+            verdict_line = line.replace("VERDICT:", "").strip()
+        elif line.startswith("EXPLANATION:"):
+            explanation_line = line.replace("EXPLANATION:", "").strip()
+
+    # Determine if correct
+    is_correct = (
+        "CORRECT" in verdict_line.upper() and "INCORRECT" not in verdict_line.upper()
+    )
 
-        ai_response = response.choices[0].message.content.strip()
+    # Use explanation or fallback
+    explanation = explanation_line if explanation_line else ai_response
 
-        # Parse the response
-        lines = ai_response.split("\n")
-        verdict_line = ""
-        explanation_line = ""
+    return is_correct, explanation
 
-        for line in lines:
-            if line.startswith("VERDICT:"):
-                verdict_line = line.replace("VERDICT:", "").strip()
-            elif line.startswith("EXPLANATION:"):
-                explanation_line = line.replace("EXPLANATION:", "").strip()
 
-        # Determine if correct
-        is_correct = (
-            "CORRECT" in verdict_line.upper()
-            and "INCORRECT" not in verdict_line.upper()
-        )
+def local_match(correct_answer: str, user_answer: str) -> bool:
+    """
+    Decide correctness with the local judge alone. Only a confident local
+    accept counts as correct; ambiguous answers are judged incorrect.
+    """
+    return judge_answer(correct_answer, user_answer).verdict is True
 
-        # Use explanation or fallback
-        explanation = explanation_line if explanation_line else ai_response
 
-        return is_correct, explanation
+def fallback_verdict(correct_answer: str, user_answer: str) -> Tuple[bool, str]:
+    """Local match used when the judge model is unavailable"""
+    llm_fallbacks.inc(VERIFY_MODEL, "verdict")
+    is_correct = local_match(correct_answer, user_answer)
+    explanation = f"API error. Simple match: {'Yes' if is_correct else 'No'}, correct answer is {correct_answer}."
+    return is_correct, explanation
 
-    except Exception as e:
-        print(f"OpenAI API error: {e}")
-        is_correct = (
-            user_answer.lower().strip() in correct_answer.lower()
-            or correct_answer.lower() in user_answer.lower().strip()
+
+async def request_verdict_async(
+    question: str, correct_answer: str, user_answer: str
+) -> Tuple[bool, str]:
+    """
+    Ask the judge model for a verdict. Unlike verify_answer_with_ai_async,
+    API errors are raised to the caller instead of falling back to a simple match.
+
+    Returns:
+        Tuple of (is_correct, ai_explanation)
+    """
+    with track_llm_call(VERIFY_MODEL, "verdict"):
+        response = await transport.create_async(
+            model=VERIFY_MODEL,
+            messages=_build_verify_messages(question, correct_answer, user_answer),
+            max_tokens=150,
         )
-        explanation = f"API error. Simple match: {'Yes' if is_correct else 'No'}, correct answer is {correct_answer}."
-        return is_correct, explanation
+    record_llm_usage(VERIFY_MODEL, response.usage)
 
+    return _parse_verdict(response.choices[0].message.content.strip())
 
-def get_agent_answer(
-    question: str,
-    category: str,
-    correct_answer: str,
-    agent_specialty: str,
-    skill_level: str,
-) -> Tuple[str, str, bool]:
+
+async def verify_answer_with_ai_async(
+    question: str, correct_answer: str, user_answer: str
+) -> Tuple[bool, str]:
     """
-    Get an AI agent's answer to a trivia question.
+    Verify if user's answer matches the correct answer using OpenAI.
 
     Args:
         question: The trivia question
-        category: Question category
-        correct_answer: The correct answer (for verification)
-        agent_specialty: Agent's area of expertise (history, geography, science, etc.)
-        skill_level: Agent's skill level (expert, intermediate, novice)
+        correct_answer: The correct answer from the database
+        user_answer: The user's submitted answer
 
     Returns:
-        Tuple of (agent_answer, reasoning, is_correct)
+        Tuple of (is_correct, ai_explanation)
+    """
+
+    try:
+        return await request_verdict_async(question, correct_answer, user_answer)
+
+    except Exception as e:
+        print(f"OpenAI API error: {e}")
+        return fallback_verdict(correct_answer, user_answer)
+
+
+def _build_agent_request(
+    question: str, category: str, agent_specialty: str, skill_level: str
+) -> Tuple[List[dict], float]:
+    """
+    Build the chat messages for an agent's answer.
+
+    Returns:
+        Tuple of (messages, temperature)
     """
 
     # Define skill level prompts
@@ -156,44 +186,252 @@ def get_agent_answer(
 
     Be concise. Answer as if you're a contestant."""
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": f"You are a Jeopardy! contestant AI agent. Specialty: {agent_specialty}. Skill: {skill_level}.",
-                },
-                {"role": "user", "content": prompt},
-            ],
+    messages = [
+        {
+            "role": "system",
+            "content": f"You are a Jeopardy! contestant AI agent. Specialty: {agent_specialty}. Skill: {skill_level}.",
+        },
+        {"role": "user", "content": prompt},
+    ]
+
+    return messages, 0.7 if make_mistake else 0.3
+
+
+def _parse_agent_answer(ai_response: str) -> Tuple[str, str]:
+    """Parse an ANSWER:/REASONING: agent response into (agent_answer, reasoning)"""
+    lines = ai_response.split("\n")
+    agent_answer = ""
+    reasoning = ""
+
+    for line in lines:
+        if line.startswith("ANSWER:"):
+            agent_answer = line.replace("ANSWER:", "").strip()
+        elif line.startswith("REASONING:"):
+            reasoning = line.replace("REASONING:", "").strip()
+
+    # Fallback if parsing fails
+    if not agent_answer:
+        agent_answer = ai_response.split("\n")[0]
+    if not reasoning:
+        reasoning = "No reasoning provided."
+
+    return agent_answer, reasoning
+
+
+class AgentAnswerParser:
+    """
+    Incremental version of _parse_agent_answer for streamed responses.
+
+    feed() returns (field, text) deltas for the ANSWER:/REASONING: lines as
+    soon as a line is known to start with its label; other lines are ignored,
+    like in the full parser. finish() parses the complete text, so the final
+    values match _parse_agent_answer exactly (trimming and fallbacks included).
+    """
+
+    LABELS = {"ANSWER:": "answer", "REASONING:": "reasoning"}
+
+    def __init__(self):
+        self._chunks: List[str] = []
+        self._line_start = ""  # Start of the current line, until its label is known
+        self._field: Optional[str] = None
+        self._decided = False
+        self._skip_spaces = False
+        self._started = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        """Consume a chunk of the response and return (field, text) deltas"""
+        self._chunks.append(chunk)
+        deltas: List[Tuple[str, str]] = []
+
+        for char in chunk:
+            # The full parser strips the response, so leading whitespace never counts
+            if not self._started:
+                if char.isspace():
+                    continue
+                self._started = True
+
+            if char == "\n":
+                self._line_start = ""
+                self._field = None
+                self._decided = False
+                continue
+
+            if not self._decided:
+                self._line_start += char
+                label = next(
+                    (l for l in self.LABELS if self._line_start.startswith(l)), None
+                )
+                if label:
+                    self._field = self.LABELS[label]
+                    self._decided = True
+                    self._skip_spaces = True
+                elif not any(l.startswith(self._line_start) for l in self.LABELS):
+                    self._decided = True
+                continue
+
+            if self._field is None:
+                continue
+            if self._skip_spaces and char.isspace():
+                continue
+            self._skip_spaces = False
+
+            if deltas and deltas[-1][0] == self._field:
+                deltas[-1] = (self._field, deltas[-1][1] + char)
+            else:
+                deltas.append((self._field, char))
+
+        return deltas
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chunks)
+
+    def finish(self) -> Tuple[str, str]:
+        """Parse the complete response into (agent_answer, reasoning)"""
+        return _parse_agent_answer(self.text.strip())
+
+
+async def _judge_agent_answer_async(
+    question: str, correct_answer: str, agent_answer: str
+) -> bool:
+    """Judge an agent's answer according to AGENT_VERIFY_MODE"""
+    if AGENT_VERIFY_MODE == "llm":
+        is_correct, _ = await verify_answer_with_ai_async(
+            question, correct_answer, agent_answer
+        )
+        return is_correct
+    return local_match(correct_answer, agent_answer)
+
+
+async def request_agent_answer_async(
+    question: str,
+    category: str,
+    correct_answer: str,
+    agent_specialty: str,
+    skill_level: str,
+) -> Tuple[str, str, bool]:
+    """
+    Ask the agent model for an answer and judge it. Unlike
+    get_agent_answer_async, API errors are raised to the caller instead of
+    producing an "Unable to answer" result.
+
+    Returns:
+        Tuple of (agent_answer, reasoning, is_correct)
+    """
+
+    messages, temperature = _build_agent_request(
+        question, category, agent_specialty, skill_level
+    )
+
+    with track_llm_call(AGENT_MODEL, "agent"):
+        response = await transport.create_async(
+            model=AGENT_MODEL,
+            messages=messages,
             max_tokens=150,
-            temperature=0.7 if make_mistake else 0.3,
+            temperature=temperature,
         )
+    record_llm_usage(AGENT_MODEL, response.usage)
 
-        ai_response = response.choices[0].message.content.strip()
+    agent_answer, reasoning = _parse_agent_answer(
+        response.choices[0].message.content.strip()
+    )
 
-        # Parse the response
-        lines = ai_response.split("\n")
-        agent_answer = ""
-        reasoning = ""
+    # Verify if the answer is correct
+    is_correct = await _judge_agent_answer_async(question, correct_answer, agent_answer)
 
-        for line in lines:
-            if line.startswith("ANSWER:"):
-                agent_answer = line.replace("ANSWER:", "").strip()
-            elif line.startswith("REASONING:"):
-                reasoning = line.replace("REASONING:", "").strip()
+    return agent_answer, reasoning, is_correct
 
-        # Fallback if parsing fails
-        if not agent_answer:
-            agent_answer = ai_response.split("\n")[0]
-        if not reasoning:
-            reasoning = "No reasoning provided."
 
-        # Verify if the answer is correct
-        is_correct, _ = verify_answer_with_ai(question, correct_answer, agent_answer)
+async def get_agent_answer_async(
+    question: str,
+    category: str,
+    correct_answer: str,
+    agent_specialty: str,
+    skill_level: str,
+) -> Tuple[str, str, bool]:
+    """
+    Get an AI agent's answer to a trivia question.
 
-        return agent_answer, reasoning, is_correct
+    The answer takes one chat completion. It is judged with the local matcher
+    unless AGENT_VERIFY_MODE is "llm", which adds a second judge completion.
+
+    Args:
+        question: The trivia question
+        category: Question category
+        correct_answer: The correct answer (for verification)
+        agent_specialty: Agent's area of expertise (history, geography, science, etc.)
+        skill_level: Agent's skill level (expert, intermediate, novice)
+
+    Returns:
+        Tuple of (agent_answer, reasoning, is_correct)
+    """
+
+    try:
+        return await request_agent_answer_async(
+            question, category, correct_answer, agent_specialty, skill_level
+        )
 
     except Exception as e:
-        print(f"OpenAI API error in get_agent_answer: {e}")
+        print(f"OpenAI API error in get_agent_answer_async: {e}")
+        llm_fallbacks.inc(AGENT_MODEL, "agent")
         return "Unable to answer", f"API error occurred: {str(e)}", False
+
+
+async def stream_agent_answer(
+    question: str,
+    category: str,
+    correct_answer: str,
+    agent_specialty: str,
+    skill_level: str,
+) -> AsyncIterator[Tuple[str, dict]]:
+    """
+    Streaming version of get_agent_answer_async.
+
+    Yields ("answer", {"text": ...}) and ("reasoning", {"text": ...}) deltas while
+    the completion is still arriving, then one ("verdict", {...}) event with the
+    parsed agent_answer, reasoning and is_correct.
+    """
+
+    messages, temperature = _build_agent_request(
+        question, category, agent_specialty, skill_level
+    )
+    parser = AgentAnswerParser()
+
+    try:
+        with track_llm_call(AGENT_MODEL, "agent_stream"):
+            stream = await transport.create_async(
+                model=AGENT_MODEL,
+                messages=messages,
+                max_tokens=150,
+                temperature=temperature,
+                stream=True,
+                # Token usage arrives in a last chunk without choices
+                stream_options={"include_usage": True},
+            )
+
+            async for chunk in stream:
+                record_llm_usage(AGENT_MODEL, chunk.usage)
+                if not chunk.choices:
+                    continue
+                for field, text in parser.feed(chunk.choices[0].delta.content or ""):
+                    yield field, {"text": text}
+
+        agent_answer, reasoning = parser.finish()
+        is_correct = await _judge_agent_answer_async(
+            question, correct_answer, agent_answer
+        )
+
+    except Exception as e:
+        print(f"OpenAI API error in stream_agent_answer: {e}")
+        llm_fallbacks.inc(AGENT_MODEL, "agent_stream")
+        agent_answer, reasoning, is_correct = (
+            "Unable to answer",
+            f"API error occurred: {str(e)}",
+            False,
+        )
+
+    yield "verdict", {
+        "agent_answer": agent_answer,
+        "reasoning": reasoning,
+        "is_correct": is_correct,
+    }
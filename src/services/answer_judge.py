@@ -0,0 +1,238 @@
+import html
+import os
+import re
+import unicodedata
+from typing import List, NamedTuple, Optional
+
+# Scores at or above ACCEPT are judged CORRECT, at or below REJECT INCORRECT.
+# Everything in between is ambiguous and goes to the LLM judge. A low score is
+# no evidence of a wrong answer ("Samuel Clemens" for "Mark Twain", "JFK" for
+# "John F. Kennedy" share no tokens), so by default only conflicting numbers
+# are rejected locally and every other non-match goes to the LLM.
+JUDGE_ACCEPT_THRESHOLD = float(os.getenv("JUDGE_ACCEPT_THRESHOLD", "0.85"))
+JUDGE_REJECT_THRESHOLD = float(os.getenv("JUDGE_REJECT_THRESHOLD", "-1"))
+LOCAL_JUDGE_ENABLED = os.getenv("LOCAL_JUDGE_ENABLED", "1") == "1"
+
+# Token similarity weights. A near-miss token may be a misspelling
+# ("Copernics") or a different answer ("Iceland" for "Ireland"), so it weighs
+# less than JUDGE_ACCEPT_THRESHOLD: an answer without any exact token is never
+# accepted locally.
+FUZZY_MIN_LENGTH = 4
+FUZZY_MIN_RATIO = 0.8
+FUZZY_WEIGHT = 0.75
+PHONETIC_WEIGHT = 0.6
+
+_HTML_TAG = re.compile(r"<[^>]+>")
+_PARENTHETICAL = re.compile(r"\(([^)]*)\)")
+_RESPONSE_PREFIX = re.compile(
+    r"^(?:what|who|where|which)\s+(?:is|are|was|were)\s+|^(?:what|who)'s\s+"
+)
+_NON_WORD = re.compile(r"[^\w\s]")
+_ARTICLES = {"a", "an", "the"}
+_NUMBER_WORDS = {
+    word: str(number)
+    for number, word in enumerate(
+        "zero one two three four five six seven eight nine ten eleven twelve "
+        "thirteen fourteen fifteen sixteen seventeen eighteen nineteen twenty".split()
+    )
+}
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+
+# Verdict counts since startup, exposed through the stats endpoint
+judge_stats = {"correct": 0, "incorrect": 0, "ambiguous": 0}
+
+
+class Judgement(NamedTuple):
+    """Result of local judging; verdict is None when the answer is ambiguous"""
+
+    verdict: Optional[bool]
+    score: float
+    explanation: str
+
+
+def _clean(text: str) -> str:
+    """Unescape, drop HTML tags and backslash escapes, strip accents and lowercase"""
+    text = _HTML_TAG.sub("", html.unescape(text)).replace("\\", "")
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in text if not unicodedata.combining(c)).lower().strip()
+
+
+def _tokens(text: str) -> List[str]:
+    """Split cleaned text into significant tokens (no articles, numbers as digits)"""
+    text = _RESPONSE_PREFIX.sub("", text.strip())
+    words = _NON_WORD.sub(" ", text.replace("&", " and ")).split()
+    return [_NUMBER_WORDS.get(w, w) for w in words if w not in _ARTICLES]
+
+
+def answer_variants(correct_answer: str) -> List[List[str]]:
+    """
+    Token lists of every acceptable form of a Jeopardy answer.
+
+    Parentheticals mark optional or alternative parts: "(Louis) Armstrong"
+    accepts "Armstrong" and "Louis Armstrong", "Thorpe (or Jim Thorpe)"
+    accepts either.
+    """
+    text = _clean(correct_answer)
+    variants = [
+        _tokens(_PARENTHETICAL.sub(" ", text)),
+        _tokens(_PARENTHETICAL.sub(r" \1 ", text)),
+    ]
+    for inner in _PARENTHETICAL.findall(text):
+        inner = inner.strip()
+        if inner.startswith("or "):
+            variants.append(_tokens(inner[3:]))
+    return [v for v in variants if v]
+
+
+def levenshtein(a: str, b: str) -> int:
+    """Edit distance between two strings"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(
+                min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            )
+        previous = current
+    return previous[-1]
+
+
+def soundex(word: str) -> str:
+    """American Soundex code of a word ("copernicus" -> "C165")"""
+    letters = [c for c in word.lower() if c.isalpha()]
+    if not letters:
+        return ""
+    code = letters[0].upper()
+    last = _SOUNDEX_CODES.get(letters[0], "")
+    for c in letters[1:]:
+        digit = _SOUNDEX_CODES.get(c, "")
+        if digit and digit != last:
+            code += digit
+        if c not in "hw":
+            last = digit
+    return (code + "000")[:4]
+
+
+def _token_similarity(expected: str, given: str) -> float:
+    """Similarity of two tokens in [0, 1] from edit distance and phonetics"""
+    if expected == given:
+        return 1.0
+    if expected.isdigit() or given.isdigit():
+        return 0.0
+    if min(len(expected), len(given)) < FUZZY_MIN_LENGTH:
+        return 0.0
+
+    ratio = 1 - levenshtein(expected, given) / max(len(expected), len(given))
+    if ratio >= FUZZY_MIN_RATIO:
+        return FUZZY_WEIGHT
+    if soundex(expected) == soundex(given):
+        return PHONETIC_WEIGHT
+    return 0.0
+
+
+def conflicting_numbers(expected: List[str], given: List[str]) -> bool:
+    """Whether both answers contain numbers (or years) and they differ"""
+    expected_numbers = {t for t in expected if t.isdigit()}
+    given_numbers = {t for t in given if t.isdigit()}
+    return (
+        bool(expected_numbers and given_numbers) and expected_numbers != given_numbers
+    )
+
+
+def score_answer(expected: List[str], given: List[str]) -> float:
+    """
+    Score a tokenized answer against one tokenized variant of the correct answer.
+
+    The score is the F1 of fuzzy token overlap, so a partial answer ("Adams"
+    or "John Adams" for "John Quincy Adams") lands in the ambiguous band and
+    the LLM decides whether it names the same thing. Optional parts marked in
+    the correct answer, as in "(Louis) Armstrong", are full variants of their own.
+    """
+    if not expected or not given:
+        return 0.0
+    if "".join(expected) == "".join(given):
+        return 1.0
+    if conflicting_numbers(expected, given):
+        return 0.0
+
+    matrix = [[_token_similarity(e, g) for g in given] for e in expected]
+    recall = sum(max(row) for row in matrix) / len(expected)
+    precision = sum(max(column) for column in zip(*matrix)) / len(given)
+
+    if recall + precision == 0:
+        return 0.0
+    return 2 * recall * precision / (recall + precision)
+
+
+def judge_answer(correct_answer: str, user_answer: str) -> Judgement:
+    """
+    Judge an answer locally without calling the LLM.
+
+    Strips Jeopardy answer noise (articles, "what is", parentheticals, HTML),
+    scores the answer against every accepted variant with edit distance,
+    token overlap and Soundex, and only commits to a verdict outside the
+    ambiguous band between JUDGE_REJECT_THRESHOLD and JUDGE_ACCEPT_THRESHOLD.
+    An answer whose numbers conflict with every variant is INCORRECT.
+
+    Args:
+        correct_answer: The correct answer from the database
+        user_answer: The user's submitted answer
+
+    Returns:
+        Judgement with verdict True/False, or None when the LLM should decide
+    """
+    given = _tokens(_clean(user_answer))
+    variants = answer_variants(correct_answer)
+    score = max((score_answer(v, given) for v in variants), default=0.0)
+
+    if not given:
+        verdict = False
+    elif not variants:
+        verdict = None
+    elif score >= JUDGE_ACCEPT_THRESHOLD:
+        verdict = True
+    elif score <= JUDGE_REJECT_THRESHOLD or all(
+        conflicting_numbers(v, given) for v in variants
+    ):
+        verdict = False
+    else:
+        verdict = None
+
+    if verdict is True:
+        explanation = f"Correct, the answer is {correct_answer}."
+    elif verdict is False:
+        explanation = f"Incorrect, the correct answer is {correct_answer}."
+    else:
+        explanation = f"Unclear match, the correct answer is {correct_answer}."
+
+    return Judgement(verdict, round(score, 4), explanation)
+
+
+def prejudge_answer(correct_answer: str, user_answer: str) -> Optional[Judgement]:
+    """
+    Run the local judge as the first verification tier.
+
+    Returns:
+        The judgement if it is confident, None if the answer needs the LLM
+    """
+    if not LOCAL_JUDGE_ENABLED:
+        return None
+
+    judgement = judge_answer(correct_answer, user_answer)
+    if judgement.verdict is True:
+        judge_stats["correct"] += 1
+    elif judgement.verdict is False:
+        judge_stats["incorrect"] += 1
+    else:
+        judge_stats["ambiguous"] += 1
+        return None
+    return judgement
@@ -0,0 +1,196 @@
+import bisect
+import random
+import threading
+from datetime import date
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from models.game_board_category import GameBoardCategory
+from services.generation import get_generation
+
+# A board is BOARD_CATEGORIES categories of BOARD_CLUES questions each
+BOARD_CATEGORIES = 6
+BOARD_CLUES = 5
+
+# Sort key of boards whose show has no air date: before every era
+UNDATED = 0
+
+
+class Board(NamedTuple):
+    """A playable show round and the categories that make up its board"""
+
+    show_number: int
+    round: str
+    air_date: Optional[date]
+    categories: Tuple[str, ...]
+
+
+class BoardEra:
+    """Boards sorted by air date, so an era is a slice found by bisection"""
+
+    def __init__(self, boards: List[Board]):
+        self.boards = sorted(
+            boards,
+            key=lambda board: (
+                board.air_date.toordinal() if board.air_date else UNDATED,
+                board.show_number,
+            ),
+        )
+        self.dates = [
+            board.air_date.toordinal() if board.air_date else UNDATED
+            for board in self.boards
+        ]
+
+    def pick(
+        self, aired_from: Optional[date] = None, aired_to: Optional[date] = None
+    ) -> Optional[Board]:
+        if aired_from is None and aired_to is None:
+            lo, hi = 0, len(self.boards)
+        else:
+            # Undated shows cannot be placed in an era
+            start = aired_from.toordinal() if aired_from else UNDATED + 1
+            lo = bisect.bisect_left(self.dates, start)
+            hi = len(self.dates)
+            if aired_to:
+                hi = bisect.bisect_right(self.dates, aired_to.toordinal())
+        if lo >= hi:
+            return None
+        return self.boards[random.randrange(lo, hi)]
+
+
+class BoardIndex:
+    """
+    In-process index of complete game boards, built from the game_board_index
+    table the ingestion script writes.
+
+    A show round is playable when at least BOARD_CATEGORIES of its categories
+    have BOARD_CLUES valued questions; its board is the first of them in show
+    order. Boards are kept per round and sorted by air date, so picking a
+    random board for any round and era is a dict lookup, two bisections and
+    one random index.
+
+    The index is rebuilt whenever the ingestion generation changes.
+    """
+
+    def __init__(self):
+        self._eras: Dict[Optional[str], BoardEra] = {}
+        self._by_show: Dict[int, List[Board]] = {}
+        self._generation: Optional[int] = None
+        # Held by the caller rebuilding the index, never waited on
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> Optional[int]:
+        return self._generation
+
+    def refresh(self, db: Session, force: bool = False) -> None:
+        """
+        Rebuild the index from the database if the ingestion generation changed.
+
+        Like QuestionSampler.refresh, never waits on a lock across database
+        I/O: while one caller rebuilds, the others keep using the current index.
+        """
+        generation = get_generation(db, force)
+        if not force and generation == self._generation:
+            return
+
+        claimed = self._lock.acquire(blocking=False)
+        if not claimed and self._generation is not None:
+            return
+        try:
+            rows = (
+                db.query(
+                    GameBoardCategory.show_number,
+                    GameBoardCategory.round,
+                    GameBoardCategory.category,
+                    GameBoardCategory.air_date,
+                )
+                .filter(GameBoardCategory.clue_count == BOARD_CLUES)
+                .order_by(
+                    GameBoardCategory.show_number,
+                    GameBoardCategory.round,
+                    GameBoardCategory.first_question_id,
+                )
+                .all()
+            )
+        except SQLAlchemyError as e:
+            # Databases ingested before the index existed have no table
+            db.rollback()
+            print(f"Could not read game board index: {e}")
+            rows = []
+        finally:
+            if claimed:
+                self._lock.release()
+        self.build(rows, generation)
+
+    def build(
+        self,
+        rows: Iterable[Tuple[int, str, str, Optional[date]]],
+        generation: Optional[int] = None,
+    ) -> None:
+        """
+        Replace the index with (show_number, round, category, air_date) rows of
+        complete categories, ordered by show, round and position in the show.
+        """
+        boards: List[Board] = []
+        current: Optional[Tuple[int, str]] = None
+        categories: List[str] = []
+        air_date: Optional[date] = None
+
+        def close_board():
+            if current is not None and len(categories) >= BOARD_CATEGORIES:
+                boards.append(
+                    Board(*current, air_date, tuple(categories[:BOARD_CATEGORIES]))
+                )
+
+        for show_number, round_, category, category_air_date in rows:
+            if (show_number, round_) != current:
+                close_board()
+                current = (show_number, round_)
+                categories = []
+                air_date = category_air_date
+            categories.append(category)
+        close_board()
+
+        by_round: Dict[Optional[str], List[Board]] = {None: boards}
+        by_show: Dict[int, List[Board]] = {}
+        for board in boards:
+            by_round.setdefault(board.round, []).append(board)
+            by_show.setdefault(board.show_number, []).append(board)
+
+        # Swap in one assignment each so concurrent readers never see a partial index
+        self._eras = {round_: BoardEra(group) for round_, group in by_round.items()}
+        self._by_show = by_show
+        self._generation = generation
+
+    def count(self, round: Optional[str] = None) -> int:
+        era = self._eras.get(round)
+        return len(era.boards) if era else 0
+
+    def pick(
+        self,
+        round: Optional[str] = None,
+        aired_from: Optional[date] = None,
+        aired_to: Optional[date] = None,
+        show_number: Optional[int] = None,
+    ) -> Optional[Board]:
+        """
+        Pick a uniformly random board matching the filters, or None.
+        A show_number selects that show's board and ignores the era.
+        """
+        if show_number is not None:
+            boards = [
+                board
+                for board in self._by_show.get(show_number, [])
+                if round is None or board.round == round
+            ]
+            return random.choice(boards) if boards else None
+
+        era = self._eras.get(round)
+        if era is None:
+            return None
+        return era.pick(aired_from, aired_to)
+
+
+board_index = BoardIndex()
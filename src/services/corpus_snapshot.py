@@ -0,0 +1,209 @@
+import bisect
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from services.generation import GENERATION_CHECK_SECONDS
+
+# Columnar snapshot written by data_ingestion/ingestion_script.py; serving
+# questions from it needs no database connection
+CORPUS_SNAPSHOT_PATH = os.getenv("CORPUS_SNAPSHOT_PATH", "")
+
+# File layout, shared with export_snapshot() in the ingestion script:
+# header, section table, then 8-byte aligned little-endian sections
+MAGIC = b"TRIVSNAP"
+VERSION = 1
+HEADER = struct.Struct("<8sIIq")  # magic, version, row count, generation
+SECTION = struct.Struct("<QQ")  # offset, length in bytes
+SECTIONS = [
+    ("ids", "i"),  # sorted question ids
+    ("show_number", "i"),
+    ("air_date", "i"),  # days since 1970-01-01
+    ("round", "i"),  # index into the round table
+    ("category", "i"),  # index into the category table
+    ("value", "i"),
+    ("text_offsets", "q"),  # 2n+1 offsets: question i, then answer i, into text
+    ("text", "B"),
+    ("round_offsets", "q"),
+    ("round_text", "B"),
+    ("category_offsets", "q"),
+    ("category_text", "B"),
+]
+NULL_INT = -(2**31)
+NULL_INDEX = -1
+EPOCH = date(1970, 1, 1)
+
+
+class QuestionRecord(NamedTuple):
+    """Read-only question with the attributes of a TriviaQuestion row"""
+
+    id: int
+    show_number: int
+    air_date: Optional[date]
+    round: Optional[str]
+    category: Optional[str]
+    value: Optional[int]
+    question: Optional[str]
+    answer: Optional[str]
+
+
+class CorpusSnapshot:
+    """
+    Memory-mapped columnar copy of the live questions.
+
+    Fixed-width columns are read in place through typed memoryviews, so every
+    worker mapping the same file shares its page-cache pages. Only the round
+    and category tables (a few thousand strings) are decoded up front; text
+    is decoded per lookup. Empty and NULL text both read back as None.
+    """
+
+    def __init__(self, path: str):
+        if sys.byteorder != "little":
+            raise ValueError("Corpus snapshots can only be read on little-endian hosts")
+
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.row_count, self.generation = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} corpus snapshot")
+
+        buffer = memoryview(self._mmap)
+        self._columns = {}
+        for i, (name, typecode) in enumerate(SECTIONS):
+            offset, length = SECTION.unpack_from(
+                self._mmap, HEADER.size + i * SECTION.size
+            )
+            self._columns[name] = buffer[offset : offset + length].cast(typecode)
+
+        self.size = len(self._mmap)
+        self.ids = self._columns["ids"]
+        self.rounds = self._strings("round_offsets", "round_text")
+        self.categories = self._strings("category_offsets", "category_text")
+
+    def _strings(self, offsets_name: str, text_name: str) -> List[str]:
+        """Decode one of the interned string tables"""
+        offsets = self._columns[offsets_name]
+        text = self._columns[text_name]
+        return [
+            bytes(text[offsets[i] : offsets[i + 1]]).decode("utf-8")
+            for i in range(len(offsets) - 1)
+        ]
+
+    def _text(self, index: int) -> Optional[str]:
+        offsets = self._columns["text_offsets"]
+        start, end = offsets[index], offsets[index + 1]
+        if start == end:
+            return None
+        return bytes(self._columns["text"][start:end]).decode("utf-8")
+
+    def __len__(self) -> int:
+        return self.row_count
+
+    def position(self, question_id: int) -> Optional[int]:
+        """Row position of a question id, None if it is not in the snapshot"""
+        i = bisect.bisect_left(self.ids, question_id)
+        if i < self.row_count and self.ids[i] == question_id:
+            return i
+        return None
+
+    def record(self, i: int) -> QuestionRecord:
+        """Materialize the question at row position i"""
+        columns = self._columns
+        air_date = columns["air_date"][i]
+        round_ = columns["round"][i]
+        category = columns["category"][i]
+        value = columns["value"][i]
+        return QuestionRecord(
+            id=self.ids[i],
+            show_number=columns["show_number"][i],
+            air_date=None if air_date == NULL_INT else EPOCH + timedelta(air_date),
+            round=None if round_ == NULL_INDEX else self.rounds[round_],
+            category=None if category == NULL_INDEX else self.categories[category],
+            value=None if value == NULL_INT else value,
+            question=self._text(2 * i),
+            answer=self._text(2 * i + 1),
+        )
+
+    def get(self, question_id: int) -> Optional[QuestionRecord]:
+        i = self.position(question_id)
+        return None if i is None else self.record(i)
+
+    def get_many(self, question_ids) -> Dict[int, QuestionRecord]:
+        """Get several questions keyed by ID (missing IDs are left out)"""
+        records = {}
+        for question_id in set(question_ids):
+            record = self.get(question_id)
+            if record is not None:
+                records[question_id] = record
+        return records
+
+    def partition_rows(self) -> Iterator[Tuple[int, Optional[str], Optional[int]]]:
+        """(id, round, value) of every question, for building the question sampler"""
+        rounds = self._columns["round"]
+        values = self._columns["value"]
+        for i in range(self.row_count):
+            round_, value = rounds[i], values[i]
+            yield (
+                self.ids[i],
+                None if round_ == NULL_INDEX else self.rounds[round_],
+                None if value == NULL_INT else value,
+            )
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "generation": self.generation,
+            "rows": self.row_count,
+            "size_bytes": self.size,
+        }
+
+
+_snapshot: Optional[CorpusSnapshot] = None
+_file_id: Optional[tuple] = None
+_checked_at: Optional[float] = None
+_lock = threading.Lock()
+
+
+def get_snapshot() -> Optional[CorpusSnapshot]:
+    """
+    Get the corpus snapshot, or None when CORPUS_SNAPSHOT_PATH is not set or
+    the file cannot be read (questions then come from the database).
+
+    The file is checked for a newer export at most once every
+    GENERATION_CHECK_SECONDS. Ingestion replaces it atomically, so a changed
+    inode or mtime means a complete new snapshot to map.
+    """
+    global _snapshot, _file_id, _checked_at
+
+    if not CORPUS_SNAPSHOT_PATH:
+        return None
+
+    now = time.monotonic()
+    if _checked_at is not None and now - _checked_at < GENERATION_CHECK_SECONDS:
+        return _snapshot
+
+    with _lock:
+        if _checked_at is not None and now - _checked_at < GENERATION_CHECK_SECONDS:
+            return _snapshot
+
+        try:
+            stat = os.stat(CORPUS_SNAPSHOT_PATH)
+            file_id = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if file_id != _file_id:
+                # The old mapping is released once no reader holds it any more
+                _snapshot = CorpusSnapshot(CORPUS_SNAPSHOT_PATH)
+                _file_id = file_id
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Could not load corpus snapshot: {e}")
+            _snapshot = None
+            _file_id = None
+
+        _checked_at = now
+        return _snapshot
@@ -0,0 +1,52 @@
+import os
+import time
+from typing import Optional
+from sqlalchemy import func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from models.ingestion_run import IngestionRun
+
+# How long a generation number is trusted before the database is asked again
+GENERATION_CHECK_SECONDS = float(os.getenv("GENERATION_CHECK_SECONDS", "30"))
+
+_generation = 0
+_checked_at: Optional[float] = None
+
+
+def get_generation(db: Session, force: bool = False) -> int:
+    """
+    Get the current ingestion generation (id of the latest completed ingestion run).
+
+    In-process indexes and caches compare this number to decide when they are stale.
+    The database is consulted at most once every GENERATION_CHECK_SECONDS unless
+    force is set.
+
+    Args:
+        db: Database session
+        force: Bypass the check interval and query the database
+
+    Returns:
+        Generation number, 0 if no ingestion run has been recorded
+    """
+    global _generation, _checked_at
+
+    now = time.monotonic()
+    if (
+        not force
+        and _checked_at is not None
+        and now - _checked_at < GENERATION_CHECK_SECONDS
+    ):
+        return _generation
+
+    try:
+        latest = db.query(func.max(IngestionRun.id)).scalar()
+    except SQLAlchemyError as e:
+        # Databases ingested before runs were recorded have no ingestion_runs table
+        db.rollback()
+        print(f"Could not read ingestion generation: {e}")
+        latest = None
+
+    _generation = latest or 0
+    _checked_at = now
+    return _generation
@@ -0,0 +1,206 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+import httpx
+import openai
+from openai import AsyncOpenAI
+
+from services.metrics import llm_retries, registry
+
+# Whole-call budget in seconds, retries and backoff included
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "15"))
+LLM_CONNECT_TIMEOUT_SECONDS = float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", "3"))
+# Retries after the first attempt, for timeouts, connection errors, 429 and 5xx
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BASE_SECONDS = float(os.getenv("LLM_RETRY_BASE_SECONDS", "0.25"))
+LLM_RETRY_MAX_SECONDS = float(os.getenv("LLM_RETRY_MAX_SECONDS", "2"))
+# Keep-alive connection pool shared by all calls of a worker
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+# Consecutive failed attempts that open a model's circuit, and how long it
+# stays open before one probe call may try the model again
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+LLM_BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+
+TRANSIENT_ERRORS = (
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a model whose circuit breaker is open"""
+
+    def __init__(self, model: str):
+        super().__init__(f"Circuit open for {model}, not calling the model")
+        self.model = model
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    closed: calls go through. After `failures` transient failures in a row
+    the circuit opens and calls are refused for `reset_seconds`. Then it is
+    half-open: a single probe call goes through, closing the circuit if the
+    model answers and opening it again if not.
+    """
+
+    def __init__(
+        self,
+        failures: int = LLM_BREAKER_FAILURES,
+        reset_seconds: float = LLM_BREAKER_RESET_SECONDS,
+    ):
+        self.failure_threshold = failures
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go to the model now"""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            now = time.monotonic()
+            # A probe that never reported back (e.g. a cancelled request)
+            # is given up on after reset_seconds like an open circuit
+            if now - self.opened_at >= self.reset_seconds:
+                self.state = "half_open"
+                self.opened_at = now
+                return True
+            # Open, or half-open with the probe still in flight
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    print(f"LLM circuit opened after {self.failures} failures")
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff before retry number attempt + 1"""
+    ceiling = min(LLM_RETRY_MAX_SECONDS, LLM_RETRY_BASE_SECONDS * 2**attempt)
+    return random.uniform(0, ceiling)
+
+
+class LLMTransport:
+    """
+    Chat completions over pooled keep-alive connections, with a deadline per
+    call, jittered retries on transient errors and a circuit breaker per model.
+
+    The OpenAI clients' own retries are disabled so that retries, backoff
+    and the deadline are all accounted for here. A call whose model circuit
+    is open raises CircuitOpenError at once, so callers fall back to local
+    judging instead of waiting on a failing provider.
+    """
+
+    def __init__(self):
+        limits = httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+        )
+        timeout = httpx.Timeout(
+            LLM_TIMEOUT_SECONDS, connect=LLM_CONNECT_TIMEOUT_SECONDS
+        )
+        self.async_client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            max_retries=0,
+            timeout=timeout,
+            http_client=httpx.AsyncClient(limits=limits, timeout=timeout),
+        )
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, model: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self.breakers.get(model)
+            if breaker is None:
+                breaker = self.breakers[model] = CircuitBreaker()
+            return breaker
+
+    def _attempt_timeout(self, model: str, deadline: float) -> httpx.Timeout:
+        """Timeout for the next attempt, or CircuitOpenError if it may not run"""
+        if not self.breaker(model).allow():
+            raise CircuitOpenError(model)
+        remaining = max(deadline - time.monotonic(), 0.001)
+        return httpx.Timeout(
+            remaining, connect=min(LLM_CONNECT_TIMEOUT_SECONDS, remaining)
+        )
+
+    def _retry_delay(
+        self, model: str, error: Exception, attempt: int, deadline: float
+    ) -> float:
+        """
+        Record a failed attempt and return how long to wait before retrying.
+        Re-raises the error when it is not transient or the budget is spent.
+        """
+        breaker = self.breaker(model)
+        if not isinstance(error, TRANSIENT_ERRORS):
+            # The provider answered, so it is up; the request itself is bad
+            breaker.record_success()
+            raise error
+
+        breaker.record_failure()
+        delay = backoff_delay(attempt)
+        if attempt >= LLM_MAX_RETRIES or time.monotonic() + delay >= deadline:
+            raise error
+        llm_retries.inc(model)
+        return delay
+
+    async def create_async(self, **kwargs):
+        """
+        chat.completions.create with deadline, retries and circuit breaker.
+        With stream=True, retries cover opening the stream; errors while
+        reading it are raised to the caller.
+        """
+        model = kwargs["model"]
+        deadline = time.monotonic() + LLM_TIMEOUT_SECONDS
+        attempt = 0
+        while True:
+            timeout = self._attempt_timeout(model, deadline)
+            try:
+                response = await self.async_client.chat.completions.create(
+                    timeout=timeout, **kwargs
+                )
+            except Exception as e:
+                await asyncio.sleep(self._retry_delay(model, e, attempt, deadline))
+                attempt += 1
+                continue
+            self.breaker(model).record_success()
+            return response
+
+    def circuit_states(self) -> Dict[str, str]:
+        # Snapshot under the lock: breaker() may add a model while we iterate
+        with self._lock:
+            breakers = list(self.breakers.items())
+        return {model: breaker.state for model, breaker in breakers}
+
+
+transport = LLMTransport()
+
+registry.gauge_callback(
+    "llm_circuit_open",
+    "1 while the model's circuit breaker refuses calls (open or probing)",
+    ["model"],
+    lambda: {
+        (model,): int(state != "closed")
+        for model, state in transport.circuit_states().items()
+    },
+)
@@ -0,0 +1,375 @@
+import bisect
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Record metrics and serve them on /metrics
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+
+# Upper bounds in seconds; fine at the low end for cached lookups and DB
+# queries, up to tens of seconds for LLM calls and streamed exports
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric(ABC):
+    """Base for metrics with a fixed set of label names"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def samples(self) -> Iterator[Tuple[str, LabelValues, float]]:
+        """(suffix, label values, value) of every sample"""
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for suffix, names, values, value in self._labelled_samples():
+            labels = _format_labels(names, values)
+            lines.append(f"{self.name}{suffix}{labels} {_format_number(value)}")
+        return lines
+
+    def _labelled_samples(self):
+        for suffix, values, value in self.samples():
+            yield suffix, self.label_names, values, value
+
+
+class Counter(Metric):
+    """Monotonically increasing count per label values"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        if not METRICS_ENABLED:
+            return
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for values, value in items:
+            yield "", values, value
+
+
+class Histogram(Metric):
+    """
+    Bucketed distribution per label values.
+
+    observe() increments a single bucket found by bisection; the cumulative
+    counts Prometheus expects are only computed when rendering.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label values: [count per bucket..., count above the last bucket, sum]
+        self._series: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        if not METRICS_ENABLED:
+            return
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def samples(self):
+        """Bucket samples carry their upper bound as an extra "le" label value"""
+        with self._lock:
+            items = sorted(
+                (values, list(series)) for values, series in self._series.items()
+            )
+
+        for values, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                yield "_bucket", values + (_format_number(bound),), cumulative
+            yield "_sum", values, series[-1]
+            yield "_count", values, cumulative
+
+    def _labelled_samples(self):
+        bucket_names = self.label_names + ("le",)
+        for suffix, values, value in self.samples():
+            names = bucket_names if suffix == "_bucket" else self.label_names
+            yield suffix, names, values, value
+
+
+class GaugeCallback(Metric):
+    """Gauge read from a callback at scrape time (label values -> value)"""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str],
+        callback: Callable[[], Dict[LabelValues, float]],
+    ):
+        super().__init__(name, documentation, labels)
+        self.callback = callback
+
+    def samples(self):
+        for values, value in sorted(self.callback().items()):
+            yield "", values, value
+
+
+class Registry:
+    """Metrics exposed together in the Prometheus text format"""
+
+    content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels=()) -> Counter:
+        return self.register(Counter(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels=()) -> Histogram:
+        return self.register(Histogram(name, documentation, labels))
+
+    def gauge_callback(self, name, documentation, labels, callback) -> GaugeCallback:
+        return self.register(GaugeCallback(name, documentation, labels, callback))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            try:
+                lines.extend(metric.render())
+            except Exception as e:
+                # One broken collector must not take the whole scrape down
+                print(f"Could not collect metric {metric.name}: {e}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Time to serve an HTTP request, including streamed bodies",
+    ["method", "route", "status"],
+)
+db_query_duration = registry.histogram(
+    "db_query_duration_seconds",
+    "Database statement execution time",
+    ["engine", "operation"],
+)
+db_query_errors = registry.counter(
+    "db_query_errors_total",
+    "Database statements that raised",
+    ["engine", "operation"],
+)
+llm_request_duration = registry.histogram(
+    "llm_request_duration_seconds",
+    "Chat completion latency (until the last chunk for streamed completions)",
+    ["model", "operation"],
+)
+llm_tokens = registry.counter(
+    "llm_tokens_total",
+    "Tokens used by chat completions",
+    ["model", "type"],
+)
+llm_errors = registry.counter(
+    "llm_errors_total",
+    "Chat completions that failed",
+    ["model", "operation", "error"],
+)
+llm_retries = registry.counter(
+    "llm_retries_total",
+    "Chat completion attempts retried after a transient error",
+    ["model"],
+)
+llm_fallbacks = registry.counter(
+    "llm_fallbacks_total",
+    "Answers produced without the model after a failed completion",
+    ["model", "operation"],
+)
+
+
+@contextmanager
+def track_llm_call(model: str, operation: str) -> Iterator[None]:
+    """Time a chat completion and count it as an error if the block raises"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        llm_errors.inc(model, operation, type(e).__name__)
+        raise
+    finally:
+        llm_request_duration.observe(time.perf_counter() - started, model, operation)
+
+
+def record_llm_usage(model: str, usage) -> None:
+    """Count the prompt and completion tokens of a completion's usage block"""
+    if usage is None:
+        return
+    llm_tokens.inc(model, "prompt", amount=usage.prompt_tokens or 0)
+    llm_tokens.inc(model, "completion", amount=usage.completion_tokens or 0)
+
+
+def _operation(statement: str) -> str:
+    """First SQL keyword, upper-cased (SELECT, INSERT, ...)"""
+    keyword = statement.lstrip()[:12].split(None, 1)
+    return keyword[0].upper() if keyword else "UNKNOWN"
+
+
+_engines: List[Tuple[str, Engine]] = []
+
+
+def _pool_usage() -> Dict[LabelValues, float]:
+    usage = {}
+    for name, engine in _engines:
+        pool = engine.pool
+        # Only queue pools keep these counters (SQLite may use a static pool)
+        if not hasattr(pool, "checkedout"):
+            continue
+        usage[(name, "size")] = pool.size()
+        usage[(name, "checked_out")] = pool.checkedout()
+        usage[(name, "idle")] = pool.checkedin()
+        usage[(name, "overflow")] = max(pool.overflow(), 0)
+    return usage
+
+
+db_pool_connections = registry.gauge_callback(
+    "db_pool_connections",
+    "Connection pool usage: configured size, checked out, idle and overflow",
+    ["engine", "state"],
+    _pool_usage,
+)
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """
+    Time every statement run on a (sync) engine and expose its pool usage.
+
+    For an AsyncEngine pass engine.sync_engine. Timings are per cursor
+    execution, so they include driver round trips but not ORM row loading.
+    """
+    _engines.append((name, engine))
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        started = conn.info["query_started"].pop()
+        db_query_duration.observe(
+            time.perf_counter() - started, name, _operation(statement)
+        )
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        if context.connection is not None:
+            started = context.connection.info.get("query_started")
+            if started:
+                started.pop()
+        db_query_errors.inc(name, _operation(context.statement or ""))
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording http_request_duration_seconds.
+
+    Requests are labelled with the route's path template, not the raw path,
+    so ids in URLs do not create new series. Pure ASGI rather than
+    BaseHTTPMiddleware, which would add a task per request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = "500"
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            http_request_duration.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status,
+            )
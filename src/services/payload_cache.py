@@ -0,0 +1,92 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from services.corpus_snapshot import QuestionRecord
+
+# Serve question endpoints from cached, pre-serialized JSON bytes
+FAST_JSON = os.getenv("FAST_JSON", "1") == "1"
+PAYLOAD_CACHE_SIZE = int(os.getenv("PAYLOAD_CACHE_SIZE", "20000"))
+
+
+class RawJSONResponse(Response):
+    """JSON response whose body is already serialized; render() is a no-op"""
+
+    media_type = "application/json"
+
+
+class PayloadCache:
+    """
+    Bounded LRU cache of serialized response bodies keyed on (shape, question id).
+
+    Each entry keeps the QuestionRecord it was rendered from and is only
+    served for an equal record, so a question changed by re-ingestion is
+    re-serialized without any generation bookkeeping here.
+    """
+
+    def __init__(self, max_size: int = PAYLOAD_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, int], tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, shape: str, record: QuestionRecord) -> Optional[bytes]:
+        key = (shape, record.id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == record:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, shape: str, record: QuestionRecord, payload: bytes) -> None:
+        if self.max_size <= 0:
+            return
+
+        key = (shape, record.id)
+        with self._lock:
+            self._entries[key] = (record, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def render(
+        self,
+        shape: str,
+        record: QuestionRecord,
+        build: Callable[[QuestionRecord], BaseModel],
+    ) -> RawJSONResponse:
+        """
+        Respond with the cached body for a question, serializing
+        build(record) with pydantic only on a miss.
+        """
+        payload = self.get(shape, record)
+        if payload is None:
+            payload = build(record).model_dump_json().encode("utf-8")
+            self.put(shape, record, payload)
+        return RawJSONResponse(payload)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "enabled": FAST_JSON,
+        }
+
+
+payload_cache = PayloadCache()
@@ -0,0 +1,115 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from models.trivia_question import TriviaQuestion
+from services.corpus_snapshot import QuestionRecord
+
+QUESTION_CACHE_SIZE = int(os.getenv("QUESTION_CACHE_SIZE", "20000"))
+
+
+def to_record(question: TriviaQuestion) -> QuestionRecord:
+    """Copy an ORM question into a detached, immutable tuple"""
+    return QuestionRecord(
+        id=question.id,
+        show_number=question.show_number,
+        air_date=question.air_date,
+        round=question.round,
+        category=question.category,
+        value=question.value,
+        question=question.question,
+        answer=question.answer,
+    )
+
+
+def record_size(record: QuestionRecord) -> int:
+    """Approximate bytes held by a cached record (shared strings counted per record)"""
+    return sys.getsizeof(record) + sum(sys.getsizeof(field) for field in record)
+
+
+class QuestionCache:
+    """
+    Bounded LRU cache of questions keyed by id.
+
+    Questions are stored as QuestionRecord tuples rather than ORM instances,
+    so entries are small, immutable and never tied to a session. The cache
+    is emptied whenever the ingestion generation changes.
+    """
+
+    def __init__(self, max_size: int = QUESTION_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+        self._entries: "OrderedDict[int, Tuple[QuestionRecord, int]]" = OrderedDict()
+        self._generation: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _check_generation(self, generation: int) -> None:
+        if generation != self._generation:
+            self._entries.clear()
+            self.bytes = 0
+            self._generation = generation
+
+    def get(self, question_id: int, generation: int) -> Optional[QuestionRecord]:
+        """Get a cached question or None on a miss"""
+        with self._lock:
+            self._check_generation(generation)
+            entry = self._entries.get(question_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(question_id)
+            self.hits += 1
+            return entry[0]
+
+    def get_many(
+        self, question_ids: Iterable[int], generation: int
+    ) -> Dict[int, QuestionRecord]:
+        """Get the cached questions among question_ids, keyed by id"""
+        found = {}
+        for question_id in question_ids:
+            record = self.get(question_id, generation)
+            if record is not None:
+                found[question_id] = record
+        return found
+
+    def put(self, record: QuestionRecord, generation: int) -> None:
+        """Store a question, evicting the least recently used beyond max_size"""
+        if self.max_size <= 0:
+            return
+
+        size = record_size(record)
+        with self._lock:
+            self._check_generation(generation)
+            previous = self._entries.pop(record.id, None)
+            if previous is not None:
+                self.bytes -= previous[1]
+            self._entries[record.id] = (record, size)
+            self.bytes += size
+            while len(self._entries) > self.max_size:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        """Hit/miss counters and footprint for tuning the cache size"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_size": self.max_size,
+            "generation": self._generation,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "approx_bytes": self.bytes,
+        }
+
+
+question_cache = QuestionCache()
@@ -0,0 +1,110 @@
+import random
+import threading
+from array import array
+from typing import Dict, Iterable, Optional, Tuple
+from sqlalchemy.orm import Session
+
+from models.trivia_question import TriviaQuestion
+from services.corpus_snapshot import get_snapshot
+from services.generation import get_generation
+
+# Partition key component meaning "no filter on this column"
+ANY = object()
+
+PartitionKey = Tuple[object, object]
+
+
+class QuestionSampler:
+    """
+    In-process index of question ids partitioned by (round, value).
+
+    Every question id is stored in four compact int arrays: its exact
+    (round, value) partition, (round, ANY), (ANY, value) and (ANY, ANY).
+    Picking a uniformly random question for any combination of filters is
+    then a single dict lookup plus a random index into an array, instead of
+    sorting the filtered table with ORDER BY random().
+
+    The index is rebuilt whenever the ingestion generation changes. When a
+    corpus snapshot is configured it is built from the snapshot instead.
+    """
+
+    def __init__(self):
+        self._partitions: Dict[PartitionKey, array] = {}
+        self._generation: Optional[int] = None
+        # Held by the caller rebuilding the index, never waited on
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> Optional[int]:
+        return self._generation
+
+    def refresh(self, db: Session, force: bool = False) -> None:
+        """
+        Rebuild the index from the database if the ingestion generation changed.
+
+        Callers run inside AsyncSession.run_sync, where database I/O hands
+        control back to the event loop, so no lock is waited on here: while
+        one caller rebuilds, the others keep using the current index. Before
+        the first build there is nothing to fall back on and every caller
+        builds (see ensure_index_async, which coalesces those builds).
+        """
+        snapshot = get_snapshot()
+        generation = snapshot.generation if snapshot else get_generation(db, force)
+        if not force and generation == self._generation:
+            return
+
+        claimed = self._lock.acquire(blocking=False)
+        if not claimed and self._generation is not None:
+            return
+        try:
+            if snapshot is not None:
+                self.build(snapshot.partition_rows(), generation)
+                return
+            rows = (
+                db.query(TriviaQuestion.id, TriviaQuestion.round, TriviaQuestion.value)
+                .filter(TriviaQuestion.deleted_at.is_(None))
+                .yield_per(10000)
+            )
+            self.build(rows, generation)
+        finally:
+            if claimed:
+                self._lock.release()
+
+    def build(
+        self,
+        rows: Iterable[Tuple[int, Optional[str], Optional[int]]],
+        generation: Optional[int] = None,
+    ) -> None:
+        """Replace the index with the given (id, round, value) rows"""
+        partitions: Dict[PartitionKey, array] = {}
+
+        for question_id, round_, value in rows:
+            for key in ((round_, value), (round_, ANY), (ANY, value), (ANY, ANY)):
+                ids = partitions.get(key)
+                if ids is None:
+                    ids = partitions[key] = array("i")
+                ids.append(question_id)
+
+        # Swap in one assignment so concurrent readers never see a partial index
+        self._partitions = partitions
+        self._generation = generation
+
+    def ids(self, round: Optional[str] = None, value: Optional[int] = None) -> array:
+        """Get the ids matching the filters (an empty array if nothing matches)"""
+        key = (round or ANY, value or ANY)
+        return self._partitions.get(key, array("i"))
+
+    def count(self, round: Optional[str] = None, value: Optional[int] = None) -> int:
+        return len(self.ids(round, value))
+
+    def pick(
+        self, round: Optional[str] = None, value: Optional[int] = None
+    ) -> Optional[int]:
+        """Pick a uniformly random question id, or None if no question matches"""
+        ids = self.ids(round, value)
+        if not ids:
+            return None
+        return ids[random.randrange(len(ids))]
+
+
+question_sampler = QuestionSampler()
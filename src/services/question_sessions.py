@@ -0,0 +1,151 @@
+import base64
+import binascii
+import hashlib
+import random
+import struct
+from typing import Optional, Tuple
+
+from services.question_sampler import QuestionSampler, question_sampler
+
+# Cursor layout: walk tag (8 bytes), epoch and position (unsigned 32-bit each)
+_CURSOR = struct.Struct("<8sII")
+_MASK64 = (1 << 64) - 1
+
+
+class FeistelPermutation:
+    """
+    Keyed pseudo-random permutation of range(size).
+
+    A balanced Feistel network permutes the smallest even-bit domain
+    2**bits >= size; indexes it maps outside range(size) are encrypted again
+    (cycle walking) until they land inside, which keeps the mapping a
+    bijection on range(size). The domain is under 4 * size, so an index
+    takes fewer than four encryptions on average.
+    """
+
+    ROUNDS = 4
+
+    def __init__(self, size: int, key: bytes):
+        self.size = size
+        bits = max((size - 1).bit_length(), 2)
+        self.half_bits = (bits + 1) // 2
+        self.half_mask = (1 << self.half_bits) - 1
+        digest = hashlib.blake2b(key, digest_size=8 * self.ROUNDS).digest()
+        self.round_keys = [
+            int.from_bytes(digest[i : i + 8], "little")
+            for i in range(0, len(digest), 8)
+        ]
+
+    def _round(self, value: int, key: int) -> int:
+        # splitmix64 finalizer of the keyed half-block
+        x = ((value ^ key) * 0x9E3779B97F4A7C15) & _MASK64
+        x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+        x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+        return (x ^ (x >> 31)) & self.half_mask
+
+    def _encrypt(self, value: int) -> int:
+        left, right = value >> self.half_bits, value & self.half_mask
+        for key in self.round_keys:
+            left, right = right, left ^ self._round(right, key)
+        return (left << self.half_bits) | right
+
+    def __getitem__(self, index: int) -> int:
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        value = self._encrypt(index)
+        while value >= self.size:
+            value = self._encrypt(value)
+        return value
+
+
+class QuestionSessions:
+    """
+    No-repeat random question sequences per client session.
+
+    A session walks a keyed permutation of the sampler partition matching
+    its filters, so it sees every matching question once, in random order,
+    before any repeats. The permutation is derived from the session token,
+    the filters, the ingestion generation and an epoch, so the whole state
+    of a walk is the epoch and the position in it.
+
+    That state travels with the client as an opaque cursor: every pick
+    returns the cursor of the next one, which the client sends back with its
+    next request. Any worker can continue the walk and nothing is kept per
+    session on the server. A request without a cursor valid for its session,
+    filters and generation starts a new walk in a random epoch; an exhausted
+    walk continues in the next epoch, that is a fresh order.
+    """
+
+    def __init__(self, sampler: QuestionSampler = question_sampler):
+        self.sampler = sampler
+        self.picks = 0
+        self.started = 0
+        self.exhausted = 0
+
+    @staticmethod
+    def _walk_tag(
+        session: str,
+        round: Optional[str],
+        value: Optional[int],
+        generation: Optional[int],
+    ) -> bytes:
+        """Identity of a walk, keying its permutation and checked on its cursors"""
+        seed = f"{session}\0{round}\0{value}\0{generation}"
+        return hashlib.blake2b(seed.encode(), digest_size=8).digest()
+
+    @staticmethod
+    def encode_cursor(tag: bytes, epoch: int, position: int) -> str:
+        packed = _CURSOR.pack(tag, epoch, position)
+        return base64.urlsafe_b64encode(packed).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str, tag: bytes) -> Optional[Tuple[int, int]]:
+        """(epoch, position) of a cursor, or None if it belongs to another walk"""
+        try:
+            cursor_tag, epoch, position = _CURSOR.unpack(
+                base64.urlsafe_b64decode(cursor.encode() + b"==")
+            )
+        except (binascii.Error, struct.error, UnicodeEncodeError):
+            return None
+        return (epoch, position) if cursor_tag == tag else None
+
+    def pick(
+        self,
+        session: str,
+        cursor: Optional[str] = None,
+        round: Optional[str] = None,
+        value: Optional[int] = None,
+    ) -> Optional[Tuple[int, str]]:
+        """
+        Next question id of the session's walk and the cursor of the pick
+        after it, or None if no question matches
+        """
+        ids = self.sampler.ids(round, value)
+        if not ids:
+            return None
+
+        tag = self._walk_tag(session, round, value, self.sampler.generation)
+        state = self.decode_cursor(cursor, tag) if cursor else None
+        if state is None:
+            epoch, position = random.getrandbits(32), 0
+            self.started += 1
+        else:
+            epoch, position = state
+            if position >= len(ids):
+                epoch, position = (epoch + 1) & 0xFFFFFFFF, 0
+                self.exhausted += 1
+        self.picks += 1
+
+        permutation = FeistelPermutation(len(ids), tag + struct.pack("<I", epoch))
+        return ids[permutation[position]], self.encode_cursor(tag, epoch, position + 1)
+
+    def stats(self) -> dict:
+        return {
+            "generation": self.sampler.generation,
+            "picks": self.picks,
+            "started": self.started,
+            "exhausted": self.exhausted,
+        }
+
+
+question_sessions = QuestionSessions()
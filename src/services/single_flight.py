@@ -0,0 +1,86 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class _Flight:
+    """An in-flight call and the number of callers waiting on it"""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent async calls that share a key into one call.
+
+    The first caller for a key starts the call in its own task; callers that
+    arrive while it runs wait on the same task and get the same result or
+    the same exception. The key is released as soon as the call finishes, so
+    results are never reused afterwards (that is the caches' job) and a
+    failure only reaches the callers that were already waiting on it.
+
+    A caller that is cancelled stops waiting without cancelling the call for
+    the others; the call itself is cancelled once nobody waits on it.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._flights: Dict[Hashable, _Flight] = {}
+
+    async def do(
+        self, key: Hashable, fn: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """
+        Await fn(), or the call already in flight for key.
+
+        Returns:
+            Tuple of (result, shared), shared being True for callers that
+            joined a call started by another caller
+        """
+        flight = self._flights.get(key)
+        shared = flight is not None
+        if shared:
+            self.shared += 1
+        else:
+            self.calls += 1
+            flight = self._flights[key] = _Flight(asyncio.ensure_future(fn()))
+            flight.task.add_done_callback(lambda task: self._release(key, flight))
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task), shared
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _release(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        # Mark the exception as retrieved when every waiter was cancelled
+        if not flight.task.cancelled():
+            flight.task.exception()
+
+    def stats(self) -> dict:
+        """How many calls were started and how many callers joined one"""
+        callers = self.calls + self.shared
+        return {
+            "in_flight": len(self._flights),
+            "calls": self.calls,
+            "shared": self.shared,
+            "shared_ratio": round(self.shared / callers, 4) if callers else 0.0,
+        }
+
+
+# Verdicts keyed on (question_id, normalized answer)
+verdict_flights = SingleFlight()
+# Agent answers keyed on (question_id, agent name)
+agent_play_flights = SingleFlight()
+# First builds of the in-process indexes, keyed on the index
+index_builds = SingleFlight()
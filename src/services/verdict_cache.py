@@ -0,0 +1,186 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from models.answer_verdict import AnswerVerdict
+
+VERDICT_CACHE_SIZE = int(os.getenv("VERDICT_CACHE_SIZE", "50000"))
+VERDICT_CACHE_TTL_SECONDS = float(os.getenv("VERDICT_CACHE_TTL_SECONDS", "86400"))
+# Write verdicts through to the answer_verdicts table so they survive restarts
+VERDICT_CACHE_PERSIST = os.getenv("VERDICT_CACHE_PERSIST", "0") == "1"
+
+# Longest normalized answer that fits the answer_verdicts key column
+MAX_KEY_LENGTH = 255
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_answer(answer: str) -> str:
+    """
+    Normalize a user answer for cache keys.
+
+    Lowercases, drops punctuation and collapses whitespace, so
+    "Copernicus", "copernicus" and " Copernicus. " share one entry.
+    """
+    answer = _PUNCTUATION.sub("", answer.lower())
+    return _WHITESPACE.sub(" ", answer).strip()
+
+
+class VerdictCache:
+    """
+    Bounded LRU cache of LLM verdicts keyed on (question_id, normalized answer).
+
+    Entries also remember the correct answer they were judged against, so a
+    question whose answer changed at re-ingestion never serves a stale verdict.
+    """
+
+    def __init__(
+        self,
+        max_size: int = VERDICT_CACHE_SIZE,
+        ttl_seconds: float = VERDICT_CACHE_TTL_SECONDS,
+        persist: bool = VERDICT_CACHE_PERSIST,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.persist = persist
+        self.hits = 0
+        self.misses = 0
+        self.persisted_hits = 0
+        self._entries: "OrderedDict[Tuple[int, str], tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(question_id: int, user_answer: str) -> Optional[Tuple[int, str]]:
+        """Cache key for an answer, None if the answer is empty or too long to cache"""
+        normalized = normalize_answer(user_answer)
+        if not normalized or len(normalized) > MAX_KEY_LENGTH:
+            return None
+        return question_id, normalized
+
+    def get(
+        self, question_id: int, correct_answer: str, user_answer: str
+    ) -> Optional[Tuple[bool, str]]:
+        """Get a cached (is_correct, ai_response) verdict or None on a miss"""
+        key = self.key(question_id, user_answer)
+
+        with self._lock:
+            entry = self._entries.get(key) if key else None
+            if entry is not None:
+                expires_at, cached_answer, is_correct, ai_response = entry
+                if expires_at > time.monotonic() and cached_answer == correct_answer:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return is_correct, ai_response
+                del self._entries[key]
+
+            self.misses += 1
+            return None
+
+    def put(
+        self,
+        question_id: int,
+        correct_answer: str,
+        user_answer: str,
+        is_correct: bool,
+        ai_response: str,
+    ) -> None:
+        """Store a verdict, evicting the least recently used entries beyond max_size"""
+        key = self.key(question_id, user_answer)
+        if key is None or self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (
+                time.monotonic() + self.ttl_seconds,
+                correct_answer,
+                is_correct,
+                ai_response,
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def load(
+        self, db: Session, question_id: int, correct_answer: str, user_answer: str
+    ) -> Optional[Tuple[bool, str]]:
+        """Look a verdict up in the answer_verdicts table and warm the memory cache"""
+        key = self.key(question_id, user_answer)
+        if key is None:
+            return None
+
+        try:
+            row = db.get(AnswerVerdict, key)
+        except SQLAlchemyError as e:
+            db.rollback()
+            print(f"Verdict table read error: {e}")
+            return None
+
+        if row is None or row.correct_answer != correct_answer:
+            return None
+        if row.created_at < datetime.utcnow() - timedelta(seconds=self.ttl_seconds):
+            return None
+
+        self.persisted_hits += 1
+        self.put(
+            question_id, correct_answer, user_answer, row.is_correct, row.ai_response
+        )
+        return row.is_correct, row.ai_response
+
+    def store(
+        self,
+        db: Session,
+        question_id: int,
+        correct_answer: str,
+        user_answer: str,
+        is_correct: bool,
+        ai_response: str,
+    ) -> None:
+        """Write a verdict through to the answer_verdicts table"""
+        key = self.key(question_id, user_answer)
+        if key is None:
+            return
+
+        try:
+            db.merge(
+                AnswerVerdict(
+                    question_id=question_id,
+                    normalized_answer=key[1],
+                    correct_answer=correct_answer,
+                    is_correct=is_correct,
+                    ai_response=ai_response,
+                    created_at=datetime.utcnow(),
+                )
+            )
+            db.commit()
+        except SQLAlchemyError as e:
+            # Another worker may have stored the same verdict first
+            db.rollback()
+            print(f"Verdict table write error: {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters for tuning the cache size and TTL"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "persisted_hits": self.persisted_hits,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "persist": self.persist,
+        }
+
+
+verdict_cache = VerdictCache()
@@ -0,0 +1,294 @@
+"""
+Batch pre-generation of agent answers for /agent-play/.
+
+Walks the live questions in id order, asks the agent model for every
+(question, agent) pair, or a deterministic sample of them, with bounded
+concurrency and stores answer, reasoning and verdict in agent_answers. Each
+batch of questions is committed as a checkpoint; a rerun skips the pairs
+already stored, so an interrupted or partly failed run resumes where it
+stopped. Stored answers go stale when a reload gives their question ID to
+a different question, and are regenerated by the next run.
+
+Usage (from the repository root, with DATABASE_URL and OPENAI_API_KEY set):
+    python src/trivia_service/agent_pregen.py --sample 0.1
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import zlib
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Sequence, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import SessionLocal, engine
+from models.agent_answer import AgentAnswer
+from models.trivia_question import Base, TriviaQuestion
+from services.agent_router import agent_router
+from services.ai_service import AGENT_MODEL, request_agent_answer_async
+from services.corpus_snapshot import QuestionRecord
+from services.question_cache import to_record
+
+# Where /agent-play/ gets answers: "live" always calls the model,
+# "pregenerated" reads agent_answers (created by this job) and only calls the
+# model for pairs the job has not stored
+AGENT_PLAY_SOURCE = os.getenv("AGENT_PLAY_SOURCE", "live")
+# Agent model calls the job keeps in flight
+AGENT_PREGEN_CONCURRENCY = int(os.getenv("AGENT_PREGEN_CONCURRENCY", "16"))
+# Questions per batch; every batch is committed as a checkpoint
+AGENT_PREGEN_BATCH_SIZE = int(os.getenv("AGENT_PREGEN_BATCH_SIZE", "200"))
+
+pregen_stats = {"hits": 0, "misses": 0}
+
+
+def _is_current(row: AgentAnswer, question) -> bool:
+    """Whether a stored answer was generated for this very question"""
+    return row.question == question.question and row.correct_answer == question.answer
+
+
+def load_agent_answer(
+    db: Session, question, agent: dict
+) -> Optional[Tuple[str, str, bool]]:
+    """
+    Look up the stored (agent_answer, reasoning, is_correct) of an agent for a
+    question by primary key. None if there is none or it is stale.
+    """
+    try:
+        row = db.get(AgentAnswer, (question.id, agent["name"]))
+    except SQLAlchemyError as e:
+        db.rollback()
+        print(f"Agent answer table read error: {e}")
+        return None
+
+    if row is None or not _is_current(row, question):
+        pregen_stats["misses"] += 1
+        return None
+
+    pregen_stats["hits"] += 1
+    return row.agent_answer, row.reasoning, row.is_correct
+
+
+def in_sample(question_id: int, sample: float, seed: int) -> bool:
+    """Deterministic per-question sampling, so reruns pick the same questions"""
+    if sample >= 1:
+        return True
+    return zlib.crc32(f"{seed}:{question_id}".encode()) < sample * 2**32
+
+
+def agents_for(question: QuestionRecord, mode: str) -> List[dict]:
+    """
+    Agents to pre-generate a question for: "routed" covers the agents
+    /agent-play/ may pick for its category, "all" every agent.
+    """
+    if mode == "all":
+        return agent_router.agents
+    return agent_router.candidates(question.category or "")
+
+
+def read_batch(db: Session, after_id: int, size: int) -> List[QuestionRecord]:
+    """Next batch of live questions in id order, detached from the session"""
+    questions = db.execute(
+        select(TriviaQuestion)
+        .where(TriviaQuestion.id > after_id, TriviaQuestion.deleted_at.is_(None))
+        .order_by(TriviaQuestion.id)
+        .limit(size)
+    ).scalars()
+    return [to_record(question) for question in questions]
+
+
+def pending_pairs(
+    db: Session,
+    questions: Sequence[QuestionRecord],
+    mode: str,
+    sample: float,
+    seed: int,
+    refresh: bool,
+) -> List[Tuple[QuestionRecord, dict]]:
+    """Sampled (question, agent) pairs of a batch without a current stored answer"""
+    questions = [q for q in questions if in_sample(q.id, sample, seed)]
+    stored: Dict[Tuple[int, str], AgentAnswer] = {}
+    if questions and not refresh:
+        rows = db.execute(
+            select(AgentAnswer).where(
+                AgentAnswer.question_id.in_([q.id for q in questions])
+            )
+        ).scalars()
+        stored = {(row.question_id, row.agent_name): row for row in rows}
+
+    pairs = []
+    for question in questions:
+        for agent in agents_for(question, mode):
+            row = stored.get((question.id, agent["name"]))
+            if row is None or not _is_current(row, question):
+                pairs.append((question, agent))
+    return pairs
+
+
+async def answer_pair(
+    question: QuestionRecord, agent: dict, semaphore: asyncio.Semaphore
+) -> Optional[AgentAnswer]:
+    """Generate one agent answer, None if the model call failed"""
+    async with semaphore:
+        try:
+            agent_answer, reasoning, is_correct = await request_agent_answer_async(
+                question=question.question or "",
+                category=question.category or "",
+                correct_answer=question.answer or "",
+                agent_specialty=agent["specialty"],
+                skill_level=agent["skill_level"],
+            )
+        except Exception as e:
+            print(f"Question {question.id}, {agent['name']}: {e}")
+            return None
+
+    return AgentAnswer(
+        question_id=question.id,
+        agent_name=agent["name"],
+        question=question.question,
+        correct_answer=question.answer,
+        agent_answer=agent_answer,
+        reasoning=reasoning,
+        is_correct=is_correct,
+        model=AGENT_MODEL,
+    )
+
+
+def save_answers(db: Session, answers: Sequence[AgentAnswer]) -> None:
+    """Store a batch of answers in one transaction (the batch checkpoint)"""
+    for answer in answers:
+        db.merge(answer)
+    db.commit()
+
+
+async def pregenerate(
+    mode: str = "routed",
+    sample: float = 1.0,
+    seed: int = 0,
+    concurrency: int = AGENT_PREGEN_CONCURRENCY,
+    batch_size: int = AGENT_PREGEN_BATCH_SIZE,
+    after_id: int = 0,
+    limit: Optional[int] = None,
+    refresh: bool = False,
+) -> dict:
+    """
+    Pre-generate agent answers batch by batch.
+
+    Stops early after `limit` generated answers, or when a whole batch
+    fails (the model is unavailable), leaving the stored batches in place
+    for the next run.
+
+    Returns:
+        Counts of generated and failed answers, and the id of the last
+        question of the last committed batch
+    """
+    Base.metadata.create_all(engine, tables=[AgentAnswer.__table__])
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    summary = {"generated": 0, "failed": 0, "last_question_id": after_id}
+    started = time.monotonic()
+
+    with SessionLocal() as db:
+        while limit is None or summary["generated"] < limit:
+            questions = read_batch(db, summary["last_question_id"], batch_size)
+            if not questions:
+                break
+
+            pairs = pending_pairs(db, questions, mode, sample, seed, refresh)
+            checkpoint = questions[-1].id
+            if limit is not None and len(pairs) > limit - summary["generated"]:
+                pairs = pairs[: limit - summary["generated"]]
+                checkpoint = pairs[-1][0].id
+            # Release the read transaction while the model calls run
+            db.rollback()
+
+            results = await asyncio.gather(
+                *(answer_pair(question, agent, semaphore) for question, agent in pairs)
+            )
+            answers = [answer for answer in results if answer is not None]
+            save_answers(db, answers)
+
+            summary["generated"] += len(answers)
+            summary["failed"] += len(pairs) - len(answers)
+            summary["last_question_id"] = checkpoint
+            elapsed = time.monotonic() - started
+            print(
+                f"Checkpoint at question {checkpoint}: "
+                f"{summary['generated']} generated, {summary['failed']} failed "
+                f"({summary['generated'] / elapsed:.1f} answers/s)"
+            )
+
+            if pairs and not answers:
+                print("Every call of the batch failed; stopping. Rerun to resume.")
+                break
+
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pre-generate agent answers for /agent-play/"
+    )
+    parser.add_argument(
+        "--agents",
+        choices=["routed", "all"],
+        default="routed",
+        help="routed: the agents /agent-play/ may pick for each question's "
+        "category (default); all: every agent",
+    )
+    parser.add_argument(
+        "--sample",
+        type=float,
+        default=1.0,
+        help="Share of questions to cover, picked deterministically (default: 1)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the sample")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=AGENT_PREGEN_CONCURRENCY,
+        help="Model calls in flight (default: AGENT_PREGEN_CONCURRENCY or 16)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=AGENT_PREGEN_BATCH_SIZE,
+        help="Questions per checkpoint (default: AGENT_PREGEN_BATCH_SIZE or 200)",
+    )
+    parser.add_argument(
+        "--after-id", type=int, default=0, help="Start after this question id"
+    )
+    parser.add_argument("--limit", type=int, help="Stop after this many answers")
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Regenerate answers that are already stored",
+    )
+    args = parser.parse_args()
+
+    if not 0 < args.sample <= 1:
+        parser.error("--sample must be in (0, 1]")
+
+    summary = asyncio.run(
+        pregenerate(
+            mode=args.agents,
+            sample=args.sample,
+            seed=args.seed,
+            concurrency=args.concurrency,
+            batch_size=args.batch_size,
+            after_id=args.after_id,
+            limit=args.limit,
+            refresh=args.refresh,
+        )
+    )
+    print(
+        f"Generated {summary['generated']} agent answers, "
+        f"{summary['failed']} failed, up to question {summary['last_question_id']}."
+    )
+
+
+if __name__ == "__main__":
+    main()
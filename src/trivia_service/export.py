@@ -0,0 +1,110 @@
+"""Bulk NDJSON export of the question corpus, streamed in keyset pages"""
+
+import os
+import sys
+from datetime import date
+from sqlalchemy import func, select
+from typing import AsyncIterator, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import AsyncSessionLocal
+from models.trivia_question import TriviaQuestion
+from trivia_service.service import parse_value
+
+# Rows per keyset page; each page is one short query on a server-side cursor
+EXPORT_PAGE_SIZE = int(os.getenv("EXPORT_PAGE_SIZE", "5000"))
+
+
+def _parse_bound(value: str) -> int:
+    parsed = parse_value(value)
+    if parsed is None:
+        raise ValueError(f"Invalid value: {value}")
+    return parsed
+
+
+def build_export_query(
+    round: Optional[str] = None,
+    category: Optional[str] = None,
+    min_value: Optional[str] = None,
+    max_value: Optional[str] = None,
+    aired_from: Optional[date] = None,
+    aired_to: Optional[date] = None,
+):
+    """
+    SELECT of the questions matching the export filters, ordered by id.
+
+    Raises:
+        ValueError: If a value bound cannot be parsed
+    """
+    query = (
+        select(
+            TriviaQuestion.id.label("question_id"),
+            TriviaQuestion.show_number,
+            TriviaQuestion.air_date,
+            TriviaQuestion.round,
+            TriviaQuestion.category,
+            TriviaQuestion.value,
+            TriviaQuestion.question,
+            TriviaQuestion.answer,
+        )
+        .where(TriviaQuestion.deleted_at.is_(None))
+        .order_by(TriviaQuestion.id)
+    )
+
+    if min_value:
+        query = query.where(TriviaQuestion.value >= _parse_bound(min_value))
+    if max_value:
+        query = query.where(TriviaQuestion.value <= _parse_bound(max_value))
+    if round:
+        query = query.where(TriviaQuestion.round == round)
+    if category:
+        query = query.where(func.lower(TriviaQuestion.category) == category.lower())
+    if aired_from:
+        query = query.where(TriviaQuestion.air_date >= aired_from)
+    if aired_to:
+        query = query.where(TriviaQuestion.air_date <= aired_to)
+    return query
+
+
+async def export_questions(
+    query, after_id: int = 0, limit: Optional[int] = None
+) -> AsyncIterator[List[dict]]:
+    """
+    Stream the rows of an export query in id order, one list of dicts per page.
+
+    Opens its own session, because request-scoped sessions are closed before
+    a streaming response body is sent. Rows are read in keyset pages on id
+    (WHERE id > last id), each through a server-side cursor, and the
+    transaction is ended between pages so a long export holds no snapshot.
+    Memory use is bounded by one page whatever the export size.
+
+    Args:
+        query: Result of build_export_query
+        after_id: Only export ids above this one (resume an interrupted export)
+        limit: Maximum number of rows, all matching rows if None
+    """
+    remaining = limit
+    async with AsyncSessionLocal() as db:
+        while remaining is None or remaining > 0:
+            page_size = EXPORT_PAGE_SIZE
+            if remaining is not None:
+                page_size = min(page_size, remaining)
+
+            page = query.where(TriviaQuestion.id > after_id).limit(page_size)
+            result = await db.stream(page.execution_options(yield_per=page_size))
+            keys = list(result.keys())
+            # Whole partitions, not rows: each async step through the cursor is
+            # far costlier than building the row dicts
+            rows = []
+            async for partition in result.partitions():
+                rows.extend(dict(zip(keys, row)) for row in partition)
+            await db.rollback()
+
+            if rows:
+                after_id = rows[-1]["question_id"]
+                yield rows
+            if len(rows) < page_size:
+                return
+            if remaining is not None:
+                remaining -= len(rows)
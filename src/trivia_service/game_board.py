@@ -0,0 +1,105 @@
+"""Game boards: six categories of five questions from one show round"""
+
+import os
+import sys
+from datetime import date
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.trivia_question import TriviaQuestion
+from services.board_index import BOARD_CLUES, Board, board_index
+from trivia_service.service import ensure_index_async, format_value
+
+
+def load_board(db: Session, board: Board) -> Optional[dict]:
+    """
+    Fetch the questions of a board in one query on (show_number, round).
+
+    Returns:
+        Board dict, or None if a category no longer has exactly BOARD_CLUES
+        questions (the data changed after the index was built)
+    """
+    rows = (
+        db.query(
+            TriviaQuestion.id,
+            TriviaQuestion.category,
+            TriviaQuestion.value,
+            TriviaQuestion.question,
+        )
+        .filter(
+            TriviaQuestion.show_number == board.show_number,
+            TriviaQuestion.round == board.round,
+            TriviaQuestion.category.in_(board.categories),
+            TriviaQuestion.value.isnot(None),
+            TriviaQuestion.deleted_at.is_(None),
+        )
+        .order_by(TriviaQuestion.value, TriviaQuestion.id)
+        .all()
+    )
+
+    clues: Dict[str, List[dict]] = {category: [] for category in board.categories}
+    for question_id, category, value, question in rows:
+        clues[category].append(
+            {
+                "question_id": question_id,
+                "value": format_value(value),
+                "question": question or "",
+            }
+        )
+    if any(len(category_clues) != BOARD_CLUES for category_clues in clues.values()):
+        return None
+
+    return {
+        "show_number": board.show_number,
+        "round": board.round,
+        "air_date": board.air_date,
+        "categories": [
+            {"category": category, "clues": clues[category]}
+            for category in board.categories
+        ],
+    }
+
+
+def get_game_board(
+    db: Session,
+    round: Optional[str] = None,
+    aired_from: Optional[date] = None,
+    aired_to: Optional[date] = None,
+    show_number: Optional[int] = None,
+) -> Optional[dict]:
+    """
+    Get a random complete game board with optional filters.
+
+    The board is picked from the in-process board index, so only its
+    questions are read from the database.
+    """
+    board_index.refresh(db)
+
+    for _ in range(2):
+        board = board_index.pick(round, aired_from, aired_to, show_number)
+        if board is None:
+            return None
+
+        game_board = load_board(db, board)
+        if game_board is not None:
+            return game_board
+
+        # The index predates a reload that landed inside the generation check window
+        board_index.refresh(db, force=True)
+
+    return None
+
+
+async def get_game_board_async(
+    db: AsyncSession,
+    round: Optional[str] = None,
+    aired_from: Optional[date] = None,
+    aired_to: Optional[date] = None,
+    show_number: Optional[int] = None,
+) -> Optional[dict]:
+    """Async version of get_game_board"""
+    await ensure_index_async(board_index)
+    return await db.run_sync(get_game_board, round, aired_from, aired_to, show_number)
@@ -1,80 +1,172 @@
 """Simplified FastAPI router for trivia endpoints"""
 
+from datetime import date
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import Optional
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, List, Optional, Tuple
+import json
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from database import get_db
+from database import get_async_db
 from schemas.trivia_schemas import (
     QuestionResponse,
     QuestionDetailResponse,
     VerifyAnswerRequest,
     VerifyAnswerResponse,
+    VerifyAnswersRequest,
+    VerifyAnswerItemResponse,
+    VerifyAnswersResponse,
     AgentPlayResponse,
+    TournamentRequest,
+    MAX_SEARCH_RESULTS,
+    SearchResponse,
+    GameBoardResponse,
 )
 from trivia_service.service import (
-    get_random_question,
-    get_question_by_id,
-    verify_user_answer,
+    get_random_question_async,
+    get_session_question_async,
+    get_question_by_id_async,
+    verify_user_answer_async,
+    verify_user_answers_async,
     format_value,
-    agent_play_trivia,
+    agent_play_trivia_async,
+    ensure_index_async,
+    get_agent_by_category,
+    stream_agent_play,
 )
+from trivia_service.agent_pregen import AGENT_PLAY_SOURCE, pregen_stats
+from trivia_service.export import build_export_query, export_questions
+from trivia_service.game_board import get_game_board_async
+from trivia_service.search import search_questions_async
+from trivia_service.tournament import (
+    TOURNAMENT_CONCURRENCY,
+    pick_questions,
+    run_tournament,
+    select_agents,
+)
+from services.agent_router import agent_router
+from services.answer_judge import judge_stats
+from services.corpus_snapshot import get_snapshot
+from services.payload_cache import FAST_JSON, payload_cache
+from services.question_cache import question_cache
+from services.question_sampler import question_sampler
+from services.question_sessions import question_sessions
+from services.single_flight import agent_play_flights, verdict_flights
+from services.verdict_cache import verdict_cache
 
 router = APIRouter(prefix="/api/v1", tags=["trivia"])
 
+# Response header carrying the cursor of a session's next question
+QUESTION_CURSOR_HEADER = "X-Question-Cursor"
+
+
+async def _ndjson(items: AsyncIterator[dict]) -> AsyncIterator[str]:
+    """Encode items as newline-delimited JSON"""
+    async for item in items:
+        yield json.dumps(item, default=str) + "\n"
+
+
+async def _ndjson_pages(pages: AsyncIterator[List[dict]]) -> AsyncIterator[str]:
+    """Encode pages of items as newline-delimited JSON, one chunk per page"""
+    # One encoder for the whole stream; json.dumps(default=...) builds one per call
+    encode = json.JSONEncoder(default=str).encode
+    async for page in pages:
+        yield "".join(encode(item) + "\n" for item in page)
+
+
+async def _sse(events: AsyncIterator[Tuple[str, dict]]) -> AsyncIterator[str]:
+    """Encode (event, data) pairs as server-sent events"""
+    async for event, data in events:
+        yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _question_response(question) -> QuestionResponse:
+    return QuestionResponse(
+        question_id=question.id,
+        round=question.round or "",
+        category=question.category or "",
+        value=format_value(question.value),
+        question=question.question or "",
+    )
+
+
+def _question_detail_response(question) -> QuestionDetailResponse:
+    return QuestionDetailResponse(
+        question_id=question.id,
+        round=question.round or "",
+        category=question.category or "",
+        value=format_value(question.value),
+        question=question.question or "",
+        answer=question.answer or "",
+        show_number=question.show_number,
+        air_date=question.air_date,
+    )
+
 
 @router.get("/question/", response_model=QuestionResponse)
 async def get_question(
+    response: Response,
     round: Optional[str] = Query(None, example="Jeopardy!"),
     value: Optional[str] = Query(None, example="$200"),
-    db: Session = Depends(get_db),
+    session: Optional[str] = Query(None, max_length=128, example="player-7f3a"),
+    cursor: Optional[str] = Query(None, max_length=64),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get a random trivia question.
 
     - **round**: Filter by game round (e.g., "Jeopardy!")
     - **value**: Filter by monetary value (e.g., "$200")
+    - **session**: Any client-chosen token; questions of a session do not repeat
+      until every question matching the filters has been served
+    - **cursor**: The `X-Question-Cursor` header of the session's previous
+      response; without it the session starts a new sequence
     """
-    question = get_random_question(db, round=round, value=value)
+    next_cursor = None
+    if session:
+        question, next_cursor = await get_session_question_async(
+            db, session, cursor, round=round, value=value
+        )
+    else:
+        question = await get_random_question_async(db, round=round, value=value)
 
     if not question:
         raise HTTPException(status_code=404, detail="No questions found")
 
-    return QuestionResponse(
-        question_id=question.id,
-        round=question.round or "",
-        category=question.category or "",
-        value=format_value(question.value),
-        question=question.question or "",
-    )
+    if FAST_JSON:
+        rendered = payload_cache.render("question", question, _question_response)
+        if next_cursor:
+            # A returned response is sent as is, without the injected one's headers
+            rendered.headers[QUESTION_CURSOR_HEADER] = next_cursor
+        return rendered
+    if next_cursor:
+        response.headers[QUESTION_CURSOR_HEADER] = next_cursor
+    return _question_response(question)
 
 
 @router.get("/question/{question_id}", response_model=QuestionDetailResponse)
-async def get_question_detail(question_id: int, db: Session = Depends(get_db)):
+async def get_question_detail(
+    question_id: int, db: AsyncSession = Depends(get_async_db)
+):
     """Get detailed information about a specific question including the answer"""
-    question = get_question_by_id(db, question_id)
+    question = await get_question_by_id_async(db, question_id)
 
     if not question:
         raise HTTPException(status_code=404, detail=f"Question {question_id} not found")
 
-    return QuestionDetailResponse(
-        question_id=question.id,
-        round=question.round or "",
-        category=question.category or "",
-        value=format_value(question.value),
-        question=question.question or "",
-        answer=question.answer or "",
-        show_number=question.show_number,
-        air_date=question.air_date,
-    )
+    if FAST_JSON:
+        return payload_cache.render("detail", question, _question_detail_response)
+    return _question_detail_response(question)
 
 
 @router.post("/verify-answer/", response_model=VerifyAnswerResponse)
-async def verify_answer(request: VerifyAnswerRequest, db: Session = Depends(get_db)):
+async def verify_answer(
+    request: VerifyAnswerRequest, db: AsyncSession = Depends(get_async_db)
+):
     """
     Verify a user's answer using AI.
 
@@ -87,7 +179,7 @@ async def verify_answer(request: VerifyAnswerRequest, db: Session = Depends(get_
     Example: Even if the user writes "Copernics" instead of "Copernicus",
     the AI will recognize it as correct.
     """
-    result = verify_user_answer(
+    result = await verify_user_answer_async(
         db=db, question_id=request.question_id, user_answer=request.user_answer
     )
 
@@ -101,8 +193,28 @@ async def verify_answer(request: VerifyAnswerRequest, db: Session = Depends(get_
     )
 
 
+@router.post("/verify-answers/", response_model=VerifyAnswersResponse)
+async def verify_answers(
+    request: VerifyAnswersRequest, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Verify a batch of answers (e.g. every player in a room) in one request.
+
+    All referenced questions are loaded in one query and the answers are judged
+    concurrently. Results come back in request order; an answer that cannot be
+    judged (e.g. unknown question) gets an `error` instead of failing the batch.
+    """
+    results = await verify_user_answers_async(
+        db, [(answer.question_id, answer.user_answer) for answer in request.answers]
+    )
+
+    return VerifyAnswersResponse(
+        results=[VerifyAnswerItemResponse(**result) for result in results]
+    )
+
+
 @router.post("/agent-play/", response_model=AgentPlayResponse)
-async def agent_play(db: Session = Depends(get_db)):
+async def agent_play(db: AsyncSession = Depends(get_async_db)):
     """
     Watch an AI agent select and answer a random trivia question.
 
@@ -110,10 +222,13 @@ async def agent_play(db: Session = Depends(get_db)):
     and skill levels (expert, intermediate, novice). The system automatically selects
     an appropriate agent based on the question category.
 
+    Answers stored by the agent pre-generation job are served with a single
+    table read; questions it has not covered are answered live.
+
     Returns:
         AgentPlayResponse with the agent's name, question, answer, and whether it was correct.
     """
-    result = agent_play_trivia(db)
+    result = await agent_play_trivia_async(db)
 
     if not result:
         raise HTTPException(
@@ -121,3 +236,227 @@ async def agent_play(db: Session = Depends(get_db)):
         )
 
     return AgentPlayResponse(**result)
+
+
+@router.post(
+    "/agent-play/stream",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Server-sent events: question, answer/reasoning deltas, result",
+            "content": {"text/event-stream": {}},
+        },
+        404: {"description": "No questions available for agent to play"},
+    },
+)
+async def agent_play_stream(db: AsyncSession = Depends(get_async_db)):
+    """
+    Streaming variant of `/agent-play/` using server-sent events.
+
+    Events, in order:
+    - **question**: the agent and question, sent immediately
+    - **answer** / **reasoning**: text deltas of the agent's response as tokens arrive
+    - **result**: the complete `AgentPlayResponse` payload including the verdict
+    """
+    question = await get_random_question_async(db)
+
+    if not question:
+        raise HTTPException(
+            status_code=404, detail="No questions available for agent to play"
+        )
+
+    agent = get_agent_by_category(question.category or "")
+
+    return StreamingResponse(
+        _sse(stream_agent_play(question, agent)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post(
+    "/tournament/",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Newline-delimited JSON: one result per matchup, then a summary",
+            "content": {"application/x-ndjson": {}},
+        }
+    },
+)
+async def tournament(
+    request: TournamentRequest, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Run an agent tournament: every selected agent answers the same random questions.
+
+    Matchups run concurrently on the server with a bounded worker pool. Results are
+    streamed as NDJSON in completion order (`"type": "result"`), followed by a final
+    `"type": "summary"` line with per-agent and per-category accuracy.
+
+    - **agents**: Agent names (default: all agents)
+    - **questions**: Number of questions (1-500)
+    - **round** / **value**: Optional question filters
+    - **concurrency**: Matchups played at the same time
+    """
+    try:
+        agents = select_agents(request.agents)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Load questions up front: the session is closed before the stream is sent
+    await ensure_index_async(question_sampler)
+    questions = await db.run_sync(
+        pick_questions, request.questions, request.round, request.value
+    )
+
+    if not questions:
+        raise HTTPException(status_code=404, detail="No questions found")
+
+    results = run_tournament(
+        agents, questions, request.concurrency or TOURNAMENT_CONCURRENCY
+    )
+    return StreamingResponse(_ndjson(results), media_type="application/x-ndjson")
+
+
+@router.get("/search/", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, example="Galileo"),
+    round: Optional[str] = Query(None, example="Jeopardy!"),
+    value: Optional[str] = Query(None, example="$200"),
+    category: Optional[str] = Query(None, example="HISTORY"),
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_RESULTS),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Full-text search over question, answer and category text, best matches first.
+
+    - **q**: Search text; supports "quoted phrases", `or` and `-excluded` words
+    - **round** / **value** / **category**: Optional filters
+    - **limit**: Page size (1-100)
+    - **cursor**: Pass `next_cursor` from the previous page to continue
+    """
+    if db.bind.dialect.name != "postgresql":
+        raise HTTPException(status_code=501, detail="Search requires PostgreSQL")
+
+    try:
+        results, next_cursor = await search_questions_async(
+            db,
+            q,
+            round=round,
+            value=value,
+            category=category,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return SearchResponse(results=results, next_cursor=next_cursor)
+
+
+@router.get("/game/board/", response_model=GameBoardResponse)
+async def get_game_board(
+    round: Optional[str] = Query(None, example="Jeopardy!"),
+    air_date_from: Optional[date] = Query(None, example="1990-01-01"),
+    air_date_to: Optional[date] = Query(None, example="1999-12-31"),
+    show_number: Optional[int] = Query(None, description="Board of this show"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Get a full game board: six categories of five questions from the same show and round.
+
+    Boards are drawn at random from shows whose round has six complete categories.
+    Answers are not included; check them with `/verify-answer/` by `question_id`.
+
+    - **round**: Optional round filter (e.g., "Jeopardy!", "Double Jeopardy!")
+    - **air_date_from** / **air_date_to**: Optional inclusive air date era
+    - **show_number**: Optional show to get the board of (shares a board between players)
+    """
+    board = await get_game_board_async(
+        db,
+        round=round,
+        aired_from=air_date_from,
+        aired_to=air_date_to,
+        show_number=show_number,
+    )
+
+    if not board:
+        raise HTTPException(status_code=404, detail="No complete game board found")
+
+    return board
+
+
+@router.get(
+    "/export/",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Newline-delimited JSON: one question per line, in id order",
+            "content": {"application/x-ndjson": {}},
+        }
+    },
+)
+async def export(
+    round: Optional[str] = Query(None, example="Jeopardy!"),
+    category: Optional[str] = Query(None, example="HISTORY"),
+    min_value: Optional[str] = Query(None, example="$200"),
+    max_value: Optional[str] = Query(None, example="$1000"),
+    air_date_from: Optional[date] = Query(None, example="2000-01-01"),
+    air_date_to: Optional[date] = Query(None, example="2009-12-31"),
+    after_id: int = Query(0, ge=0, description="Only questions with a higher id"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of rows"),
+):
+    """
+    Stream a slice of the corpus as NDJSON, with answers, ordered by question id.
+
+    Rows are read in keyset pages, so any export runs in constant memory. To resume
+    an interrupted export, pass the last `question_id` received as `after_id`.
+
+    - **round** / **category**: Optional exact filters (category ignores case)
+    - **min_value** / **max_value**: Optional inclusive value range
+    - **air_date_from** / **air_date_to**: Optional inclusive air date range
+    - **after_id**: Keyset position to start after
+    - **limit**: Optional maximum number of rows
+    """
+    try:
+        query = build_export_query(
+            round=round,
+            category=category,
+            min_value=min_value,
+            max_value=max_value,
+            aired_from=air_date_from,
+            aired_to=air_date_to,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(
+        _ndjson_pages(export_questions(query, after_id=after_id, limit=limit)),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.get("/stats/")
+async def get_stats():
+    """
+    In-process cache statistics for tuning.
+
+    Counters are per worker and reset when the worker restarts.
+    """
+    snapshot = get_snapshot()
+    return {
+        "verdict_cache": verdict_cache.stats(),
+        "local_judge": dict(judge_stats),
+        "question_cache": question_cache.stats(),
+        "payload_cache": payload_cache.stats(),
+        "question_sessions": question_sessions.stats(),
+        "agent_router": agent_router.stats(),
+        "agent_answers": {"source": AGENT_PLAY_SOURCE, **pregen_stats},
+        "single_flight": {
+            "verdicts": verdict_flights.stats(),
+            "agent_plays": agent_play_flights.stats(),
+        },
+        "corpus_snapshot": snapshot.stats() if snapshot else None,
+    }
@@ -0,0 +1,129 @@
+"""Full-text question search backed by the search_vector GIN index"""
+
+import base64
+import json
+import os
+import sys
+from sqlalchemy import REAL, and_, cast, func, literal_column, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.trivia_question import TriviaQuestion
+from trivia_service.service import format_value, parse_value
+
+# Generated tsvector column maintained by the ingestion script
+SEARCH_VECTOR = literal_column("trivia_questions.search_vector")
+
+
+def encode_cursor(rank: float, question_id: int) -> str:
+    """Opaque keyset cursor for the position after (rank, question_id)"""
+    raw = json.dumps([rank, question_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    """
+    Raises:
+        ValueError: If the cursor was not produced by encode_cursor
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        rank, question_id = json.loads(raw)
+        return float(rank), int(question_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def search_questions(
+    db: Session,
+    query: str,
+    round: Optional[str] = None,
+    value: Optional[str] = None,
+    category: Optional[str] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Find questions matching a web-search style query ("galileo -moon", "\"house arrest\"").
+
+    Matches are ordered by ts_rank_cd, then id. Pages are keyset paginated on
+    (rank, id), so deep pages cost the same as the first one.
+
+    Args:
+        db: Database session
+        query: Search text in websearch_to_tsquery syntax
+        round: Optional exact round filter
+        value: Optional value filter (e.g. "$200")
+        category: Optional category filter (case-insensitive, exact)
+        limit: Page size
+        cursor: next_cursor of the previous page
+
+    Returns:
+        (results, next_cursor), next_cursor is None on the last page
+
+    Raises:
+        ValueError: If the cursor or the value filter is invalid
+    """
+    tsquery = func.websearch_to_tsquery("english", query)
+    rank = func.ts_rank_cd(SEARCH_VECTOR, tsquery)
+    matches = select(
+        TriviaQuestion.id,
+        TriviaQuestion.round,
+        TriviaQuestion.category,
+        TriviaQuestion.value,
+        TriviaQuestion.question,
+        rank.label("rank"),
+    ).where(SEARCH_VECTOR.op("@@")(tsquery), TriviaQuestion.deleted_at.is_(None))
+
+    if round:
+        matches = matches.where(TriviaQuestion.round == round)
+    if value:
+        value_int = parse_value(value)
+        if value_int is None:
+            raise ValueError(f"Invalid value: {value}")
+        matches = matches.where(TriviaQuestion.value == value_int)
+    if category:
+        matches = matches.where(func.lower(TriviaQuestion.category) == category.lower())
+
+    matches = matches.subquery()
+    page = (
+        select(matches).order_by(matches.c.rank.desc(), matches.c.id).limit(limit + 1)
+    )
+    if cursor:
+        after_rank, after_id = decode_cursor(cursor)
+        after_rank = cast(after_rank, REAL)
+        page = page.where(
+            or_(
+                matches.c.rank < after_rank,
+                and_(matches.c.rank == after_rank, matches.c.id > after_id),
+            )
+        )
+
+    rows = db.execute(page).all()
+    results = [
+        {
+            "question_id": row.id,
+            "round": row.round or "",
+            "category": row.category or "",
+            "value": format_value(row.value),
+            "question": row.question or "",
+            "rank": row.rank,
+        }
+        for row in rows[:limit]
+    ]
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor(last.rank, last.id)
+    return results, next_cursor
+
+
+async def search_questions_async(
+    db: AsyncSession, query: str, **filters
+) -> Tuple[List[dict], Optional[str]]:
+    """Async version of search_questions"""
+    return await db.run_sync(search_questions, query, **filters)
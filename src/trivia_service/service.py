@@ -1,15 +1,34 @@
+import asyncio
 import os
 import sys
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import Optional
-import random
-from services.ai_service import verify_answer_with_ai, get_agent_answer
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+from services.ai_service import (
+    fallback_verdict,
+    request_verdict_async,
+    get_agent_answer_async,
+    stream_agent_answer,
+)
+from services.agent_router import agent_router
+from services.answer_judge import prejudge_answer
+from services.corpus_snapshot import QuestionRecord, get_snapshot
+from services.generation import get_generation
+from services.question_cache import question_cache, to_record
+from services.question_sampler import question_sampler
+from services.question_sessions import question_sessions
+from services.single_flight import agent_play_flights, index_builds, verdict_flights
+from services.verdict_cache import verdict_cache
 
 # Add parent directory to path to import models
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from database import AsyncSessionLocal
 from models.trivia_question import TriviaQuestion
+from trivia_service.agent_pregen import AGENT_PLAY_SOURCE, load_agent_answer
+
+# Max answers of one batch request judged at the same time
+VERIFY_BATCH_CONCURRENCY = int(os.getenv("VERIFY_BATCH_CONCURRENCY", "8"))
 
 
 def parse_value(value_str: str) -> Optional[int]:
@@ -29,34 +48,230 @@ def format_value(value_int: Optional[int]) -> str:
 
 def get_random_question(
     db: Session, round: Optional[str] = None, value: Optional[str] = None
-) -> Optional[TriviaQuestion]:
+) -> Optional[QuestionRecord]:
     """Get a random trivia question with optional filters"""
-    query = db.query(TriviaQuestion)
+    value_int = parse_value(value) if value else None
+
+    question_sampler.refresh(db)
+
+    for _ in range(2):
+        question_id = question_sampler.pick(round=round, value=value_int)
+        if question_id is None:
+            return None
+
+        question = get_question_by_id(db, question_id)
+        if question:
+            return question
+
+        # The index predates a reload that landed inside the generation check window
+        question_sampler.refresh(db, force=True)
+
+    return None
+
+
+def get_session_question(
+    db: Session,
+    session: str,
+    cursor: Optional[str] = None,
+    round: Optional[str] = None,
+    value: Optional[str] = None,
+) -> Tuple[Optional[QuestionRecord], Optional[str]]:
+    """
+    Get the next question of a session's no-repeat sequence.
+
+    Returns:
+        The question (None if no question matches) and the cursor the client
+        sends with its next request to continue the sequence
+    """
+    value_int = parse_value(value) if value else None
+
+    question_sampler.refresh(db)
+
+    for _ in range(2):
+        picked = question_sessions.pick(session, cursor, round=round, value=value_int)
+        if picked is None:
+            return None, None
+
+        question_id, next_cursor = picked
+        question = get_question_by_id(db, question_id)
+        if question:
+            return question, next_cursor
+
+        # The index predates a reload that landed inside the generation check window
+        question_sampler.refresh(db, force=True)
+
+    return None, None
+
+
+def get_question_by_id(db: Session, question_id: int) -> Optional[QuestionRecord]:
+    """
+    Get a specific question by ID (soft-deleted questions are not returned).
+
+    Questions come from the corpus snapshot when one is configured, otherwise
+    from the question cache, and only hit the database on a cache miss.
+    """
+    snapshot = get_snapshot()
+    if snapshot is not None:
+        return snapshot.get(question_id)
+
+    generation = get_generation(db)
+    record = question_cache.get(question_id, generation)
+    if record is not None:
+        return record
+
+    question = (
+        db.query(TriviaQuestion)
+        .filter(TriviaQuestion.id == question_id, TriviaQuestion.deleted_at.is_(None))
+        .first()
+    )
+    if question is None:
+        return None
+    record = to_record(question)
+    question_cache.put(record, generation)
+    return record
+
+
+def get_questions_by_ids(
+    db: Session, question_ids: Iterable[int]
+) -> Dict[int, QuestionRecord]:
+    """Get several questions in one query, keyed by ID (missing IDs are left out)"""
+    snapshot = get_snapshot()
+    if snapshot is not None:
+        return snapshot.get_many(question_ids)
+
+    generation = get_generation(db)
+    question_ids = set(question_ids)
+    records = question_cache.get_many(question_ids, generation)
+    missing = question_ids - records.keys()
+    if not missing:
+        return records
+
+    questions = db.query(TriviaQuestion).filter(
+        TriviaQuestion.id.in_(missing), TriviaQuestion.deleted_at.is_(None)
+    )
+    for question in questions:
+        record = records[question.id] = to_record(question)
+        question_cache.put(record, generation)
+    return records
+
+
+async def ensure_index_async(index) -> None:
+    """
+    Build an in-process index (question sampler, board index) before its
+    first use. Concurrent first requests share one build, run on a session
+    of its own so that no request's cancellation can close it mid-build.
+    """
+    if index.generation is not None:
+        return
+
+    async def build():
+        async with AsyncSessionLocal() as db:
+            await db.run_sync(index.refresh)
+
+    await index_builds.do(id(index), build)
+
+
+async def get_random_question_async(
+    db: AsyncSession, round: Optional[str] = None, value: Optional[str] = None
+) -> Optional[QuestionRecord]:
+    """Async version of get_random_question"""
+    await ensure_index_async(question_sampler)
+    return await db.run_sync(get_random_question, round, value)
 
-    if round:
-        query = query.filter(TriviaQuestion.round == round)
 
-    if value:
-        value_int = parse_value(value)
-        if value_int:
-            query = query.filter(TriviaQuestion.value == value_int)
+async def get_session_question_async(
+    db: AsyncSession,
+    session: str,
+    cursor: Optional[str] = None,
+    round: Optional[str] = None,
+    value: Optional[str] = None,
+) -> Tuple[Optional[QuestionRecord], Optional[str]]:
+    """Async version of get_session_question"""
+    await ensure_index_async(question_sampler)
+    return await db.run_sync(get_session_question, session, cursor, round, value)
 
-    return query.order_by(func.random()).first()
 
+async def get_question_by_id_async(
+    db: AsyncSession, question_id: int
+) -> Optional[QuestionRecord]:
+    """Async version of get_question_by_id"""
+    return await db.run_sync(get_question_by_id, question_id)
 
-def get_question_by_id(db: Session, question_id: int) -> Optional[TriviaQuestion]:
-    """Get a specific question by ID"""
-    return db.query(TriviaQuestion).filter(TriviaQuestion.id == question_id).first()
 
+def _session_lock(db: AsyncSession) -> asyncio.Lock:
+    """Lock serializing DB calls from concurrent tasks that share one AsyncSession"""
+    return db.info.setdefault("judge_lock", asyncio.Lock())
 
-def verify_user_answer(
-    db: Session, question_id: int, user_answer: str
+
+async def _judge_answer_async(
+    db: AsyncSession, question: TriviaQuestion, user_answer: str
+) -> Tuple[bool, str]:
+    """
+    Judge an answer through the local pre-judge and the verdict cache,
+    calling the LLM only for ambiguous answers that miss the cache.
+    """
+    correct_answer = question.answer or ""
+
+    judgement = prejudge_answer(correct_answer, user_answer)
+    if judgement is not None:
+        return judgement.verdict, judgement.explanation
+
+    verdict = verdict_cache.get(question.id, correct_answer, user_answer)
+    if verdict is None and verdict_cache.persist:
+        async with _session_lock(db):
+            verdict = await db.run_sync(
+                verdict_cache.load, question.id, correct_answer, user_answer
+            )
+    if verdict is not None:
+        return verdict
+
+    async def ask_judge() -> Tuple[bool, str]:
+        verdict = await request_verdict_async(
+            question.question or "", correct_answer, user_answer
+        )
+        verdict_cache.put(question.id, correct_answer, user_answer, *verdict)
+        return verdict
+
+    # Identical answers arriving together (e.g. a room answering at the end
+    # of a round) share one judge call; answers too long to key are not shared
+    key = verdict_cache.key(question.id, user_answer)
+    try:
+        if key is None:
+            (is_correct, ai_explanation), shared = await ask_judge(), False
+        else:
+            (is_correct, ai_explanation), shared = await verdict_flights.do(
+                key, ask_judge
+            )
+    except Exception as e:
+        print(f"OpenAI API error: {e}")
+        return fallback_verdict(correct_answer, user_answer)
+
+    # The caller that made the call stores the verdict for everyone
+    if verdict_cache.persist and not shared:
+        async with _session_lock(db):
+            await db.run_sync(
+                verdict_cache.store,
+                question.id,
+                correct_answer,
+                user_answer,
+                is_correct,
+                ai_explanation,
+            )
+
+    return is_correct, ai_explanation
+
+
+async def verify_user_answer_async(
+    db: AsyncSession, question_id: int, user_answer: str
 ) -> Optional[dict]:
     """
     Verify user's answer against the correct answer using AI.
 
+    Clear-cut answers are judged locally and repeated answers to the same
+    question are served from the verdict cache.
+
     Args:
-        db: Database session
+        db: Async database session
         question_id: ID of the question
         user_answer: User's submitted answer
 
@@ -64,17 +279,12 @@ def verify_user_answer(
         Dictionary with verification results or None if question not found
     """
 
-    question = get_question_by_id(db, question_id)
+    question = await get_question_by_id_async(db, question_id)
 
     if not question:
         return None
 
-    # Verify using AI
-    is_correct, ai_explanation = verify_answer_with_ai(
-        question=question.question or "",
-        correct_answer=question.answer or "",
-        user_answer=user_answer,
-    )
+    is_correct, ai_explanation = await _judge_answer_async(db, question, user_answer)
 
     return {
         "is_correct": is_correct,
@@ -84,103 +294,159 @@ def verify_user_answer(
     }
 
 
-# Define available AI agents with their specialties and skill levels
-AVAILABLE_AGENTS = [
-    {"name": "HistoryBot", "specialty": "history", "skill_level": "expert"},
-    {"name": "GeographyPro", "specialty": "geography", "skill_level": "expert"},
-    {"name": "ScienceWiz", "specialty": "science", "skill_level": "expert"},
-    {"name": "LiteratureBuff", "specialty": "literature", "skill_level": "expert"},
-    {"name": "SportsGuru", "specialty": "sports", "skill_level": "expert"},
-    {
-        "name": "PopCultureFan",
-        "specialty": "pop culture",
-        "skill_level": "intermediate",
-    },
-    {"name": "MovieManiac", "specialty": "movies", "skill_level": "intermediate"},
-    {"name": "MusicMaestro", "specialty": "music", "skill_level": "intermediate"},
-    {
-        "name": "GeneralKnowledge",
-        "specialty": "general knowledge",
-        "skill_level": "intermediate",
-    },
-    {"name": "NoviceNed", "specialty": "general knowledge", "skill_level": "novice"},
-]
+async def verify_user_answers_async(
+    db: AsyncSession,
+    answers: List[Tuple[int, str]],
+    concurrency: int = VERIFY_BATCH_CONCURRENCY,
+) -> List[dict]:
+    """
+    Verify a batch of answers with one question lookup and bounded concurrent judging.
+
+    Args:
+        db: Async database session
+        answers: (question_id, user_answer) pairs
+        concurrency: Max answers judged at the same time
 
+    Returns:
+        One result dictionary per answer, in input order. Answers that could not
+        be judged carry an error message instead of a verdict.
+    """
 
-def get_agent_by_category(category: str) -> dict:
-    """Select the most appropriate agent based on question category"""
-    category_lower = category.lower()
+    questions = await db.run_sync(
+        get_questions_by_ids, [question_id for question_id, _ in answers]
+    )
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def verify_one(question_id: int, user_answer: str) -> dict:
+        result = {"question_id": question_id, "user_answer": user_answer}
+        question = questions.get(question_id)
+        if not question:
+            result["error"] = f"Question {question_id} not found"
+            return result
+
+        async with semaphore:
+            try:
+                is_correct, ai_explanation = await _judge_answer_async(
+                    db, question, user_answer
+                )
+            except Exception as e:
+                print(f"Batch verification error for question {question_id}: {e}")
+                result["error"] = f"Verification failed: {e}"
+                return result
+
+        result["is_correct"] = is_correct
+        result["ai_response"] = ai_explanation
+        return result
+
+    return await asyncio.gather(
+        *(verify_one(question_id, user_answer) for question_id, user_answer in answers)
+    )
 
-    # Try to match specialty to category
-    for agent in AVAILABLE_AGENTS:
-        if agent["specialty"] in category_lower or category_lower in agent["specialty"]:
-            return agent
 
-    # Check for keyword matches
-    if any(
-        word in category_lower for word in ["history", "ancient", "war", "president"]
-    ):
-        return next(a for a in AVAILABLE_AGENTS if a["name"] == "HistoryBot")
-    elif any(
-        word in category_lower
-        for word in ["geography", "country", "capital", "city", "state"]
-    ):
-        return next(a for a in AVAILABLE_AGENTS if a["name"] == "GeographyPro")
-    elif any(
-        word in category_lower
-        for word in ["science", "physics", "chemistry", "biology"]
-    ):
-        return next(a for a in AVAILABLE_AGENTS if a["name"] == "ScienceWiz")
-    elif any(
-        word in category_lower for word in ["literature", "book", "author", "novel"]
-    ):
-        return next(a for a in AVAILABLE_AGENTS if a["name"] == "LiteratureBuff")
-    elif any(
-        word in category_lower for word in ["sports", "olympic", "baseball", "football"]
-    ):
-        return next(a for a in AVAILABLE_AGENTS if a["name"] == "SportsGuru")
-    elif any(
-        word in category_lower for word in ["movie", "film", "actor", "hollywood"]
-    ):
-        return next(a for a in AVAILABLE_AGENTS if a["name"] == "MovieManiac")
-    elif any(word in category_lower for word in ["music", "song", "band", "singer"]):
-        return next(a for a in AVAILABLE_AGENTS if a["name"] == "MusicMaestro")
+# Define available AI agents with their specialties and skill levels
+AVAILABLE_AGENTS = agent_router.agents
 
-    # Default to general knowledge agents
-    return random.choice(
-        [a for a in AVAILABLE_AGENTS if "General" in a["name"] or "Novice" in a["name"]]
-    )
 
+def get_agent_by_category(category: str) -> dict:
+    """Select the most appropriate agent based on question category"""
+    return agent_router.route(category)
 
-def agent_play_trivia(db: Session) -> Optional[dict]:
+
+async def agent_play_trivia_async(db: AsyncSession) -> Optional[dict]:
     """
     Have an AI agent select and answer a random trivia question.
 
     Args:
-        db: Database session
+        db: Async database session
 
     Returns:
         Dictionary with agent play results or None if no questions available
     """
 
-    # Get a random question
-    question = get_random_question(db)
+    question = await get_random_question_async(db)
 
     if not question:
         return None
 
-    # Select appropriate agent based on category
     agent = get_agent_by_category(question.category or "")
 
-    # Get agent's answer
-    agent_answer, reasoning, is_correct = get_agent_answer(
+    if AGENT_PLAY_SOURCE == "pregenerated":
+        stored = await db.run_sync(load_agent_answer, question, agent)
+        if stored is not None:
+            return agent_play_result(question, agent, *stored)
+
+    return await play_question_async(question, agent)
+
+
+async def play_question_async(question: TriviaQuestion, agent: dict) -> dict:
+    """
+    Have an agent answer a question and build the agent play result.
+
+    Concurrent plays of the same question by the same agent share one answer.
+    """
+
+    async def answer() -> Tuple[str, str, bool]:
+        return await get_agent_answer_async(
+            question=question.question or "",
+            category=question.category or "",
+            correct_answer=question.answer or "",
+            agent_specialty=agent["specialty"],
+            skill_level=agent["skill_level"],
+        )
+
+    (agent_answer, reasoning, is_correct), _ = await agent_play_flights.do(
+        (question.id, agent["name"]), answer
+    )
+
+    return agent_play_result(question, agent, agent_answer, reasoning, is_correct)
+
+
+async def stream_agent_play(
+    question: TriviaQuestion, agent: dict
+) -> AsyncIterator[Tuple[str, dict]]:
+    """
+    Stream an agent playing a question as (event, data) pairs.
+
+    Emits "question" immediately, then "answer"/"reasoning" text deltas while the
+    agent's completion arrives, then "result" with the full agent play result.
+    """
+
+    yield "question", {
+        "agent_name": f"{agent['name']}-{agent['skill_level'].capitalize()}",
+        "agent_specialty": agent["specialty"],
+        "skill_level": agent["skill_level"],
+        "question_id": question.id,
+        "category": question.category or "",
+        "question": question.question or "",
+    }
+
+    async for event, data in stream_agent_answer(
         question=question.question or "",
         category=question.category or "",
         correct_answer=question.answer or "",
         agent_specialty=agent["specialty"],
         skill_level=agent["skill_level"],
-    )
-
+    ):
+        if event == "verdict":
+            yield "result", agent_play_result(
+                question,
+                agent,
+                data["agent_answer"],
+                data["reasoning"],
+                data["is_correct"],
+            )
+        else:
+            yield event, data
+
+
+def agent_play_result(
+    question: TriviaQuestion,
+    agent: dict,
+    agent_answer: str,
+    reasoning: str,
+    is_correct: bool,
+) -> dict:
+    """Build the agent play result dictionary returned to the router"""
     return {
         "agent_name": f"{agent['name']}-{agent['skill_level'].capitalize()}",
         "agent_specialty": agent["specialty"],
@@ -0,0 +1,146 @@
+"""Server-side agent tournaments: every agent plays every question, results streamed"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from sqlalchemy.orm import Session
+from typing import AsyncIterator, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.trivia_question import TriviaQuestion
+from services.question_sampler import question_sampler
+from trivia_service.service import (
+    AVAILABLE_AGENTS,
+    get_questions_by_ids,
+    parse_value,
+    play_question_async,
+)
+
+# Default number of matchups played at the same time
+TOURNAMENT_CONCURRENCY = int(os.getenv("TOURNAMENT_CONCURRENCY", "8"))
+
+
+def select_agents(names: Optional[List[str]] = None) -> List[dict]:
+    """
+    Get the agents taking part in a tournament.
+
+    Args:
+        names: Agent names from AVAILABLE_AGENTS, all agents if empty
+
+    Raises:
+        ValueError: If a name does not match any agent
+    """
+    if not names:
+        return list(AVAILABLE_AGENTS)
+
+    agents_by_name = {agent["name"]: agent for agent in AVAILABLE_AGENTS}
+    unknown = [name for name in names if name not in agents_by_name]
+    if unknown:
+        raise ValueError(f"Unknown agents: {', '.join(unknown)}")
+
+    return [agents_by_name[name] for name in dict.fromkeys(names)]
+
+
+def pick_questions(
+    db: Session,
+    count: int,
+    round: Optional[str] = None,
+    value: Optional[str] = None,
+) -> List[TriviaQuestion]:
+    """Pick up to count distinct random questions matching the filters"""
+    question_sampler.refresh(db)
+    ids = question_sampler.ids(round=round, value=parse_value(value) if value else None)
+    positions = random.sample(range(len(ids)), min(count, len(ids)))
+    questions = get_questions_by_ids(db, [ids[position] for position in positions])
+    return list(questions.values())
+
+
+def _accuracy_table(counts: dict, key: str) -> List[dict]:
+    return [
+        {
+            key: name,
+            "played": played,
+            "correct": correct,
+            "accuracy": round(correct / played, 4) if played else 0.0,
+        }
+        for name, (played, correct) in sorted(counts.items())
+    ]
+
+
+async def run_tournament(
+    agents: List[dict],
+    questions: List[TriviaQuestion],
+    concurrency: int = TOURNAMENT_CONCURRENCY,
+) -> AsyncIterator[dict]:
+    """
+    Play every (agent, question) matchup with a bounded pool of workers.
+
+    Yields one {"type": "result", ...} item per matchup as soon as it finishes,
+    in completion order, then a final {"type": "summary", ...} item with
+    per-agent and per-category accuracy. A matchup that raises yields a
+    {"type": "error", ...} item instead of aborting the tournament.
+    """
+    started = time.monotonic()
+    matchups: asyncio.Queue = asyncio.Queue()
+    for question in questions:
+        for agent in agents:
+            matchups.put_nowait((agent, question))
+    total = matchups.qsize()
+    finished: asyncio.Queue = asyncio.Queue()
+
+    async def worker():
+        while True:
+            try:
+                agent, question = matchups.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                result = {
+                    "type": "result",
+                    **await play_question_async(question, agent),
+                }
+            except Exception as e:
+                print(f"Tournament matchup error: {e}")
+                result = {
+                    "type": "error",
+                    "agent_name": f"{agent['name']}-{agent['skill_level'].capitalize()}",
+                    "question_id": question.id,
+                    "detail": str(e),
+                }
+            await finished.put(result)
+
+    workers = [
+        asyncio.create_task(worker()) for _ in range(max(1, min(concurrency, total)))
+    ]
+
+    # [played, correct] per agent and per category
+    by_agent = defaultdict(lambda: [0, 0])
+    by_category = defaultdict(lambda: [0, 0])
+
+    try:
+        for _ in range(total):
+            result = await finished.get()
+            if result["type"] == "result":
+                for counts in (
+                    by_agent[result["agent_name"]],
+                    by_category[result["category"]],
+                ):
+                    counts[0] += 1
+                    counts[1] += int(result["is_correct"])
+            yield result
+
+        yield {
+            "type": "summary",
+            "matchups": total,
+            "elapsed_seconds": round(time.monotonic() - started, 3),
+            "agents": _accuracy_table(by_agent, "agent_name"),
+            "categories": _accuracy_table(by_category, "category"),
+        }
+    finally:
+        # Stop outstanding LLM calls if the client went away mid-stream
+        for task in workers:
+            task.cancel()
@@ -0,0 +1,12 @@
+import os
+import sys
+
+# The services import each other from src/, like the API does
+sys.path.append(
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+)
+
+# Constructing the OpenAI clients needs a key and the ingestion script builds
+# an engine at import; tests never call the API or use DATABASE_URL
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
@@ -0,0 +1,47 @@
+import pytest
+
+from services.ai_service import AgentAnswerParser, _parse_agent_answer
+
+RESPONSES = [
+    "ANSWER: Copernicus\nREASONING: He proposed the heliocentric model.",
+    "  ANSWER:   Who is Copernicus?  \nREASONING: Heliocentrism.\n",
+    "Let me think.\nANSWER: Galileo\nNot a label\nREASONING: Telescope.",
+    "REASONING: First the reasoning.\nANSWER: Kepler",
+    "ANSWERS: not a label\nANSWER: Brahe",
+    "Just an answer without labels",
+]
+
+
+def feed_in_chunks(response, size):
+    parser = AgentAnswerParser()
+    streamed = {"answer": "", "reasoning": ""}
+    for start in range(0, len(response), size):
+        for field, text in parser.feed(response[start : start + size]):
+            streamed[field] += text
+    return parser, streamed
+
+
+@pytest.mark.parametrize("response", RESPONSES)
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+def test_finish_matches_the_full_parser(response, size):
+    parser, _ = feed_in_chunks(response, size)
+    assert parser.finish() == _parse_agent_answer(response.strip())
+    assert parser.text == response
+
+
+@pytest.mark.parametrize("size", [1, 3, 1000])
+def test_streamed_deltas_are_the_labelled_lines(size):
+    _, streamed = feed_in_chunks(RESPONSES[2], size)
+    assert streamed == {"answer": "Galileo", "reasoning": "Telescope."}
+
+
+def test_unlabelled_lines_stream_nothing():
+    _, streamed = feed_in_chunks("ANSWERS: no\nJust text", 1)
+    assert streamed == {"answer": "", "reasoning": ""}
+
+
+def test_full_parser_fallbacks():
+    assert _parse_agent_answer("Just an answer\nmore") == (
+        "Just an answer",
+        "No reasoning provided.",
+    )
@@ -0,0 +1,76 @@
+import pytest
+
+from services.agent_router import AhoCorasick, AgentRouter
+
+CONFIG = {
+    "agents": [
+        {"name": "Historian", "specialty": "History"},
+        {"name": "Geographer", "specialty": "World Geography"},
+        {"name": "Scientist", "specialty": "Science"},
+        {"name": "Generalist", "specialty": "General Knowledge"},
+        {"name": "Critic", "specialty": "Pop Culture"},
+    ],
+    "keywords": [
+        {"agent": "Scientist", "words": ["chem", "physics"]},
+        {"agent": "Geographer", "words": ["capital", "river"]},
+        {"agent": "Critic", "words": ["film", "capital"]},
+    ],
+    "fallback": ["Generalist", "Critic"],
+}
+
+
+def test_aho_corasick_finds_every_pattern():
+    matcher = AhoCorasick(
+        [("he", "he"), ("she", "she"), ("his", "his"), ("hers", "hers")]
+    )
+    assert matcher.search("ushers") == {"he", "she", "hers"}
+    assert matcher.search("this") == {"his"}
+    assert matcher.search("xyz") == set()
+
+
+def test_aho_corasick_finds_overlapping_patterns_through_failure_links():
+    matcher = AhoCorasick([("abcd", 1), ("bc", 2), ("c", 3)])
+    assert matcher.search("xabcx") == {2, 3}
+
+
+@pytest.mark.parametrize(
+    "category, agent",
+    [
+        # A specialty occurring in the category
+        ("AMERICAN HISTORY", "Historian"),
+        ("science & nature", "Scientist"),
+        # A category occurring in a specialty
+        ("GEOGRAPHY", "Geographer"),
+        # Specialties win over keywords
+        ("HISTORY OF PHYSICS", "Historian"),
+        # Keywords, the first group first
+        ("ORGANIC CHEMISTRY", "Scientist"),
+        ("STATE CAPITALS", "Geographer"),
+        ("FILM FESTIVALS", "Critic"),
+    ],
+)
+def test_route(category, agent):
+    assert AgentRouter(CONFIG).route(category)["name"] == agent
+
+
+def test_unmatched_categories_fall_back_to_a_random_fallback_agent():
+    router = AgentRouter(CONFIG)
+    names = {router.route("POTPOURRI")["name"] for _ in range(200)}
+    assert names == {"Generalist", "Critic"}
+    assert [a["name"] for a in router.candidates("potpourri")] == [
+        "Generalist",
+        "Critic",
+    ]
+
+
+def test_routes_are_memoized_per_category():
+    router = AgentRouter(CONFIG)
+    router.route("HISTORY")
+    router.route("history")
+    assert router.stats() == {"categories": 1, "hits": 1, "misses": 1}
+
+
+def test_shipped_routing_config_loads():
+    router = AgentRouter.from_file()
+    assert router.agents
+    assert router.route("WORLD HISTORY") in router.agents
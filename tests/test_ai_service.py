@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from services import ai_service
+from services.ai_service import _judge_agent_answer_async, fallback_verdict, local_match
+
+
+@pytest.mark.parametrize(
+    "correct_answer, user_answer, is_correct",
+    [
+        ("Copernicus", "copernicus", True),
+        ("(Louis) Armstrong", "Louis Armstrong", True),
+        ("New York", "New Jersey", False),
+        ("North Carolina", "South Carolina", False),
+        ("Ireland", "Iceland", False),
+        ("Copernicus", "Copernics", False),
+    ],
+)
+def test_fallback_verdict_only_accepts_confident_matches(
+    correct_answer, user_answer, is_correct
+):
+    assert fallback_verdict(correct_answer, user_answer)[0] is is_correct
+
+
+@pytest.mark.parametrize(
+    "correct_answer, agent_answer",
+    [
+        ("North Carolina", "South Carolina"),
+        ("New York", "New Jersey"),
+        ("(Louis) Armstrong", "Neil Armstrong"),
+        ("Theodore Roosevelt", "Franklin Roosevelt"),
+        ("the Pacific Ocean", "the Atlantic Ocean"),
+        ("Ireland", "Iceland"),
+    ],
+)
+def test_local_agent_judging_rejects_wrong_answers(
+    monkeypatch, correct_answer, agent_answer
+):
+    monkeypatch.setattr(ai_service, "AGENT_VERIFY_MODE", "local")
+    assert not local_match(correct_answer, agent_answer)
+    assert not asyncio.run(
+        _judge_agent_answer_async("Question", correct_answer, agent_answer)
+    )
+
+
+@pytest.mark.parametrize(
+    "correct_answer, agent_answer",
+    [
+        ("the Pacific Ocean", "Pacific Ocean"),
+        ("(Louis) Armstrong", "Louis Armstrong"),
+        ("Theodore Roosevelt", "theodore roosevelt"),
+    ],
+)
+def test_local_agent_judging_accepts_clear_matches(correct_answer, agent_answer):
+    assert local_match(correct_answer, agent_answer)
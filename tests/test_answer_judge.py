@@ -0,0 +1,104 @@
+import pytest
+
+from services.answer_judge import (
+    answer_variants,
+    conflicting_numbers,
+    judge_answer,
+    levenshtein,
+    soundex,
+)
+
+
+@pytest.mark.parametrize(
+    "correct_answer, user_answer",
+    [
+        ("Copernicus", "copernicus"),
+        ("Copernicus", "What is Copernicus?"),
+        ("the Pacific Ocean", "Pacific Ocean"),
+        ("(Louis) Armstrong", "Armstrong"),
+        ("(Louis) Armstrong", "Louis Armstrong"),
+        ("Thorpe (or Jim Thorpe)", "Jim Thorpe"),
+        ("Nicolaus Copernicus", "Nicolas Copernicus"),
+        ("<i>Moby-Dick</i>", "moby dick"),
+        ("Beyoncé", "Beyonce"),
+        ("Three Musketeers", "the 3 musketeers"),
+    ],
+)
+def test_accepts_clear_matches(correct_answer, user_answer):
+    assert judge_answer(correct_answer, user_answer).verdict is True
+
+
+@pytest.mark.parametrize(
+    "correct_answer, user_answer",
+    [
+        # One letter off, but a different answer
+        ("Ireland", "Iceland"),
+        ("Prussia", "Russia"),
+        ("Georgia", "Georgie"),
+        ("Hungary", "Hungry"),
+        # Legitimate misspellings are left to the LLM as well
+        ("Copernicus", "Copernics"),
+        ("Mississippi", "Missisippi"),
+        # Partial names
+        ("John Quincy Adams", "John Adams"),
+        ("George W. Bush", "George Bush"),
+        ("Nancy Reagan", "Reagan"),
+        ("Nicolaus Copernicus", "Copernicus"),
+        # No shared tokens is no evidence of a wrong answer
+        ("Mark Twain", "Samuel Clemens"),
+        ("the United States", "USA"),
+        ("John F. Kennedy", "JFK"),
+        ("H2O", "water"),
+        # Same-shaped wrong answers
+        ("North Carolina", "South Carolina"),
+        ("New York", "New Jersey"),
+        ("Theodore Roosevelt", "Franklin Roosevelt"),
+        ("the Pacific Ocean", "the Atlantic Ocean"),
+        ("(Louis) Armstrong", "Neil Armstrong"),
+    ],
+)
+def test_leaves_uncertain_answers_to_the_llm(correct_answer, user_answer):
+    assert judge_answer(correct_answer, user_answer).verdict is None
+
+
+@pytest.mark.parametrize(
+    "correct_answer, user_answer",
+    [
+        ("1776", "1812"),
+        ("the War of 1812", "War of 1776"),
+        ("Apollo 11", "Apollo 13"),
+        ("Copernicus", ""),
+        ("Copernicus", "  ?! "),
+    ],
+)
+def test_rejects_conflicting_numbers_and_empty_answers(correct_answer, user_answer):
+    assert judge_answer(correct_answer, user_answer).verdict is False
+
+
+def test_judgement_explains_with_the_correct_answer():
+    judgement = judge_answer("Copernicus", "Copernicus")
+    assert judgement.score == 1.0
+    assert judgement.explanation == "Correct, the answer is Copernicus."
+    assert "Copernicus" in judge_answer("Copernicus", "Galileo").explanation
+
+
+def test_answer_variants():
+    assert answer_variants("(Louis) Armstrong") == [
+        ["armstrong"],
+        ["louis", "armstrong"],
+    ]
+    assert ["jim", "thorpe"] in answer_variants("Thorpe (or Jim Thorpe)")
+    assert answer_variants("") == []
+
+
+def test_conflicting_numbers():
+    assert conflicting_numbers(["1812"], ["1776"])
+    assert not conflicting_numbers(["war", "1812"], ["war", "1812"])
+    assert not conflicting_numbers(["war", "1812"], ["war"])
+
+
+def test_levenshtein_and_soundex():
+    assert levenshtein("kitten", "sitting") == 3
+    assert levenshtein("", "abc") == 3
+    assert soundex("Copernicus") == "C165"
+    assert soundex("Robert") == soundex("Rupert") == "R163"
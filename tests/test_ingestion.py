@@ -0,0 +1,183 @@
+import hashlib
+import os
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from data_ingestion import ingestion_script
+from data_ingestion.ingestion_script import (
+    CONTENT_KEY_SQL,
+    PREVIOUS_TABLE,
+    content_keys,
+    filter_data,
+    parse_values,
+    prepare_chunk,
+)
+
+# A scratch PostgreSQL database for the load tests; its tables are dropped
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+COLUMNS = [
+    "Show Number",
+    "Air Date",
+    "Round",
+    "Category",
+    "Value",
+    "Question",
+    "Answer",
+]
+
+
+def question(number, answer=None, value="$200", show="1"):
+    return [
+        show,
+        "2004-12-31",
+        "Jeopardy!",
+        "HISTORY",
+        value,
+        f"Question {number}",
+        answer or f"Answer {number}",
+    ]
+
+
+def chunks(*rows):
+    _, df = prepare_chunk(pd.DataFrame(list(rows), columns=COLUMNS))
+    return [df]
+
+
+def test_parse_values():
+    values = parse_values(pd.Series(["$200", "$1,000", "None", None]))
+    assert values.tolist()[:2] == [200, 1000]
+    assert values.isna().tolist() == [False, False, True, True]
+
+
+def test_filter_data_keeps_valued_questions_up_to_the_limit():
+    df = pd.DataFrame(
+        [question(1), question(2, value="$2,000"), question(3, value="None")],
+        columns=COLUMNS,
+    )
+    assert filter_data(df)["Question"].tolist() == ["Question 1"]
+
+
+def test_content_keys():
+    df = pd.DataFrame([question(1)], columns=COLUMNS)
+    assert content_keys(df) == [
+        hashlib.md5(b"1|Jeopardy!|HISTORY|Question 1").hexdigest()
+    ]
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    if not TEST_DATABASE_URL:
+        pytest.skip("Set TEST_DATABASE_URL to a scratch PostgreSQL database")
+
+    engine = create_engine(TEST_DATABASE_URL)
+    with engine.begin() as connection:
+        for table in [
+            "trivia_questions",
+            "trivia_questions_staging",
+            PREVIOUS_TABLE,
+            "game_board_index",
+            "game_board_index_staging",
+            "game_board_index_previous",
+            "ingestion_runs",
+        ]:
+            connection.execute(text(f"DROP TABLE IF EXISTS {table} CASCADE"))
+    monkeypatch.setattr(ingestion_script, "engine", engine)
+    monkeypatch.setattr(ingestion_script, "Session", sessionmaker(bind=engine))
+    ingestion_script.create_tables()
+    yield engine
+    engine.dispose()
+
+
+def live_rows(engine, table="trivia_questions"):
+    with engine.connect() as connection:
+        rows = connection.execute(
+            text(f"SELECT question, id, answer FROM {table} WHERE deleted_at IS NULL")
+        )
+        return {question: (id_, answer) for question, id_, answer in rows}
+
+
+def generations(engine):
+    with engine.connect() as connection:
+        return connection.execute(text("SELECT count(*) FROM ingestion_runs")).scalar()
+
+
+def test_database_content_keys_match_pandas(engine):
+    ingestion_script.load_data(chunks(question(1), question(2)))
+    with engine.connect() as connection:
+        mismatches = connection.execute(
+            text(
+                f"SELECT count(*) FROM trivia_questions "
+                f"WHERE content_key <> {CONTENT_KEY_SQL}"
+            )
+        ).scalar()
+    assert mismatches == 0
+
+
+def test_full_reload_swaps_in_new_data_and_keeps_ids(engine):
+    ingestion_script.load_data(chunks(question(1), question(2), question(3)))
+    before = live_rows(engine)
+
+    ingestion_script.load_data(
+        chunks(question(1), question(2), question(4), question(4))
+    )
+    after = live_rows(engine)
+
+    assert set(after) == {"Question 1", "Question 2", "Question 4"}
+    assert after["Question 1"] == before["Question 1"]
+    assert after["Question 2"] == before["Question 2"]
+    assert after["Question 4"][0] not in {id_ for id_, _ in before.values()}
+    assert set(live_rows(engine, PREVIOUS_TABLE)) == set(before)
+    assert generations(engine) == 2
+
+
+def test_rollback_swaps_the_previous_data_back(engine):
+    ingestion_script.load_data(chunks(question(1), question(2)))
+    first = live_rows(engine)
+    ingestion_script.load_data(chunks(question(1), question(3)))
+    second = live_rows(engine)
+
+    ingestion_script.rollback_data()
+    assert live_rows(engine) == first
+    # Rolling back again rolls forward
+    ingestion_script.rollback_data()
+    assert live_rows(engine) == second
+    assert generations(engine) == 4
+
+
+def test_short_load_is_refused_and_live_data_kept(engine):
+    ingestion_script.load_data(chunks(*(question(i) for i in range(1, 5))))
+    before = live_rows(engine)
+
+    with pytest.raises(ValueError):
+        ingestion_script.load_data(chunks(question(1)))
+    assert live_rows(engine) == before
+    assert generations(engine) == 1
+
+
+def test_incremental_load_applies_only_the_delta(engine):
+    ingestion_script.load_data(chunks(question(1), question(2), question(3)))
+    before = live_rows(engine)
+
+    ingestion_script.load_data(
+        chunks(question(1), question(2, answer="Changed"), question(4)),
+        mode="incremental",
+        soft_delete=True,
+    )
+    after = live_rows(engine)
+
+    assert set(after) == {"Question 1", "Question 2", "Question 4"}
+    assert after["Question 1"] == before["Question 1"]
+    assert after["Question 2"] == (before["Question 2"][0], "Changed")
+    assert generations(engine) == 2
+
+    # Nothing changed: no write and no new generation
+    ingestion_script.load_data(
+        chunks(question(1), question(2, answer="Changed"), question(4)),
+        mode="incremental",
+    )
+    assert live_rows(engine) == after
+    assert generations(engine) == 2
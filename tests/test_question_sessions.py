@@ -0,0 +1,96 @@
+import pytest
+
+from services.question_sampler import QuestionSampler
+from services.question_sessions import FeistelPermutation, QuestionSessions
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 17, 100, 502, 4097])
+def test_feistel_permutation_is_a_bijection(size):
+    permutation = FeistelPermutation(size, b"key")
+    assert sorted(permutation[i] for i in range(size)) == list(range(size))
+
+
+def test_feistel_permutation_depends_on_the_key():
+    first = [FeistelPermutation(1000, b"a")[i] for i in range(1000)]
+    second = [FeistelPermutation(1000, b"b")[i] for i in range(1000)]
+    assert first != second
+    assert first == [FeistelPermutation(1000, b"a")[i] for i in range(1000)]
+
+
+def test_feistel_permutation_rejects_out_of_range_indexes():
+    permutation = FeistelPermutation(10, b"key")
+    with pytest.raises(IndexError):
+        permutation[10]
+    with pytest.raises(IndexError):
+        permutation[-1]
+
+
+def make_sampler(generation=1):
+    sampler = QuestionSampler()
+    rows = [
+        (question_id, "Jeopardy!" if question_id % 2 else "Double Jeopardy!", 200)
+        for question_id in range(1, 51)
+    ]
+    sampler.build(rows, generation)
+    return sampler
+
+
+def walk(sessions, session, picks, cursor=None, **filters):
+    ids = []
+    for _ in range(picks):
+        question_id, cursor = sessions.pick(session, cursor, **filters)
+        ids.append(question_id)
+    return ids, cursor
+
+
+def test_session_sees_every_question_once_before_repeating():
+    sessions = QuestionSessions(make_sampler())
+    ids, _ = walk(sessions, "player", 75, round="Jeopardy!")
+    assert sorted(ids[:25]) == list(range(1, 51, 2))
+    assert set(ids[25:50]) == set(ids[:25])
+    assert sessions.stats()["exhausted"] == 2
+
+
+def test_any_worker_continues_a_walk_from_its_cursor():
+    sampler = make_sampler()
+    first, cursor = walk(QuestionSessions(sampler), "player", 20)
+    # Another worker: a fresh instance holding no state
+    second, _ = walk(QuestionSessions(sampler), "player", 30, cursor)
+    assert sorted(first + second) == list(range(1, 51))
+
+
+def test_missing_or_foreign_cursor_starts_a_new_walk():
+    sessions = QuestionSessions(make_sampler())
+    _, cursor = walk(sessions, "player", 5)
+    for session, cursor_value, filters in [
+        ("player", None, {}),
+        ("player", "not a cursor", {}),
+        ("other", cursor, {}),
+        ("player", cursor, {"round": "Jeopardy!"}),
+    ]:
+        before = sessions.stats()["started"]
+        sessions.pick(session, cursor_value, **filters)
+        assert sessions.stats()["started"] == before + 1
+
+
+def test_cursor_expires_with_the_generation():
+    sampler = make_sampler(generation=1)
+    sessions = QuestionSessions(sampler)
+    _, cursor = walk(sessions, "player", 5)
+    sampler.build([(question_id, None, None) for question_id in range(1, 51)], 2)
+    started = sessions.stats()["started"]
+    sessions.pick("player", cursor)
+    assert sessions.stats()["started"] == started + 1
+
+
+def test_cursor_round_trip():
+    tag = b"12345678"
+    cursor = QuestionSessions.encode_cursor(tag, 7, 42)
+    assert "=" not in cursor
+    assert QuestionSessions.decode_cursor(cursor, tag) == (7, 42)
+    assert QuestionSessions.decode_cursor(cursor, b"87654321") is None
+    assert QuestionSessions.decode_cursor("é", tag) is None
+
+
+def test_no_matching_questions():
+    assert QuestionSessions(make_sampler()).pick("player", round="Final") is None
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from services.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    async def main():
+        flights = SingleFlight()
+        calls = 0
+
+        async def fn():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(flights.do("key", fn) for _ in range(5)))
+        return flights, calls, results
+
+    flights, calls, results = asyncio.run(main())
+    assert calls == 1
+    assert [result for result, _ in results] == ["result"] * 5
+    assert sorted(shared for _, shared in results) == [False] + [True] * 4
+    assert flights.stats() == {
+        "in_flight": 0,
+        "calls": 1,
+        "shared": 4,
+        "shared_ratio": 0.8,
+    }
+
+
+def test_keys_are_released_after_the_call():
+    async def main():
+        flights = SingleFlight()
+
+        async def fn():
+            return object()
+
+        first, _ = await flights.do("key", fn)
+        second, shared = await flights.do("key", fn)
+        return first, second, shared
+
+    first, second, shared = asyncio.run(main())
+    assert first is not second
+    assert not shared
+
+
+def test_waiters_share_the_exception():
+    async def main():
+        flights = SingleFlight()
+
+        async def fn():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        return await asyncio.gather(
+            *(flights.do("key", fn) for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_cancelled_waiter_does_not_cancel_the_call_for_others():
+    async def main():
+        flights = SingleFlight()
+        started = asyncio.Event()
+
+        async def fn():
+            started.set()
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.ensure_future(flights.do("key", fn))
+        await started.wait()
+        second = asyncio.ensure_future(flights.do("key", fn))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == ("done", True)
+
+
+def test_call_is_cancelled_when_nobody_waits():
+    async def main():
+        flights = SingleFlight()
+        finished = False
+
+        async def fn():
+            nonlocal finished
+            await asyncio.sleep(0.05)
+            finished = True
+
+        caller = asyncio.ensure_future(flights.do("key", fn))
+        await asyncio.sleep(0.01)
+        caller.cancel()
+        await asyncio.sleep(0.1)
+        return finished, flights.stats()["in_flight"]
+
+    assert asyncio.run(main()) == (False, 0)